@@ -1,10 +1,8 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from datetime import datetime
 import os
 import sys
-import io
-import csv
 import json
 import pandas as pd
 from dotenv import load_dotenv
@@ -15,16 +13,29 @@ from ml_models.forecasting import (
     arima_forecast,
     lstm_forecast,
     transformer_forecast,
-    MovingAverageForecaster,
-    ARIMAForecaster,
-    LSTMForecaster,
-    TransformerForecaster,
-    EnsembleAverageForecaster,
-    train_test_split_series
+    train_test_split_series,
+    ENSEMBLE_WEIGHTINGS
+)
+from ml_models.registry import get_default_registry
+from ml_models.pipeline import MODEL_ORDER, run_forecast_models, selected_models
+from forecast_jobs import ForecastJobManager, JobStoreFull
+from response_cache import ResponseCache, cached_view
+from dataset_export import (
+    COLUMNAR_FORMATS,
+    PRICE_HISTORY_COLUMNS,
+    gzip_chunks,
+    iter_columnar,
+    iter_csv,
+    iter_json_array,
+    iter_ndjson,
+    require_pyarrow,
 )
 
 # Import fintech_data_curator from the same directory
 from fintech_data_curator import FinTechDataCurator
+from market_data import as_batch
+from indicators import IndicatorState
+from features import feature_fields
 
 # Load environment variables
 load_dotenv()
@@ -43,6 +54,24 @@ except Exception as e:
 # Initialize ML predictor
 predictor = FinancialPredictor()
 
+# Fitted forecasters keyed by symbol, model config and training data
+model_registry = get_default_registry()
+
+# Background forecast jobs (POST /api/forecast/jobs)
+job_manager = ForecastJobManager()
+
+# Cached read responses, invalidated per symbol by MongoDB writes
+response_cache = ResponseCache.from_env()
+if db is not None:
+    db.add_write_listener(response_cache.invalidate)
+
+# GET /api/datasets/<id> embeds rows up to this count; larger datasets are paged via /rows
+DATASET_INLINE_ROWS = int(os.getenv('DATASET_INLINE_ROWS', 1000))
+
+def _cache_disabled():
+    """Bypass the response cache while no database is configured."""
+    return db is None
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Simple liveness and status probe for the API and datastore."""
@@ -57,17 +86,16 @@ def health_check():
             }
         else:
             db_status = db.test_connection()
-            stats = {
-                'totalDatasets': db.count_datasets(),
-                'totalRecords': db.count_records(),
-                'lastGenerated': db.get_last_generated_date()
-            }
+            stats = response_cache.get_or_set('health:stats', db.get_dataset_stats, kinds=('datasets',))
         
         return jsonify({
             'status': 'healthy',
             'database': 'connected' if db_status else 'disconnected',
             'timestamp': datetime.now().isoformat(),
-            'stats': stats
+            'stats': stats,
+            'model_cache': model_registry.stats(),
+            'forecast_jobs': job_manager.stats(),
+            'response_cache': response_cache.stats()
         }), 200
     except Exception as e:
         return jsonify({
@@ -101,33 +129,11 @@ def generate_data():
         
         # Generate dataset using the integrated curator
         dataset = curator.curate_dataset(data['symbol'], data['exchange'])
+        # Which news sources made the deadline (missing ones are recorded in metadata)
+        news_report = curator.get_news_report(data['symbol']) or {}
         
-        # Convert MarketData objects to dictionaries for storage
-        dataset_dict = []
-        for item in dataset:
-            # Helper function to handle NaN values
-            def safe_value(value):
-                if pd.isna(value):
-                    return None
-                return value
-            
-            dataset_dict.append({
-                'symbol': item.symbol,
-                'exchange': item.exchange,
-                'date': item.date,
-                'open_price': safe_value(item.open_price),
-                'high_price': safe_value(item.high_price),
-                'low_price': safe_value(item.low_price),
-                'close_price': safe_value(item.close_price),
-                'volume': int(item.volume) if not pd.isna(item.volume) else 0,
-                'daily_return': safe_value(item.daily_return),
-                'volatility': safe_value(item.volatility),
-                'sma_5': safe_value(item.sma_5),
-                'sma_20': safe_value(item.sma_20),
-                'rsi': safe_value(item.rsi),
-                'news_headlines': item.news_headlines if item.news_headlines else [],
-                'news_sentiment_score': safe_value(item.news_sentiment_score)
-            })
+        # Convert the curated batch to dictionaries for storage (NaN -> None)
+        dataset_dict = as_batch(dataset).to_records()
         
         # Save to database if available
         dataset_id = None
@@ -171,14 +177,16 @@ def generate_data():
                         'market_data': 'Yahoo Finance API',
                         'news_data': 'Yahoo Finance, Google News RSS, CoinDesk RSS',
                         'technical_indicators': 'Calculated (SMA, RSI, Volatility)',
-                        'sentiment_analysis': 'Keyword-based sentiment scoring'
+                        'sentiment_analysis': 'Keyword-based sentiment scoring',
+                        'missing_news_sources': news_report.get('missing', [])
                     },
                     'update_logs': [{
                         'timestamp': datetime.now().isoformat(),
                         'action': 'data_generation',
                         'records_added': len(dataset),
                         'days_requested': days,
-                        'status': 'success'
+                        'status': 'partial' if news_report.get('missing') else 'success',
+                        'news_sources': news_report
                     }]
                 }
                 metadata_result = db.upsert_metadata(data['symbol'], metadata)
@@ -205,9 +213,73 @@ def generate_data():
             'error': str(e)
         }), 500
 
+@app.route('/api/prices/refresh', methods=['POST'])
+def refresh_prices():
+    """Fetch only bars newer than the last stored date and upsert them into historical_prices."""
+    try:
+        if db is None:
+            return jsonify({'error': 'Database not available'}), 503
+        data = request.get_json(force=True) or {}
+        symbol = data.get('symbol')
+        exchange = data.get('exchange')
+        if not symbol or not exchange:
+            return jsonify({'error': 'symbol and exchange are required'}), 400
+        try:
+            days = int(data.get('days', 30))
+            if days < 1:
+                raise ValueError("Days must be positive")
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Days must be a positive integer'}), 400
+
+        # `days` only applies when nothing is stored yet
+        since = db.get_last_price_date(symbol, exchange)
+        # With stored indicator state only the new bars are fetched (no warm-up window)
+        stored_state = db.get_indicator_state(symbol, exchange) if since else None
+        state = IndicatorState.from_dict(stored_state) if stored_state else None
+        curator = FinTechDataCurator(days_history=days)
+        resumed = curator.can_resume(state, since)
+        rows, state = curator.get_price_update(symbol, exchange, since=since, state=state)
+        result = db.save_historical_prices(symbol=symbol, exchange=exchange, prices=rows,
+                                           indicator_fields=feature_fields(curator.features)) if rows else None
+        # No state comes back when the configured features are not streamed
+        if state is not None and (result is not None or not rows):
+            db.save_indicator_state(symbol, exchange, state.to_dict())
+        print(f"🔄 Price refresh for {symbol} since {since or 'start'}: {len(rows)} new bars")
+        return jsonify({
+            'symbol': symbol,
+            'exchange': exchange,
+            'since': since,
+            'indicator_state': 'resumed' if resumed else 'rebuilt' if state is not None else 'recomputed',
+            'fetched': len(rows),
+            'inserted': result.upserted_count if result else 0,
+            'updated': result.modified_count if result else 0
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _wants_gzip():
+    """True when the export was requested with ?gzip=1."""
+    return request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+def _stream_export(chunks, mimetype, filename):
+    """Stream text chunks as an attachment, gzipped on request (filename gets .gz)."""
+    if _wants_gzip():
+        body, mimetype, filename = gzip_chunks(chunks), 'application/gzip', f"{filename}.gz"
+    else:
+        body = (chunk.encode('utf-8') for chunk in chunks)
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+def _stream_binary(chunks, mimetype, filename):
+    """Stream already-encoded chunks (Parquet/Arrow) as an attachment."""
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 @app.route('/api/datasets/<dataset_id>/csv', methods=['GET'])
 def download_csv(dataset_id):
-    """Serve the selected dataset as a CSV file download."""
+    """Stream the selected dataset as a CSV file download (?gzip=1 for .csv.gz)."""
     try:
         if db is None:
             return jsonify({'error': 'Database not available'}), 503
@@ -216,52 +288,11 @@ def download_csv(dataset_id):
         if not dataset:
             return jsonify({'error': 'Dataset not found'}), 404
         
-        # Create CSV content
-        output = io.StringIO()
-        fieldnames = [
-            'symbol', 'exchange', 'date', 'open_price', 'high_price', 'low_price',
-            'close_price', 'volume', 'daily_return', 'volatility', 'sma_5', 'sma_20',
-            'rsi', 'news_headlines', 'news_sentiment_score'
-        ]
-        
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for item in dataset['data']:
-            # Properly format news headlines for CSV
-            news_text = ' | '.join(item['news_headlines']) if item['news_headlines'] else ''
-            # Replace problematic characters that could break CSV formatting
-            news_text = news_text.replace('\n', ' ').replace('\r', ' ').replace('"', '""')
-            
-            writer.writerow({
-                'symbol': item['symbol'],
-                'exchange': item['exchange'],
-                'date': item['date'],
-                'open_price': round(item['open_price'], 4) if item['open_price'] is not None else '',
-                'high_price': round(item['high_price'], 4) if item['high_price'] is not None else '',
-                'low_price': round(item['low_price'], 4) if item['low_price'] is not None else '',
-                'close_price': round(item['close_price'], 4) if item['close_price'] is not None else '',
-                'volume': int(item['volume']) if item['volume'] is not None else 0,
-                'daily_return': round(item['daily_return'], 6) if item['daily_return'] is not None else 0,
-                'volatility': round(item['volatility'], 6) if item['volatility'] is not None else 0,
-                'sma_5': round(item['sma_5'], 4) if item['sma_5'] is not None else '',
-                'sma_20': round(item['sma_20'], 4) if item['sma_20'] is not None else '',
-                'rsi': round(item['rsi'], 2) if item['rsi'] is not None else '',
-                'news_headlines': news_text,
-                'news_sentiment_score': round(item['news_sentiment_score'], 3) if item['news_sentiment_score'] is not None else 0
-            })
-        
-        csv_content = output.getvalue()
-        output.close()
-        
-        # Create file-like object
-        csv_file = io.BytesIO(csv_content.encode('utf-8'))
-        
-        return send_file(
-            csv_file,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f"{dataset['symbol']}_{dataset['exchange']}_data.csv"
+        # Rows are paged from MongoDB while the response is being written
+        return _stream_export(
+            iter_csv(db.iter_dataset_rows(dataset_id)),
+            'text/csv',
+            f"{dataset['symbol']}_{dataset['exchange']}_data.csv"
         )
         
     except Exception as e:
@@ -269,7 +300,7 @@ def download_csv(dataset_id):
 
 @app.route('/api/datasets/<dataset_id>/json', methods=['GET'])
 def download_json(dataset_id):
-    """Return the selected dataset as JSON for client consumption."""
+    """Stream the selected dataset as a JSON array, or NDJSON with ?format=ndjson (?gzip=1 to compress)."""
     try:
         if db is None:
             return jsonify({'error': 'Database not available'}), 503
@@ -278,57 +309,77 @@ def download_json(dataset_id):
         if not dataset:
             return jsonify({'error': 'Dataset not found'}), 404
         
-        # Format data for JSON download
-        json_data = []
-        for item in dataset['data']:
-            # Helper function to handle NaN values for JSON serialization
-            def safe_float(value):
-                if value is None or (isinstance(value, float) and str(value).lower() == 'nan'):
-                    return None
-                return round(float(value), 4) if isinstance(value, (int, float)) else value
-            
-            def safe_int(value):
-                if value is None or (isinstance(value, float) and str(value).lower() == 'nan'):
-                    return 0
-                return int(value) if isinstance(value, (int, float)) else value
-            
-            json_data.append({
-                'symbol': item['symbol'],
-                'exchange': item['exchange'],
-                'date': item['date'],
-                'structured_data': {
-                    'open_price': safe_float(item['open_price']),
-                    'high_price': safe_float(item['high_price']),
-                    'low_price': safe_float(item['low_price']),
-                    'close_price': safe_float(item['close_price']),
-                    'volume': safe_int(item['volume']),
-                    'daily_return': round(item['daily_return'], 6) if item['daily_return'] is not None and str(item['daily_return']).lower() != 'nan' else 0,
-                    'volatility': round(item['volatility'], 6) if item['volatility'] is not None and str(item['volatility']).lower() != 'nan' else 0,
-                    'sma_5': safe_float(item['sma_5']),
-                    'sma_20': safe_float(item['sma_20']),
-                    'rsi': round(item['rsi'], 2) if item['rsi'] is not None and str(item['rsi']).lower() != 'nan' else 50
-                },
-                'unstructured_data': {
-                    'news_headlines': item['news_headlines'] if item['news_headlines'] else [],
-                    'news_sentiment_score': round(item['news_sentiment_score'], 3) if item['news_sentiment_score'] is not None and str(item['news_sentiment_score']).lower() != 'nan' else 0
-                }
-            })
+        rows = db.iter_dataset_rows(dataset_id)
+        name = f"{dataset['symbol']}_{dataset['exchange']}_data"
+        if request.args.get('format') == 'ndjson':
+            return _stream_export(iter_ndjson(rows), 'application/x-ndjson', f"{name}.ndjson")
+        return _stream_export(iter_json_array(rows), 'application/json', f"{name}.json")
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/datasets/<dataset_id>/parquet', methods=['GET'])
+def download_parquet(dataset_id):
+    """Stream the selected dataset as a Parquet file with typed columns."""
+    try:
+        if db is None:
+            return jsonify({'error': 'Database not available'}), 503
+        try:
+            require_pyarrow()
+        except ImportError as e:
+            return jsonify({'error': str(e)}), 501
+        
+        dataset = db.get_dataset_by_id(dataset_id)
+        if not dataset:
+            return jsonify({'error': 'Dataset not found'}), 404
         
-        return jsonify(json_data)
+        return _stream_binary(
+            iter_columnar(db.iter_dataset_rows(dataset_id), 'parquet'),
+            'application/vnd.apache.parquet',
+            f"{dataset['symbol']}_{dataset['exchange']}_data.parquet"
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/prices/export', methods=['GET'])
+def export_prices():
+    """Bulk-export historical_prices as Parquet or Arrow IPC (query: symbols=A,B&format=parquet|arrow)."""
+    try:
+        if db is None:
+            return jsonify({'error': 'Database not available'}), 503
+        fmt = request.args.get('format', 'parquet')
+        if fmt not in COLUMNAR_FORMATS:
+            return jsonify({'error': f"format must be one of {sorted(COLUMNAR_FORMATS)}"}), 400
+        try:
+            require_pyarrow()
+        except ImportError as e:
+            return jsonify({'error': str(e)}), 501
+        
+        symbols = [s.strip() for s in request.args.get('symbols', '').split(',') if s.strip()]
+        mimetype = 'application/vnd.apache.parquet' if fmt == 'parquet' else 'application/vnd.apache.arrow.file'
+        return _stream_binary(
+            iter_columnar(db.iter_price_rows(symbols=symbols or None), fmt, PRICE_HISTORY_COLUMNS),
+            mimetype,
+            f"historical_prices{COLUMNAR_FORMATS[fmt]}"
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/analytics', methods=['GET'])
+@cached_view(response_cache, ('datasets', 'predictions'), symbol_param=None, skip=_cache_disabled)
 def get_analytics():
     """Summarize recent datasets and predictions with a basic accuracy snapshot."""
     try:
         if db is None:
             datasets = []
             predictions = []
+            stats = {'totalDatasets': 0, 'totalRecords': 0, 'lastGenerated': None}
         else:
             datasets = db.get_recent_datasets(limit=10)
             predictions = db.get_recent_predictions(limit=10)
+            stats = db.get_dataset_stats()
         
         # Calculate accuracy (placeholder)
         accuracy = predictor.calculate_accuracy()
@@ -336,7 +387,8 @@ def get_analytics():
         return jsonify({
             'datasets': datasets,
             'predictions': predictions,
-            'accuracy': accuracy
+            'accuracy': accuracy,
+            'stats': stats
         }), 200
         
     except Exception as e:
@@ -385,6 +437,7 @@ def make_prediction():
         }), 500
 
 @app.route('/api/datasets', methods=['GET'])
+@cached_view(response_cache, ('datasets',), symbol_param=None, skip=_cache_disabled)
 def get_datasets():
     """List available datasets (returns an array; empty on error)."""
     try:
@@ -477,19 +530,61 @@ def debug_storage():
 
 @app.route('/api/datasets/<dataset_id>', methods=['GET'])
 def get_dataset(dataset_id):
-    """Fetch a single dataset document by its identifier."""
+    """
+    Fetch a single dataset document by its identifier.
+
+    Rows are returned inline as `data` for datasets of up to
+    DATASET_INLINE_ROWS rows, as before rows were stored separately; larger
+    datasets omit `data` and set `data_truncated`. `rows_url` always points
+    to the paged rows endpoint.
+    """
     try:
         if db is None:
             return jsonify({'error': 'Database not available'}), 503
         dataset = db.get_dataset_by_id(dataset_id)
         if not dataset:
             return jsonify({'error': 'Dataset not found'}), 404
+        dataset['_id'] = str(dataset['_id'])
+        dataset['rows_url'] = f"/api/datasets/{dataset_id}/rows"
+        if 'data' not in dataset:
+            if (dataset.get('records') or 0) <= DATASET_INLINE_ROWS:
+                dataset['data'] = [
+                    {k: v for k, v in row.items() if k != 'seq'} for row in db.iter_dataset_rows(dataset_id)
+                ]
+            else:
+                dataset['data_truncated'] = True
         return jsonify(dataset), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/datasets/<dataset_id>/rows', methods=['GET'])
+def get_dataset_rows(dataset_id):
+    """Page through a dataset's rows (query: after=<next_cursor>, limit<=1000)."""
+    try:
+        if db is None:
+            return jsonify({'error': 'Database not available'}), 503
+        try:
+            after = request.args.get('after', type=int)
+            limit = min(max(int(request.args.get('limit', 200)), 1), 1000)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'limit must be an integer'}), 400
+        if 'after' in request.args and after is None:
+            return jsonify({'error': 'after must be an integer cursor'}), 400
+        page = db.get_dataset_rows(dataset_id, after=after, limit=limit)
+        if page is None:
+            return jsonify({'error': 'Dataset not found'}), 404
+        return jsonify({
+            'dataset_id': dataset_id,
+            'rows': page['rows'],
+            'count': len(page['rows']),
+            'next_cursor': page['next_cursor']
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ---------------------- New API Endpoints ----------------------
 @app.route('/api/prices', methods=['GET'])
+@cached_view(response_cache, ('prices',), skip=_cache_disabled)
 def get_prices():
     """Return historical OHLCV rows for charting (symbol required)."""
     try:
@@ -537,6 +632,7 @@ def post_prediction():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/predictions', methods=['GET'])
+@cached_view(response_cache, ('predictions',), skip=_cache_disabled)
 def list_predictions():
     """Filter prediction documents by symbol, horizon, and/or model."""
     try:
@@ -601,6 +697,7 @@ def upsert_metadata():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/metadata', methods=['GET'])
+@cached_view(response_cache, ('metadata',), skip=_cache_disabled)
 def get_metadata():
     """Return metadata for a single symbol or all, based on query."""
     try:
@@ -614,6 +711,7 @@ def get_metadata():
 
 # ---------------------- Simple public endpoints ----------------------
 @app.route('/get_historical', methods=['GET'])
+@cached_view(response_cache, ('prices',), skip=_cache_disabled)
 def get_historical_public():
     """Public alias for historical prices: /get_historical?symbol=XYZ&limit=300"""
     try:
@@ -640,6 +738,90 @@ def _parse_horizon_label_to_hours(h: str) -> int:
     except:
         return 24
 
+def _load_close_series(symbol: str):
+    """Return the sorted daily close series for `symbol`, or None if too short to forecast."""
+    frame = db.get_price_frame(symbol, fields=['close'], limit=2000)
+    if len(frame) < 20:
+        return None
+    return frame['close']
+
+def _preview_dates(series: pd.Series, preview_days: int):
+    last_date = pd.to_datetime(series.index[-1])
+    return [(last_date + pd.Timedelta(days=i+1)).strftime('%Y-%m-%d') for i in range(preview_days)]
+
+def _public_result(res: dict) -> dict:
+    """Strip pipeline bookkeeping fields from a model result."""
+    return {k: v for k, v in res.items() if k not in ('key', 'preview_values')}
+
+def _preview_entry(res: dict, preview_hours: int, preview_days: int) -> dict:
+    return {
+        'model': res['model'],
+        'horizon_hours': preview_hours,
+        'horizon_days': preview_days,
+        'predicted_values': res['preview_values']
+    }
+
+def _save_forecast_result(symbol: str, res: dict) -> None:
+    """Persist one model's evaluation through MongoDB.save_forecast."""
+    print(f"💾 Saving {res['model']} forecast to database for {symbol}")
+    doc = {
+        'symbol': symbol,
+        'model': res['model'],
+        'forecast_horizon': res['forecast_horizon'],
+        'predicted_values': res['predicted_values'],
+        'metrics': res['metrics'],
+        'y_true': res['y_true'],
+        'created_at': datetime.now()
+    }
+    if 'weights' in res:
+        doc['weights'] = res['weights']
+    db.save_forecast(doc)
+
+def _log_forecast_metadata(symbol: str, models, ensemble: bool, weighting: str,
+                           preview_hours: int, preview_days: int, models_processed: int) -> None:
+    """Append a forecast_run entry to the symbol's metadata update logs."""
+    try:
+        if db is not None:
+            forecast_log = {
+                'timestamp': datetime.now().isoformat(),
+                'action': 'forecast_run',
+                'models_used': models,
+                'ensemble_enabled': ensemble,
+                'forecast_horizon_hours': preview_hours,
+                'forecast_horizon_days': preview_days,
+                'models_processed': models_processed,
+                'status': 'success'
+            }
+
+            # Get existing metadata or create new
+            existing_metadata = db.get_metadata(symbol)
+            if existing_metadata:
+                # Update existing metadata
+                update_logs = existing_metadata.get('update_logs', [])
+                update_logs.append(forecast_log)
+                db.upsert_metadata(symbol, {
+                    'update_logs': update_logs
+                })
+            else:
+                # Create new metadata entry
+                metadata = {
+                    'instrument_info': {
+                        'symbol': symbol,
+                        'last_updated': datetime.now().isoformat(),
+                        'forecast_capability': True
+                    },
+                    'data_sources': {
+                        'forecast_models': ', '.join(models),
+                        'ensemble_method': ('Inverse-RMSE weighted' if weighting == 'inverse_rmse' else 'Average') if ensemble else 'None'
+                    },
+                    'update_logs': [forecast_log]
+                }
+                db.upsert_metadata(symbol, metadata)
+
+            print(f"✅ Metadata updated for {symbol} forecast run")
+    except Exception as e:
+        print(f"Warning: Failed to update metadata for forecast: {e}")
+
 @app.route('/get_forecast', methods=['GET'])
 def get_forecast_public():
     """Public preview of forecasts; supports models and horizon query params."""
@@ -654,74 +836,32 @@ def get_forecast_public():
         models_param = request.args.get('models')  # e.g., "ma,arima,lstm,transformer"
         models = [m.strip() for m in models_param.split(',')] if models_param else ['ma', 'arima', 'lstm']
         ensemble = str(request.args.get('ensemble', 'false')).lower() in ['1', 'true', 'yes']
+        weighting = request.args.get('ensemble_weighting', 'equal')
+        if weighting not in ENSEMBLE_WEIGHTINGS:
+            return jsonify({'error': f"ensemble_weighting must be one of: {', '.join(ENSEMBLE_WEIGHTINGS)}"}), 400
 
         # Map hours->days (daily data)
         preview_days = max(1, int(round(preview_hours / 24)))
 
         # fetch historical series
-        rows = db.get_prices(symbol=symbol, limit=2000)
-        if not rows or len(rows) < 20:
+        series = _load_close_series(symbol)
+        if series is None:
             return jsonify({'error': 'Insufficient historical data'}), 400
-        df = pd.DataFrame(rows).sort_values('date')
-        series = pd.Series(df['close'].values, index=pd.to_datetime(df['date']))
         train_series, test_series = train_test_split_series(series)
 
-        results = []
-        previews = []
-
-        if 'ma' in models:
-            ma_model = MovingAverageForecaster(window=5)
-            ma_model.fit(train_series)
-            eval_res = ma_model.evaluate(test_series)
-            results.append({'model': 'moving_average', **eval_res})
-            previews.append({'model': 'moving_average', 'horizon_hours': preview_hours, 'horizon_days': preview_days, 'predicted_values': ma_model.predict(preview_days)})
-
-        if 'arima' in models:
-            arima_model = ARIMAForecaster(order=(1,1,1))
-            arima_model.fit(train_series)
-            eval_res = arima_model.evaluate(test_series)
-            results.append({'model': 'ARIMA(1, 1, 1)', **eval_res})
-            previews.append({'model': 'ARIMA(1, 1, 1)', 'horizon_hours': preview_hours, 'horizon_days': preview_days, 'predicted_values': arima_model.predict(preview_days)})
-
-        if 'lstm' in models:
-            lstm_model = LSTMForecaster(lookback=10, epochs=20)
-            lstm_model.fit(train_series)
-            eval_res = lstm_model.evaluate(test_series)
-            results.append({'model': 'LSTM', **eval_res})
-            previews.append({'model': 'LSTM', 'horizon_hours': preview_hours, 'horizon_days': preview_days, 'predicted_values': lstm_model.predict(preview_days)})
-
-        if 'transformer' in models:
-            trans_model = TransformerForecaster(lookback=24, epochs=20)
-            trans_model.fit(train_series)
-            eval_res = trans_model.evaluate(test_series)
-            results.append({'model': 'Transformer', **eval_res})
-            previews.append({'model': 'Transformer', 'horizon_hours': preview_hours, 'horizon_days': preview_days, 'predicted_values': trans_model.predict(preview_days)})
-
-        if ensemble and results:
-            selected = []
-            if 'ma' in models:
-                selected.append(MovingAverageForecaster(window=5))
-            if 'arima' in models:
-                selected.append(ARIMAForecaster(order=(1,1,1)))
-            if 'lstm' in models:
-                selected.append(LSTMForecaster(lookback=10, epochs=20))
-            if 'transformer' in models:
-                selected.append(TransformerForecaster(lookback=24, epochs=20))
-            ens = EnsembleAverageForecaster(selected)
-            ens.fit(train_series)
-            eval_res = ens.evaluate(test_series)
-            results.append({'model': 'EnsembleAverage', **eval_res})
-            previews.append({'model': 'EnsembleAverage', 'horizon_hours': preview_hours, 'horizon_days': preview_days, 'predicted_values': ens.predict(preview_days)})
-
-        last_date = pd.to_datetime(series.index[-1])
-        preview_dates = [(last_date + pd.Timedelta(days=i+1)).strftime('%Y-%m-%d') for i in range(preview_days)]
+        # Lighter neural training than /api/forecast/run for the public preview
+        params = {'lstm_epochs': 20, 'transformer_epochs': 20}
+        outputs = run_forecast_models(
+            symbol, models, params, train_series, test_series, preview_days,
+            ensemble=ensemble, weighting=weighting
+        )
 
         return jsonify({
             'symbol': symbol,
-            'results': results,
+            'results': [_public_result(r) for r in outputs],
             'preview': {
-                'dates': preview_dates,
-                'models': previews,
+                'dates': _preview_dates(series, preview_days),
+                'models': [_preview_entry(r, preview_hours, preview_days) for r in outputs],
                 'horizon': horizon_raw
             }
         }), 200
@@ -739,266 +879,140 @@ def run_forecast():
         symbol = payload.get('symbol')
         models = payload.get('models', ['ma', 'arima', 'lstm'])
         preview_hours = int(payload.get('preview_horizon_hours', 24))
-        
+        ensemble = bool(payload.get('ensemble', False))
+        weighting = payload.get('ensemble_weighting', 'equal')
+        if weighting not in ENSEMBLE_WEIGHTINGS:
+            return jsonify({'error': f"ensemble_weighting must be one of: {', '.join(ENSEMBLE_WEIGHTINGS)}"}), 400
+        parallel = bool(payload.get('parallel', False))
+
         # Debug logging
         print(f"🔍 Forecast request for {symbol} with models: {models}")
-        print(f"🔍 Ensemble enabled: {payload.get('ensemble', False)}")
+        print(f"🔍 Ensemble enabled: {ensemble}, parallel: {parallel}")
         # Map hours to whole days since data is daily
         preview_days = max(1, int(round(preview_hours / 24)))
         if not symbol:
             return jsonify({'error': 'symbol is required'}), 400
 
         # fetch historical close series
-        rows = db.get_prices(symbol=symbol, limit=2000)
-        if not rows or len(rows) < 20:
+        series = _load_close_series(symbol)
+        if series is None:
             return jsonify({'error': 'Insufficient historical data'}), 400
-        df = pd.DataFrame(rows)
-        df = df.sort_values('date')
-        series = pd.Series(df['close'].values, index=pd.to_datetime(df['date']))
         train_series, test_series = train_test_split_series(series)
 
-        results = []
-        preview_outputs = []
-        # moving average
-        if 'ma' in models:
-            print(f"✅ Processing Moving Average model for {symbol}")
-            window = int(payload.get('ma_window', 5))
-            ma_model = MovingAverageForecaster(window=window)
-            ma_model.fit(train_series)
-            eval_res = ma_model.evaluate(test_series)
-            ma_res = {
-                'model': 'moving_average',
-                **eval_res
-            }
-            print(f"💾 Saving Moving Average forecast to database for {symbol}")
-            db.save_forecast({
-                'symbol': symbol,
-                'model': 'moving_average',
-                'forecast_horizon': ma_res['forecast_horizon'],
-                'predicted_values': ma_res['predicted_values'],
-                'metrics': ma_res['metrics'],
-                'y_true': ma_res['y_true'],
-                'created_at': datetime.now()
-            })
-            results.append(ma_res)
-            # Preview future horizon from fitted model
-            ma_preview = {
-                'model': 'moving_average',
-                'horizon_hours': preview_hours,
-                'horizon_days': preview_days,
-                'predicted_values': ma_model.predict(preview_days)
-            }
-            preview_outputs.append(ma_preview)
-
-        # ARIMA
-        if 'arima' in models:
-            print(f"✅ Processing ARIMA model for {symbol}")
-            order = payload.get('arima_order', [1, 1, 1])
-            if not isinstance(order, (list, tuple)) or len(order) != 3:
-                order = [1, 1, 1]
-            arima_model = ARIMAForecaster(order=tuple(int(x) for x in order))
-            arima_model.fit(train_series)
-            eval_res = arima_model.evaluate(test_series)
-            arima_res = {
-                'model': f'ARIMA{tuple(int(x) for x in order)}',
-                **eval_res
-            }
-            print(f"💾 Saving ARIMA forecast to database for {symbol}")
-            db.save_forecast({
-                'symbol': symbol,
-                'model': arima_res['model'],
-                'forecast_horizon': arima_res['forecast_horizon'],
-                'predicted_values': arima_res['predicted_values'],
-                'metrics': arima_res['metrics'],
-                'y_true': arima_res['y_true'],
-                'created_at': datetime.now()
-            })
-            results.append(arima_res)
-            arima_preview = {
-                'model': arima_res['model'],
-                'horizon_hours': preview_hours,
-                'horizon_days': preview_days,
-                'predicted_values': arima_model.predict(preview_days)
-            }
-            preview_outputs.append(arima_preview)
-
-        # LSTM
-        if 'lstm' in models:
-            print(f"✅ Processing LSTM model for {symbol}")
-            lookback = int(payload.get('lstm_lookback', 10))
-            lstm_model = LSTMForecaster(lookback=lookback, epochs=int(payload.get('lstm_epochs', 40)))
-            lstm_model.fit(train_series)
-            eval_res = lstm_model.evaluate(test_series)
-            lstm_res = {
-                'model': 'LSTM',
-                **eval_res
-            }
-            print(f"💾 Saving LSTM forecast to database for {symbol}")
-            db.save_forecast({
-                'symbol': symbol,
-                'model': lstm_res['model'],
-                'forecast_horizon': lstm_res['forecast_horizon'],
-                'predicted_values': lstm_res['predicted_values'],
-                'metrics': lstm_res['metrics'],
-                'y_true': lstm_res['y_true'],
-                'created_at': datetime.now()
-            })
-            results.append(lstm_res)
-            lstm_preview = {
-                'model': 'LSTM',
-                'horizon_hours': preview_hours,
-                'horizon_days': preview_days,
-                'predicted_values': lstm_model.predict(preview_days)
-            }
-            preview_outputs.append(lstm_preview)
-
-        # Transformer (optional)
-        if 'transformer' in models:
-            print(f"✅ Processing Transformer model for {symbol}")
-            t_lookback = int(payload.get('transformer_lookback', 24))
-            t_epochs = int(payload.get('transformer_epochs', 30))
-            t_heads = int(payload.get('transformer_heads', 2))
-            t_d_model = int(payload.get('transformer_d_model', 32))
-            t_ff = int(payload.get('transformer_ff_dim', 64))
-            t_dropout = float(payload.get('transformer_dropout', 0.1))
-            trans_model = TransformerForecaster(
-                lookback=t_lookback,
-                d_model=t_d_model,
-                num_heads=t_heads,
-                ff_dim=t_ff,
-                epochs=t_epochs,
-                dropout=t_dropout
+        def on_progress(key, state, res):
+            if state == 'running':
+                print(f"✅ Processing {key} model for {symbol}")
+            elif state == 'done':
+                _save_forecast_result(symbol, res)
+
+        if parallel:
+            # Fan the models out to the worker pool; wall time ~ the slowest model
+            outputs = job_manager.run_models(
+                symbol, models, payload, train_series, test_series, preview_days,
+                ensemble=ensemble, weighting=weighting, parallel=True, on_progress=on_progress
             )
-            trans_model.fit(train_series)
-            eval_res = trans_model.evaluate(test_series)
-            trans_res = {
-                'model': 'Transformer',
-                **eval_res
-            }
-            print(f"💾 Saving Transformer forecast to database for {symbol}")
-            db.save_forecast({
-                'symbol': symbol,
-                'model': trans_res['model'],
-                'forecast_horizon': trans_res['forecast_horizon'],
-                'predicted_values': trans_res['predicted_values'],
-                'metrics': trans_res['metrics'],
-                'y_true': trans_res['y_true'],
-                'created_at': datetime.now()
-            })
-            results.append(trans_res)
-            trans_preview = {
-                'model': 'Transformer',
-                'horizon_hours': preview_hours,
-                'horizon_days': preview_days,
-                'predicted_values': trans_model.predict(preview_days)
-            }
-            preview_outputs.append(trans_preview)
-
-        # Optional ensemble: average of selected models
-        if payload.get('ensemble'):
-            print(f"✅ Processing Ensemble model for {symbol}")
-            selected = []
-            if 'ma' in models:
-                selected.append(MovingAverageForecaster(window=int(payload.get('ma_window', 5))))
-            if 'arima' in models:
-                order = payload.get('arima_order', [1,1,1])
-                if not isinstance(order, (list, tuple)) or len(order) != 3:
-                    order = [1,1,1]
-                selected.append(ARIMAForecaster(order=tuple(int(x) for x in order)))
-            if 'lstm' in models:
-                selected.append(LSTMForecaster(lookback=int(payload.get('lstm_lookback', 10)), epochs=int(payload.get('lstm_epochs', 40))))
-            if 'transformer' in models:
-                selected.append(TransformerForecaster(
-                    lookback=int(payload.get('transformer_lookback', 24)),
-                    d_model=int(payload.get('transformer_d_model', 32)),
-                    num_heads=int(payload.get('transformer_heads', 2)),
-                    ff_dim=int(payload.get('transformer_ff_dim', 64)),
-                    epochs=int(payload.get('transformer_epochs', 30)),
-                    dropout=float(payload.get('transformer_dropout', 0.1))
-                ))
-            if selected:
-                print(f"🔧 Creating ensemble with {len(selected)} models for {symbol}")
-                ens = EnsembleAverageForecaster(selected)
-                ens.fit(train_series)
-                eval_res = ens.evaluate(test_series)
-                ens_res = {
-                    'model': 'EnsembleAverage',
-                    **eval_res
-                }
-                print(f"💾 Saving Ensemble forecast to database for {symbol}")
-                db.save_forecast({
-                    'symbol': symbol,
-                    'model': 'EnsembleAverage',
-                    'forecast_horizon': ens_res['forecast_horizon'],
-                    'predicted_values': ens_res['predicted_values'],
-                    'metrics': ens_res['metrics'],
-                    'y_true': ens_res['y_true'],
-                    'created_at': datetime.now()
-                })
-                results.append(ens_res)
+        else:
+            outputs = run_forecast_models(
+                symbol, models, payload, train_series, test_series, preview_days,
+                ensemble=ensemble, weighting=weighting, on_progress=on_progress
+            )
+        results = [_public_result(r) for r in outputs]
 
-        # build preview dates for plotting
-        last_date = pd.to_datetime(series.index[-1])
-        preview_dates = [(last_date + pd.Timedelta(days=i+1)).strftime('%Y-%m-%d') for i in range(preview_days)]
-        
         # Summary logging
         print(f"📊 Forecast completed for {symbol}: {len(results)} models processed and saved to database")
         print(f"📊 Models saved: {[r['model'] for r in results]}")
-        
+
         # Update metadata with forecast information
-        try:
-            if db is not None:
-                forecast_log = {
-                    'timestamp': datetime.now().isoformat(),
-                    'action': 'forecast_run',
-                    'models_used': models,
-                    'ensemble_enabled': payload.get('ensemble', False),
-                    'forecast_horizon_hours': preview_hours,
-                    'forecast_horizon_days': preview_days,
-                    'models_processed': len(results),
-                    'status': 'success'
-                }
-                
-                # Get existing metadata or create new
-                existing_metadata = db.get_metadata(symbol)
-                if existing_metadata:
-                    # Update existing metadata
-                    update_logs = existing_metadata.get('update_logs', [])
-                    update_logs.append(forecast_log)
-                    db.upsert_metadata(symbol, {
-                        'update_logs': update_logs
-                    })
-                else:
-                    # Create new metadata entry
-                    metadata = {
-                        'instrument_info': {
-                            'symbol': symbol,
-                            'last_updated': datetime.now().isoformat(),
-                            'forecast_capability': True
-                        },
-                        'data_sources': {
-                            'forecast_models': ', '.join(models),
-                            'ensemble_method': 'Average' if payload.get('ensemble', False) else 'None'
-                        },
-                        'update_logs': [forecast_log]
-                    }
-                    db.upsert_metadata(symbol, metadata)
-                
-                print(f"✅ Metadata updated for {symbol} forecast run")
-        except Exception as e:
-            print(f"Warning: Failed to update metadata for forecast: {e}")
-        
+        _log_forecast_metadata(symbol, models, ensemble, weighting, preview_hours, preview_days, len(results))
+
         return jsonify({
             'symbol': symbol,
             'results': results,
             'preview': {
-                'dates': preview_dates,
-                'models': preview_outputs
+                'dates': _preview_dates(series, preview_days),
+                # The ensemble is reported in results but not previewed
+                'models': [_preview_entry(r, preview_hours, preview_days) for r in outputs if r['key'] != 'ensemble']
             }
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# ---------------------- Background forecast jobs ----------------------
+@app.route('/api/forecast/jobs', methods=['POST'])
+def submit_forecast_job():
+    """Queue a forecast run (same payload as /api/forecast/run) and return its job id."""
+    try:
+        if db is None:
+            return jsonify({'error': 'Database not available'}), 503
+        payload = request.get_json(force=True) or {}
+        symbol = payload.get('symbol')
+        if not symbol:
+            return jsonify({'error': 'symbol is required'}), 400
+        models = payload.get('models', ['ma', 'arima', 'lstm'])
+        if not selected_models(models):
+            return jsonify({'error': 'no known models requested'}), 400
+        preview_hours = int(payload.get('preview_horizon_hours', 24))
+        preview_days = max(1, int(round(preview_hours / 24)))
+        ensemble = bool(payload.get('ensemble', False))
+        weighting = payload.get('ensemble_weighting', 'equal')
+        if weighting not in ENSEMBLE_WEIGHTINGS:
+            return jsonify({'error': f"ensemble_weighting must be one of: {', '.join(ENSEMBLE_WEIGHTINGS)}"}), 400
+
+        series = _load_close_series(symbol)
+        if series is None:
+            return jsonify({'error': 'Insufficient historical data'}), 400
+        train_series, test_series = train_test_split_series(series)
+
+        def on_complete(job):
+            _log_forecast_metadata(symbol, models, ensemble, weighting, preview_hours, preview_days, len(job['results']))
+
+        job = job_manager.submit(
+            symbol, models, payload, train_series, test_series, preview_days,
+            ensemble=ensemble, weighting=weighting, parallel=bool(payload.get('parallel', False)),
+            on_result=_save_forecast_result, on_complete=on_complete,
+            meta={
+                'preview_hours': preview_hours,
+                'preview_days': preview_days,
+                'preview_dates': _preview_dates(series, preview_days)
+            }
+        )
+        print(f"🧵 Queued forecast job {job['job_id']} for {symbol} with models: {job['models']}")
+        return jsonify({
+            'job_id': job['job_id'],
+            'status': job['status'],
+            'status_url': f"/api/forecast/jobs/{job['job_id']}"
+        }), 202
+    except JobStoreFull as e:
+        return jsonify({'error': str(e)}), 429
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/forecast/jobs/<job_id>', methods=['GET'])
+def get_forecast_job(job_id):
+    """Report a forecast job's status, per-model progress and finished results."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'job not found'}), 404
+    # Parallel jobs finish out of order; report results in model order
+    order = MODEL_ORDER + ['ensemble']
+    outputs = sorted(job['results'], key=lambda r: order.index(r['key']))
+    meta = job['meta']
+    return jsonify({
+        'job_id': job['job_id'],
+        'symbol': job['symbol'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+        'results': [_public_result(r) for r in outputs],
+        'preview': {
+            'dates': meta['preview_dates'],
+            'models': [_preview_entry(r, meta['preview_hours'], meta['preview_days']) for r in outputs if r['key'] != 'ensemble']
+        }
+    }), 200
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
+    app.run(debug=False, host='0.0.0.0', port=port)
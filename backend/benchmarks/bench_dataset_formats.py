@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark for reloading curated datasets from disk.
+
+Writes the same synthetic MarketData records with the curator's CSV,
+Parquet and Arrow IPC writers, then times loading each file back into a
+DataFrame the way a training pipeline would (for CSV: parse the text and
+split the headline column back into lists). Needs pyarrow.
+
+Usage:
+    python benchmarks/bench_dataset_formats.py
+    python benchmarks/bench_dataset_formats.py --rows 200000 --repeat 5
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path to import the curator
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dataset_export
+from fintech_data_curator import FinTechDataCurator, MarketData
+
+
+def _best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def synthetic_dataset(rows):
+    """MarketData records with realistic values and a few headlines per day."""
+    rng = np.random.default_rng(42)
+    closes = 100 + np.cumsum(rng.normal(0, 1, rows))
+    dates = pd.date_range('1990-01-01', periods=rows, freq='D').strftime('%Y-%m-%d')
+    headlines = [f'Shares move on "news" item {i}, analysts react' for i in range(8)]
+    return [
+        MarketData(
+            symbol='BENCH', exchange='NASDAQ', date=d, open_price=c, high_price=c + 1, low_price=c - 1,
+            close_price=c, volume=int(1e6 + i), daily_return=0.001, volatility=0.02,
+            sma_5=c, sma_20=c, rsi=50.0, news_headlines=headlines[:i % 4], news_sentiment_score=0.1
+        )
+        for i, (d, c) in enumerate(zip(dates, closes.tolist()))
+    ]
+
+
+def run_benchmark(rows, repeat):
+    """Write one file per format, then time loading each into a DataFrame."""
+    dataset_export.require_pyarrow()
+    curator = FinTechDataCurator(use_http_cache=False)
+    data = synthetic_dataset(rows)
+    workdir = tempfile.mkdtemp(prefix='bench_formats_')
+    paths = {fmt: os.path.join(workdir, f'data.{fmt}') for fmt in ('csv', 'parquet', 'arrow')}
+    try:
+        curator.save_to_csv(data, paths['csv'])
+        curator.save_to_parquet(data, paths['parquet'])
+        curator.save_to_arrow(data, paths['arrow'])
+
+        def load_csv():
+            df = pd.read_csv(paths['csv'], keep_default_na=False, na_values=[''])
+            df['news_headlines'] = df['news_headlines'].map(lambda text: text.split(' | ') if isinstance(text, str) else [])
+            return df
+
+        loaders = {
+            'csv': load_csv,
+            'parquet': lambda: dataset_export.read_table(paths['parquet']).to_pandas(),
+            'arrow': lambda: dataset_export.read_table(paths['arrow']).to_pandas(),
+        }
+
+        print("=" * 60)
+        print(f"Dataset load benchmark: rows={rows}, repeat={repeat}")
+        print("=" * 60)
+        baseline = None
+        for fmt, loader in loaders.items():
+            seconds = _best_of(loader, repeat)
+            baseline = baseline or seconds
+            size_mb = os.path.getsize(paths[fmt]) / 1e6
+            print(f"{fmt:<8} {seconds * 1e3:9.2f} ms  {size_mb:7.2f} MB  ({baseline / seconds:.1f}x vs csv)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV vs Parquet vs Arrow dataset loads')
+    parser.add_argument('--rows', type=int, default=50000, help='number of MarketData records')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for multi-step neural forecast inference.
+
+Compares the original one-`model.predict()`-per-step loop against the
+compiled rollout used by `LSTMForecaster.predict` and
+`TransformerForecaster.predict`, and times `predict_batch` over many
+scenarios.
+
+Usage:
+    python benchmarks/bench_inference.py
+    python benchmarks/bench_inference.py --horizon 30 --batch 64
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path to import ML models
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_models.forecasting import LSTMForecaster, TransformerForecaster, train_test_split_series
+
+
+def legacy_predict(forecaster, horizon):
+    """Per-step Keras predict() loop kept as the benchmark baseline."""
+    history = list(forecaster.train_all_scaled)
+    preds_scaled = []
+    for _ in range(horizon):
+        x = np.array(history[-forecaster.lookback:]).reshape((1, forecaster.lookback, 1))
+        yhat = float(np.asarray(forecaster.model.predict(x, verbose=0)).reshape(-1)[0])
+        preds_scaled.append(yhat)
+        history.append(yhat)
+    return forecaster._inv_scale(np.array(preds_scaled)).astype(float).tolist()
+
+
+def _best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(horizon, batch, repeat):
+    """Fit small models on a synthetic walk and report inference timings."""
+    rng = np.random.default_rng(42)
+    series = pd.Series(100 + np.cumsum(rng.normal(0, 1, 500)))
+    train, _ = train_test_split_series(series)
+
+    print("=" * 60)
+    print(f"Inference benchmark: horizon={horizon}, batch={batch}, repeat={repeat}")
+    print("=" * 60)
+    for forecaster in (LSTMForecaster(lookback=10, epochs=2), TransformerForecaster(lookback=24, epochs=2)):
+        forecaster.fit(train)
+        forecaster.predict(horizon)  # trace the compiled rollout once
+        legacy_s = _best_of(lambda: legacy_predict(forecaster, horizon), repeat)
+        rollout_s = _best_of(lambda: forecaster.predict(horizon), repeat)
+        histories = [train.values[:len(train) - i] for i in range(batch)]
+        batch_s = _best_of(lambda: forecaster.predict_batch(histories, horizon), repeat)
+        name = type(forecaster).__name__
+        print(f"{name:<22} per-step predict : {legacy_s * 1e3:9.2f} ms")
+        print(f"{name:<22} compiled rollout : {rollout_s * 1e3:9.2f} ms  ({legacy_s / rollout_s:.1f}x)")
+        print(f"{name:<22} batch of {batch:<7} : {batch_s * 1e3:9.2f} ms  ({batch_s / batch * 1e3:.3f} ms/series)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark multi-step neural forecast inference')
+    parser.add_argument('--horizon', type=int, default=30, help='forecast steps per rollout')
+    parser.add_argument('--batch', type=int, default=32, help='scenarios for predict_batch')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+    run_benchmark(args.horizon, args.batch, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
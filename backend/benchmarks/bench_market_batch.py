@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark for MarketData objects vs the columnar MarketDataBatch.
+
+Builds the same synthetic multi-symbol dataset as a list of MarketData
+objects and as one MarketDataBatch, then reports the memory each holds
+(tracemalloc) and the time to build predictor features and an Arrow
+table from each.
+
+Usage:
+    python benchmarks/bench_market_batch.py
+    python benchmarks/bench_market_batch.py --rows 500000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Add backend directory to path to import the curator
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dataset_export
+from market_data import MarketDataBatch
+from ml_models.predictor import FinancialPredictor
+from bench_dataset_formats import synthetic_dataset
+
+
+def _best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _allocated(build):
+    """Return (result, bytes still allocated by `build`)."""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def run_benchmark(rows, repeat):
+    """Compare memory and feature/Arrow conversion time for both layouts."""
+    source = synthetic_dataset(rows)
+    objects, objects_bytes = _allocated(lambda: synthetic_dataset(rows))
+    batch, batch_bytes = _allocated(lambda: MarketDataBatch.from_records(source))
+    del source
+    predictor = FinancialPredictor()
+
+    print("=" * 60)
+    print(f"MarketData layout benchmark: rows={rows}, repeat={repeat}")
+    print("=" * 60)
+    print(f"{'memory':<22} objects {objects_bytes / 1e6:8.1f} MB   batch {batch_bytes / 1e6:8.1f} MB"
+          f"  ({objects_bytes / batch_bytes:.1f}x)")
+
+    cases = [('prepare_features', lambda data: predictor.prepare_features({'data': data}))]
+    if dataset_export.pa is not None:
+        cases.append(('to_arrow', dataset_export.rows_to_table))
+    for label, fn in cases:
+        slow = _best_of(lambda: fn(objects), repeat)
+        fast = _best_of(lambda: fn(batch), repeat)
+        print(f"{label:<22} objects {slow * 1e3:8.1f} ms   batch {fast * 1e3:8.1f} ms  ({slow / fast:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark MarketData objects vs MarketDataBatch')
+    parser.add_argument('--rows', type=int, default=200000, help='number of records')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark for sequential vs parallel multi-model forecast runs.
+
+Runs ma+arima+lstm+transformer+ensemble on a synthetic series, first one
+model after another and then with every model fanned out to the forecast
+worker pool. The pool is warmed up first so worker start-up (spawn and
+TensorFlow import) is not counted. On a machine with at least four cores
+the parallel run should take roughly as long as the slowest model.
+
+Usage:
+    python benchmarks/bench_parallel.py
+    python benchmarks/bench_parallel.py --epochs 40 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+# Time real training, not registry hits
+os.environ['MODEL_CACHE_DIR'] = 'off'
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forecast_jobs import ForecastJobManager
+from ml_models.forecasting import train_test_split_series
+from ml_models.pipeline import MODEL_ORDER, run_forecast_models, run_model_task
+
+
+def run_benchmark(length, epochs, workers):
+    """Time one sequential and one parallel run of every model plus the ensemble."""
+    rng = np.random.default_rng(42)
+    series = pd.Series(100 + np.cumsum(rng.normal(0, 1, length)),
+                       index=pd.date_range('2020-01-01', periods=length, freq='D'))
+    train, test = train_test_split_series(series)
+    params = {'lstm_epochs': epochs, 'transformer_epochs': epochs}
+
+    manager = ForecastJobManager(executor_kind='process', max_workers=workers)
+    pool = manager.get_pool()
+    # Warm every worker so spawn + TensorFlow import is excluded
+    list(pool.map(run_model_task, ['BENCH'] * workers, ['ma'] * workers, [{}] * workers,
+                  [train] * workers, [test] * workers, [1] * workers))
+
+    print("=" * 60)
+    print(f"Parallel forecast benchmark: n={length}, epochs={epochs}, "
+          f"workers={manager.max_workers}, threads/worker={manager.threads_per_worker}")
+    print("=" * 60)
+
+    timings = {}
+
+    def track(key, state, res):
+        if state == 'running':
+            timings[key] = time.perf_counter()
+        elif state == 'done':
+            timings[key] = time.perf_counter() - timings[key]
+
+    start = time.perf_counter()
+    run_forecast_models('BENCH', MODEL_ORDER, params, train, test, 5, ensemble=True, on_progress=track)
+    sequential_s = time.perf_counter() - start
+    slowest = max(timings[k] for k in MODEL_ORDER)
+
+    start = time.perf_counter()
+    manager.run_models('BENCH', MODEL_ORDER, params, train, test, 5, ensemble=True, parallel=True)
+    parallel_s = time.perf_counter() - start
+    manager.shutdown()
+
+    for key in MODEL_ORDER:
+        print(f"{key:<12} sequential fit+eval : {timings[key]:8.2f} s")
+    print(f"{'sequential':<12} total             : {sequential_s:8.2f} s")
+    print(f"{'parallel':<12} total             : {parallel_s:8.2f} s  "
+          f"({sequential_s / parallel_s:.1f}x, slowest model {slowest:.2f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sequential vs parallel forecast runs')
+    parser.add_argument('--length', type=int, default=750, help='number of daily closes')
+    parser.add_argument('--epochs', type=int, default=20, help='LSTM/Transformer training epochs')
+    parser.add_argument('--workers', type=int, default=len(MODEL_ORDER), help='process pool size')
+    args = parser.parse_args()
+    run_benchmark(args.length, args.epochs, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for historical price reads.
+
+Compares the row-oriented `MongoDB.get_prices` (one dict per document)
+with the columnar `get_price_arrays` (one `$group`/`$push` document into NumPy)
+for a close-only read like the forecast endpoints do. Needs MONGOURI; the
+rows are written to a scratch collection that is dropped afterwards.
+
+Usage:
+    python benchmarks/bench_price_reads.py
+    python benchmarks/bench_price_reads.py --rows 20000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path to import the database module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.mongodb import MongoDB
+
+
+def _best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(rows, repeat):
+    """Load synthetic rows into a scratch collection and time both read paths."""
+    mongo = MongoDB()
+    if mongo.db is None:
+        raise SystemExit("MongoDB is not available (check MONGOURI)")
+    scratch = mongo.db.bench_historical_prices
+    scratch.drop()
+    dates = pd.date_range('1990-01-01', periods=rows, freq='D').strftime('%Y-%m-%d')
+    closes = 100 + np.cumsum(np.random.default_rng(42).normal(0, 1, rows))
+    scratch.insert_many([
+        {'symbol': 'BENCH', 'exchange': 'BENCH', 'date': d, 'open': c, 'high': c, 'low': c, 'close': c, 'volume': 1000}
+        for d, c in zip(dates, closes.tolist())
+    ])
+    scratch.create_index([('symbol', 1), ('date', 1)])
+    mongo._col_historical = scratch
+
+    def rows_path():
+        data = mongo.get_prices('BENCH', limit=rows)
+        df = pd.DataFrame(data).sort_values('date')
+        return pd.Series(df['close'].values, index=pd.to_datetime(df['date']))
+
+    def columnar_path():
+        return mongo.get_price_frame('BENCH', fields=['close'], limit=rows)['close']
+
+    try:
+        print("=" * 60)
+        print(f"Price read benchmark: rows={rows}, repeat={repeat}")
+        print("=" * 60)
+        rows_s = _best_of(rows_path, repeat)
+        columnar_s = _best_of(columnar_path, repeat)
+        print(f"get_prices + DataFrame : {rows_s * 1e3:9.2f} ms")
+        print(f"get_price_frame        : {columnar_s * 1e3:9.2f} ms  ({rows_s / columnar_s:.1f}x)")
+    finally:
+        scratch.drop()
+        mongo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark historical price read paths')
+    parser.add_argument('--rows', type=int, default=10000, help='number of price documents')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for headline sentiment scoring.
+
+Scores the same synthetic news (grouped by date, like the curator's news
+frame) with the original per-keyword `str.count` loop and with the
+keyword backend through SentimentScorer: cold (empty memo), from the
+on-disk score cache (a new process re-scoring known headlines) and warm
+(headlines scored before in this process), and reports headlines per
+second.
+
+Usage:
+    python benchmarks/bench_sentiment.py
+    python benchmarks/bench_sentiment.py --headlines 200000 --per-date 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add backend directory to path to import the scorer
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment import KeywordBackend, ScoreCache, SentimentScorer, legacy_sentiment_score, POSITIVE_WORDS, NEGATIVE_WORDS
+
+SUBJECTS = ['Apple', 'Microsoft', 'Tesla', 'Bitcoin', 'Nvidia', 'Amazon', 'Alphabet', 'Ethereum']
+FILLER = ['shares', 'stock', 'investors', 'analysts', 'quarter', 'earnings', 'revenue', 'outlook',
+          'market', 'price', 'target', 'after', 'report', 'as', 'on', 'enterprise', 'bestseller']
+
+
+def synthetic_headlines(count, seed=42):
+    """Headlines of 8-14 words mixing subjects, filler and lexicon keywords."""
+    rng = random.Random(seed)
+    keywords = list(POSITIVE_WORDS + NEGATIVE_WORDS)
+    headlines = []
+    for i in range(count):
+        words = [rng.choice(SUBJECTS)] + [
+            rng.choice(keywords) if rng.random() < 0.15 else rng.choice(FILLER)
+            for _ in range(rng.randint(7, 13))
+        ]
+        headlines.append(' '.join(words) + f' ({i})')
+    return headlines
+
+
+def _best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(count, per_date, repeat, cache_path):
+    """Compare headline throughput of the legacy loop and the keyword backend."""
+    headlines = synthetic_headlines(count)
+    groups = [headlines[i:i + per_date] for i in range(0, count, per_date)]
+
+    expected = np.array([legacy_sentiment_score(group) for group in groups])
+    warm = SentimentScorer(KeywordBackend(), cache=ScoreCache(cache_path), cache_size=2 * count)
+    assert np.allclose(warm.score_groups(groups), expected)
+
+    def from_disk():
+        scorer = SentimentScorer(KeywordBackend(), cache=ScoreCache(cache_path), cache_size=2 * count)
+        scorer.score_groups(groups)
+        scorer.close()
+
+    cases = [
+        ('legacy str.count', lambda: [legacy_sentiment_score(group) for group in groups]),
+        ('keyword (cold)', lambda: SentimentScorer(KeywordBackend(), cache_size=2 * count).score_groups(groups)),
+        ('keyword (disk)', from_disk),
+        ('keyword (warm)', lambda: warm.headline_scores(headlines)),
+    ]
+
+    print("=" * 60)
+    print(f"Sentiment benchmark: headlines={count}, per_date={per_date}, repeat={repeat}")
+    print("=" * 60)
+    baseline = None
+    for label, fn in cases:
+        elapsed = _best_of(fn, repeat)
+        baseline = baseline or elapsed
+        print(f"{label:<20} {elapsed * 1e3:8.1f} ms  {count / elapsed:12,.0f} headlines/s  ({baseline / elapsed:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark headline sentiment scoring')
+    parser.add_argument('--headlines', type=int, default=100000, help='number of headlines')
+    parser.add_argument('--per-date', type=int, default=10, help='headlines per news date')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        run_benchmark(args.headlines, args.per_date, args.repeat, os.path.join(tmp, 'scores.sqlite'))
+
+
+if __name__ == '__main__':
+    main()
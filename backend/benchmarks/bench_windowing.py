@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for supervised window construction.
+
+Compares the original list-append loop used to build LSTM/Transformer
+training windows against the strided `sliding_windows` view.
+
+Usage:
+    python benchmarks/bench_windowing.py
+    python benchmarks/bench_windowing.py --rows 2000 --lookback 24 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+# Add backend directory to path to import ML models
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_models.forecasting import sliding_windows
+
+
+def legacy_create_supervised(sequence, lookback):
+    """Loop-based window builder kept as the benchmark baseline."""
+    X, y = [], []
+    for i in range(len(sequence) - lookback):
+        X.append(sequence[i:i+lookback])
+        y.append(sequence[i+lookback])
+    return np.array(X), np.array(y)
+
+
+def run_benchmark(rows, lookback, repeat):
+    """Time both builders on a synthetic series and print a short report."""
+    series = np.random.default_rng(42).normal(100, 5, rows).astype('float32')
+
+    X_old, y_old = legacy_create_supervised(series, lookback)
+    X_new, y_new = sliding_windows(series, lookback)
+    assert np.array_equal(X_old, X_new[:, :, 0]) and np.array_equal(y_old, y_new)
+
+    legacy_s = min(timeit.repeat(lambda: legacy_create_supervised(series, lookback), number=1, repeat=repeat))
+    strided_s = min(timeit.repeat(lambda: sliding_windows(series, lookback), number=1, repeat=repeat))
+
+    print("=" * 60)
+    print(f"Windowing benchmark: rows={rows}, lookback={lookback}, repeat={repeat}")
+    print("=" * 60)
+    print(f"legacy loop      : {legacy_s * 1e3:9.3f} ms  ({X_old.nbytes / 1024:.1f} KiB copied)")
+    print(f"sliding_windows  : {strided_s * 1e3:9.3f} ms  (view, shares memory: {np.shares_memory(X_new, series)})")
+    print(f"speedup          : {legacy_s / strided_s:9.1f}x")
+    return legacy_s, strided_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark supervised window construction')
+    parser.add_argument('--rows', type=int, default=2000, help='length of the synthetic series')
+    parser.add_argument('--lookback', type=int, default=24, help='window length')
+    parser.add_argument('--repeat', type=int, default=20, help='timing repetitions (best is reported)')
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.lookback, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
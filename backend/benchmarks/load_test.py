@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the API.
+
+Hammers one or more GET paths from concurrent client threads for a fixed
+duration and reports requests/second and latency percentiles. Pass
+several labelled targets to compare serving modes, e.g. the development
+server against gunicorn:
+
+    python app.py                                   # :5000
+    PORT=8000 gunicorn -c gunicorn.conf.py wsgi:app # :8000
+    python benchmarks/load_test.py --target dev=http://localhost:5000 \\
+        --target gunicorn=http://localhost:8000 --paths /api/health /api/datasets
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --concurrency 32 --duration 20
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+import requests
+
+
+def _client(base_url, paths, deadline, latencies, errors, lock):
+    session = requests.Session()
+    local_latencies, local_errors, i = [], 0, 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = session.get(base_url + path, timeout=30)
+            if response.status_code >= 500:
+                local_errors += 1
+        except requests.RequestException:
+            local_errors += 1
+        local_latencies.append(time.perf_counter() - start)
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+
+def run_load(base_url, paths, concurrency, duration):
+    """Run `concurrency` clients for `duration` seconds; return a summary dict."""
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=_client, args=(base_url, paths, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    ms = np.array(latencies) * 1e3 if latencies else np.zeros(1)
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test API endpoints and report requests/second')
+    parser.add_argument('--target', action='append', default=None,
+                        help='label=base_url (repeatable); default local=http://localhost:5000')
+    parser.add_argument('--paths', nargs='+', default=['/api/health'], help='GET paths to cycle through')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent client threads')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per target')
+    parser.add_argument('--warmup', type=float, default=2.0, help='seconds of unmeasured warm-up per target')
+    args = parser.parse_args()
+
+    targets = [t.split('=', 1) if '=' in t else (t, t) for t in (args.target or ['local=http://localhost:5000'])]
+
+    print("=" * 72)
+    print(f"Load test: paths={' '.join(args.paths)}, concurrency={args.concurrency}, duration={args.duration}s")
+    print("=" * 72)
+    print(f"{'target':<12}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    baseline = None
+    for label, base_url in targets:
+        base_url = base_url.rstrip('/')
+        if args.warmup > 0:
+            run_load(base_url, args.paths, args.concurrency, args.warmup)
+        r = run_load(base_url, args.paths, args.concurrency, args.duration)
+        baseline = baseline or r['rps']
+        speedup = f"  ({r['rps'] / baseline:.1f}x)" if baseline else ''
+        print(f"{label:<12}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{speedup}")
+
+
+if __name__ == '__main__':
+    main()
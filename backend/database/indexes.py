@@ -0,0 +1,157 @@
+"""
+Index management for the fintech MongoDB collections
+
+INDEX_SPECS lists one index per query shape used by `MongoDB` (equality
+fields first, then the sort/range field). `ensure_indexes` creates them
+idempotently at connect time; `explain_report` runs each representative
+query through `explain()` to confirm it is served by an index scan.
+
+Usage:
+    python -m database.indexes            # create indexes
+    python -m database.indexes --explain  # create, then print the explain report
+"""
+
+import argparse
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+
+# collection -> list of (keys, options)
+INDEX_SPECS = {
+    'historical_prices': [
+        # save_historical_prices upserts / get_last_price_date(symbol, exchange)
+        ([('symbol', ASCENDING), ('exchange', ASCENDING), ('date', ASCENDING)],
+         {'name': 'symbol_exchange_date_unique', 'unique': True}),
+        # get_prices: symbol + date range, sorted by date
+        ([('symbol', ASCENDING), ('date', ASCENDING)], {'name': 'symbol_date'}),
+    ],
+    'indicator_state': [
+        # get_indicator_state / save_indicator_state
+        ([('symbol', ASCENDING), ('exchange', ASCENDING)], {'name': 'symbol_exchange_unique', 'unique': True}),
+    ],
+    'predictions': [
+        # get_predictions: symbol/model/forecast_horizon filters, newest first
+        ([('symbol', ASCENDING), ('model', ASCENDING), ('forecast_horizon', ASCENDING), ('created_at', DESCENDING)],
+         {'name': 'symbol_model_horizon_created'}),
+        # get_predictions(symbol) alone
+        ([('symbol', ASCENDING), ('created_at', DESCENDING)], {'name': 'symbol_created'}),
+        # get_recent_predictions
+        ([('created_at', DESCENDING)], {'name': 'created'}),
+    ],
+    'datasets': [
+        # get_latest_data: newest dataset per symbol
+        ([('symbol', ASCENDING), ('generated_at', DESCENDING)], {'name': 'symbol_generated'}),
+        # get_all_datasets / get_recent_datasets / get_last_generated_date
+        ([('generated_at', DESCENDING)], {'name': 'generated'}),
+    ],
+    'dataset_rows': [
+        # get_dataset_rows: one dataset's rows paged by seq
+        ([('dataset_id', ASCENDING), ('seq', ASCENDING)], {'name': 'dataset_seq_unique', 'unique': True}),
+    ],
+    'metadata': [
+        # get_metadata / upsert_metadata by symbol
+        ([('symbol', ASCENDING)], {'name': 'symbol_unique', 'unique': True}),
+    ],
+}
+
+# Representative queries for the explain report: (label, collection, filter, sort)
+EXPLAIN_QUERIES = [
+    ('get_prices', 'historical_prices',
+     {'symbol': 'AAPL', 'date': {'$gte': '2024-01-01', '$lte': '2024-12-31'}}, [('date', ASCENDING)]),
+    ('get_last_price_date', 'historical_prices',
+     {'symbol': 'AAPL', 'exchange': 'NASDAQ'}, [('date', DESCENDING)]),
+    ('get_predictions', 'predictions',
+     {'symbol': 'AAPL', 'model': 'LSTM', 'forecast_horizon': 30}, [('created_at', DESCENDING)]),
+    ('get_predictions(symbol)', 'predictions', {'symbol': 'AAPL'}, [('created_at', DESCENDING)]),
+    ('get_latest_data', 'datasets', {'symbol': 'AAPL'}, [('generated_at', DESCENDING)]),
+    ('get_dataset_rows', 'dataset_rows',
+     {'dataset_id': ObjectId('000000000000000000000000'), 'seq': {'$gt': 499}}, [('seq', ASCENDING)]),
+    ('get_metadata', 'metadata', {'symbol': 'AAPL'}, None),
+    ('get_indicator_state', 'indicator_state', {'symbol': 'AAPL', 'exchange': 'NASDAQ'}, None),
+]
+
+
+def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create every index in INDEX_SPECS that is missing; safe to call repeatedly.
+
+    An index that cannot be built (e.g. the unique price index over existing
+    duplicate rows) is reported and skipped so startup still succeeds.
+    Returns the index names available per collection.
+    """
+    created: Dict[str, List[str]] = {}
+    for collection_name, specs in INDEX_SPECS.items():
+        collection = db[collection_name]
+        created[collection_name] = []
+        for keys, options in specs:
+            try:
+                created[collection_name].append(collection.create_index(keys, **options))
+            except OperationFailure as e:
+                print(f"⚠️ Could not create index {options.get('name')} on {collection_name}: {e}")
+    return created
+
+
+def _winning_stages(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a winning plan tree into its stages, root first."""
+    stages = []
+    while plan:
+        stages.append(plan)
+        plan = plan.get('inputStage') or (plan.get('inputStages') or [None])[0]
+    return stages
+
+
+def explain_report(db) -> List[Dict[str, Any]]:
+    """Explain each EXPLAIN_QUERIES entry and summarise the chosen plan."""
+    report = []
+    for label, collection_name, query, sort in EXPLAIN_QUERIES:
+        cursor = db[collection_name].find(query).limit(50)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = cursor.explain()
+        planner = explain.get('queryPlanner', {})
+        stages = _winning_stages(planner.get('winningPlan', {}))
+        index_stage = next((s for s in stages if s.get('stage') == 'IXSCAN'), None)
+        stats = explain.get('executionStats', {})
+        report.append({
+            'query': label,
+            'collection': collection_name,
+            'stages': [s.get('stage') for s in stages],
+            'index': index_stage.get('indexName') if index_stage else None,
+            'collection_scan': any(s.get('stage') == 'COLLSCAN' for s in stages),
+            'in_memory_sort': any(s.get('stage') == 'SORT' for s in stages),
+            'docs_examined': stats.get('totalDocsExamined'),
+            'keys_examined': stats.get('totalKeysExamined'),
+        })
+    return report
+
+
+def print_explain_report(report: List[Dict[str, Any]]) -> None:
+    print("=" * 72)
+    print(f"{'query':<26}{'index':<32}{'plan'}")
+    print("=" * 72)
+    for row in report:
+        flag = '❌ COLLSCAN' if row['collection_scan'] else ('⚠️ SORT' if row['in_memory_sort'] else '✅')
+        print(f"{row['query']:<26}{(row['index'] or '-'):<32}{flag} {' <- '.join(row['stages'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create MongoDB indexes and report query plans')
+    parser.add_argument('--explain', action='store_true', help='print an explain-plan report after indexing')
+    args = parser.parse_args()
+
+    from database.mongodb import MongoDB
+    mongo = MongoDB()
+    if mongo.db is None:
+        raise SystemExit("MongoDB is not available (check MONGOURI)")
+    for collection_name, names in ensure_indexes(mongo.db).items():
+        print(f"✅ {collection_name}: {', '.join(names)}")
+    if args.explain:
+        print_explain_report(explain_report(mongo.db))
+    mongo.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,60 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 import os
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
+from database.indexes import ensure_indexes, explain_report
 
 load_dotenv()
 
+# Column dtypes for the columnar price read path
+PRICE_FIELDS = {
+    'date': object,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.int64
+}
+
+# Dataset headers are listed without any legacy embedded `data` array
+DATASET_LIST_PROJECTION = {'data': 0}
+# Rows written / read per round trip for the dataset_rows collection
+DATASET_ROW_BATCH = 1000
+# _id of the running dataset totals document in the `stats` collection
+DATASET_STATS_ID = 'datasets'
+# Indicator values stored on historical_prices rows when the caller provides them
+PRICE_INDICATOR_FIELDS = ('daily_return', 'volatility', 'sma_5', 'sma_20', 'rsi')
+
 class MongoDB:
     def __init__(self):
         self.client = None
         self.db = None
+        # Callables (kind, symbol) told about every successful write
+        self._write_listeners = []
+        self._reset_collections()
         self.connect()
-        # Lazily cached collection handles
+    
+    def _reset_collections(self):
+        """Forget the collection handles primed by connect()."""
         self._col_datasets = None
         self._col_predictions = None
         self._col_historical = None
         self._col_metadata = None
+        self._col_dataset_rows = None
+        self._col_stats = None
+        self._col_indicator_state = None
     
-    def connect(self):
+    def _collection(self, handle, name):
+        """
+        `handle` if it is set, else collection `name` of the current database.
+        Compared with None because pymongo Collections refuse truth-value tests.
+        """
+        return handle if handle is not None else getattr(self.db, name)
+    
+    def connect(self, ensure_indexes=True):
         """Establish a client connection and prime common collections."""
         try:
             mongodb_uri = os.getenv('MONGOURI')
@@ -30,15 +68,73 @@ class MongoDB:
             self._col_predictions = self.db.predictions
             self._col_historical = self.db.historical_prices
             self._col_metadata = self.db.metadata
+            self._col_dataset_rows = self.db.dataset_rows
+            self._col_stats = self.db.stats
+            self._col_indicator_state = self.db.indicator_state
             
             # Test connection
             self.client.admin.command('ping')
             print("✅ Connected to MongoDB successfully")
+            if ensure_indexes and os.getenv('MONGO_ENSURE_INDEXES', '1').lower() not in ('0', 'false', 'no'):
+                self.ensure_indexes()
             
         except Exception as e:
             print(f"❌ Failed to connect to MongoDB: {e}")
             self.client = None
             self.db = None
+            self._reset_collections()
+    
+    def reconnect(self):
+        """
+        Replace the client with a fresh one, e.g. in a worker forked from a
+        preloading server. MongoClient is not fork-safe, so the inherited
+        client is dropped (not closed: its sockets belong to the parent).
+        Write listeners are kept; collection handles are re-primed from the
+        new client.
+        """
+        self.client = None
+        self.db = None
+        self._reset_collections()
+        self.connect(ensure_indexes=False)
+        return self.db is not None
+    
+    def ensure_indexes(self):
+        """Create the indexes backing our query shapes (idempotent; never blocks startup)."""
+        try:
+            if self.db is None:
+                return {}
+            created = ensure_indexes(self.db)
+            print(f"✅ MongoDB indexes ensured ({sum(len(v) for v in created.values())} total)")
+            return created
+        except Exception as e:
+            print(f"⚠️ Index bootstrap failed: {e}")
+            return {}
+    
+    def explain_indexes(self):
+        """Return the explain-plan summary for each indexed query shape."""
+        try:
+            if self.db is None:
+                raise Exception("Database not connected")
+            return explain_report(self.db)
+        except Exception as e:
+            print(f"Error explaining queries: {e}")
+            return []
+    
+    def add_write_listener(self, listener):
+        """
+        Register `listener(kind, symbol)`, called after each successful write.
+
+        kind is 'datasets', 'prices', 'predictions' or 'metadata'; used by the
+        API's response cache to drop entries for the written symbol.
+        """
+        self._write_listeners.append(listener)
+    
+    def _notify_write(self, kind, symbol=None):
+        for listener in self._write_listeners:
+            try:
+                listener(kind, symbol)
+            except Exception as e:
+                print(f"⚠️ Write listener failed for {kind}/{symbol}: {e}")
     
     def test_connection(self):
         """Ping the admin DB to verify connectivity."""
@@ -51,25 +147,222 @@ class MongoDB:
         return False
     
     def save_dataset(self, dataset_data):
-        """Insert a dataset document and return the insert result."""
+        """
+        Insert a dataset header and store its rows in `dataset_rows`.
+
+        A `data` list in `dataset_data` is not embedded in the header; each
+        row is written as its own document keyed by (dataset_id, seq).
+        Returns the header insert result.
+        """
         try:
             if self.db is None:
                 raise Exception("Database not connected")
             
-            collection = self._col_datasets or self.db.datasets
-            result = collection.insert_one(dataset_data)
+            collection = self._collection(self._col_datasets, 'datasets')
+            rows = dataset_data.get('data')
+            if rows is None:
+                result = collection.insert_one(dataset_data)
+                self._record_dataset_stats(dataset_data)
+                self._notify_write('datasets', dataset_data.get('symbol'))
+                return result
+            
+            header = {k: v for k, v in dataset_data.items() if k != 'data'}
+            header.setdefault('records', len(rows))
+            header['row_storage'] = 'dataset_rows'
+            result = collection.insert_one(header)
+            try:
+                self.save_dataset_rows(result.inserted_id, rows)
+            except Exception:
+                # Do not leave a header pointing at a partial row set
+                collection.delete_one({'_id': result.inserted_id})
+                self._collection(self._col_dataset_rows, 'dataset_rows').delete_many({'dataset_id': result.inserted_id})
+                raise
+            self._record_dataset_stats(header)
+            self._notify_write('datasets', header.get('symbol'))
             return result
         except Exception as e:
             print(f"Error saving dataset: {e}")
             raise
     
+    def _record_dataset_stats(self, header):
+        """
+        Fold one saved dataset into the running totals with a single atomic update.
+
+        Only a built totals document is updated: before the first backfill
+        the dataset is already in `datasets`, so the backfill counts it,
+        and adding it here as well would count it twice.
+        """
+        try:
+            update = {'$inc': {'total_datasets': 1, 'total_records': int(header.get('records') or 0)}}
+            if header.get('generated_at') is not None:
+                update['$max'] = {'last_generated_at': header['generated_at']}
+            self._collection(self._col_stats, 'stats').update_one({'_id': DATASET_STATS_ID, 'built': True}, update)
+        except Exception as e:
+            # The totals can be rebuilt; never fail a save over them
+            print(f"⚠️ Failed to update dataset stats: {e}")
+    
+    def _aggregate_dataset_stats(self):
+        """Totals over the datasets collection (one $group pass)."""
+        collection = self._collection(self._col_datasets, 'datasets')
+        pipeline = [{"$group": {
+            "_id": None,
+            "total_datasets": {"$sum": 1},
+            "total_records": {"$sum": "$records"},
+            "last_generated_at": {"$max": "$generated_at"}
+        }}]
+        result = list(collection.aggregate(pipeline))
+        totals = result[0] if result else {'total_datasets': 0, 'total_records': 0, 'last_generated_at': None}
+        return {
+            'total_datasets': totals['total_datasets'],
+            'total_records': totals['total_records'],
+            'last_generated_at': totals['last_generated_at'],
+            'built': True
+        }
+    
+    def _backfill_dataset_stats(self):
+        """
+        Build the totals document unless it is already built.
+
+        The write matches only an unbuilt (or missing) document, so a
+        backfill racing another one, or saves incrementing a built
+        document, is never overwritten; the loser reads the winner's totals.
+        """
+        stats = self._collection(self._col_stats, 'stats')
+        doc = self._aggregate_dataset_stats()
+        try:
+            stats.update_one({'_id': DATASET_STATS_ID, 'built': {'$ne': True}}, {'$set': doc}, upsert=True)
+        except DuplicateKeyError:
+            return stats.find_one({'_id': DATASET_STATS_ID}) or doc
+        return doc
+    
+    def rebuild_dataset_stats(self):
+        """
+        Recompute the totals document from the datasets collection, replacing it.
+
+        A repair tool: saves that land during the scan may be counted twice
+        or not at all, so run it while no datasets are being saved.
+        """
+        if self.db is None:
+            raise Exception("Database not connected")
+        doc = self._aggregate_dataset_stats()
+        self._collection(self._col_stats, 'stats').replace_one({'_id': DATASET_STATS_ID}, doc, upsert=True)
+        return doc
+    
+    def get_dataset_stats(self):
+        """
+        Return {'totalDatasets', 'totalRecords', 'lastGenerated'} from the totals document.
+        
+        Reads one document; the first call on a database without a built
+        one backfills it from the existing datasets.
+        """
+        empty = {'totalDatasets': 0, 'totalRecords': 0, 'lastGenerated': None}
+        try:
+            if self.db is None:
+                return empty
+            doc = self._collection(self._col_stats, 'stats').find_one({'_id': DATASET_STATS_ID})
+            if doc is None or not doc.get('built'):
+                doc = self._backfill_dataset_stats()
+            last = doc.get('last_generated_at')
+            return {
+                'totalDatasets': doc.get('total_datasets', 0),
+                'totalRecords': doc.get('total_records', 0),
+                'lastGenerated': last.strftime('%Y-%m-%d %H:%M:%S') if last else None
+            }
+        except Exception as e:
+            print(f"Error getting dataset stats: {e}")
+            return empty
+    
+    def save_dataset_rows(self, dataset_id, rows, start_seq=0):
+        """Write rows for a dataset in batches, numbering them from start_seq."""
+        if self.db is None:
+            raise Exception("Database not connected")
+        
+        collection = self._collection(self._col_dataset_rows, 'dataset_rows')
+        written = 0
+        for offset in range(0, len(rows), DATASET_ROW_BATCH):
+            batch = [
+                dict(row, dataset_id=dataset_id, seq=start_seq + offset + i)
+                for i, row in enumerate(rows[offset:offset + DATASET_ROW_BATCH])
+            ]
+            collection.insert_many(batch, ordered=False)
+            written += len(batch)
+        return written
+    
+    def get_dataset_rows(self, dataset_id, after=None, limit=500):
+        """
+        Return one page of dataset rows ordered by seq.
+
+        `after` is the `next_cursor` of the previous page (None for the first
+        page). Returns {'rows': [...], 'next_cursor': int or None}, or None if
+        the dataset does not exist (or the id is not an ObjectId). Datasets
+        saved before rows were split out are paged from their embedded `data`
+        array. Database errors are raised, not reported as a missing dataset,
+        so an export cannot end early with a well-formed but truncated file.
+        """
+        if self.db is None:
+            raise Exception("Database not connected")
+        
+        from bson import ObjectId
+        from bson.errors import InvalidId
+        try:
+            oid = ObjectId(dataset_id)
+        except (InvalidId, TypeError):
+            return None
+        start = 0 if after is None else int(after) + 1
+        limit = max(1, int(limit))
+        collection = self._collection(self._col_datasets, 'datasets')
+        header = collection.find_one({'_id': oid}, {'row_storage': 1, 'data': {'$slice': [start, limit + 1]}})
+        if header is None:
+            return None
+        
+        if 'data' in header:
+            rows = [dict(row, seq=start + i) for i, row in enumerate(header['data'])]
+        else:
+            rows_col = self._collection(self._col_dataset_rows, 'dataset_rows')
+            query = {'dataset_id': oid}
+            if after is not None:
+                query['seq'] = {'$gt': int(after)}
+            rows = list(
+                rows_col.find(query, {'_id': 0, 'dataset_id': 0})
+                .sort('seq', 1)
+                .limit(limit + 1)
+                .batch_size(min(limit + 1, DATASET_ROW_BATCH))
+            )
+        
+        # The extra row only tells us whether another page exists
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        for row in rows:
+            self._clean_nan_values(row)
+        return {
+            'rows': rows,
+            'next_cursor': rows[-1]['seq'] if has_more else None
+        }
+    
+    def iter_dataset_rows(self, dataset_id, batch_size=DATASET_ROW_BATCH):
+        """
+        Yield every row of a dataset in seq order, one page at a time.
+
+        A database error on any page propagates to the consumer (e.g. aborts
+        a streamed export) instead of ending the rows early.
+        """
+        after = None
+        while True:
+            page = self.get_dataset_rows(dataset_id, after=after, limit=batch_size)
+            if not page:
+                return
+            yield from page['rows']
+            if page['next_cursor'] is None:
+                return
+            after = page['next_cursor']
+    
     def get_dataset_by_id(self, dataset_id):
         """Find a dataset by its ObjectId string."""
         try:
             if self.db is None:
                 raise Exception("Database not connected")
             
-            collection = self._col_datasets or self.db.datasets
+            collection = self._collection(self._col_datasets, 'datasets')
             from bson import ObjectId
             return collection.find_one({"_id": ObjectId(dataset_id)})
         except Exception as e:
@@ -77,21 +370,18 @@ class MongoDB:
             return None
     
     def get_all_datasets(self):
-        """Return all dataset documents, newest first, with NaNs cleaned."""
+        """Return all dataset headers (no rows), newest first, with NaNs cleaned."""
         try:
             if self.db is None:
                 raise Exception("Database not connected")
             
-            collection = self._col_datasets or self.db.datasets
-            datasets = list(collection.find().sort("generated_at", -1))
+            collection = self._collection(self._col_datasets, 'datasets')
+            datasets = list(collection.find({}, DATASET_LIST_PROJECTION).sort("generated_at", -1))
             
             # Convert ObjectId to string and handle NaN values for JSON serialization
             for dataset in datasets:
                 dataset['_id'] = str(dataset['_id'])
-                # Clean up data array to handle NaN values
-                if 'data' in dataset and isinstance(dataset['data'], list):
-                    for record in dataset['data']:
-                        self._clean_nan_values(record)
+                self._clean_nan_values(dataset)
             
             return datasets
         except Exception as e:
@@ -119,8 +409,8 @@ class MongoDB:
             if self.db is None:
                 raise Exception("Database not connected")
             
-            collection = self._datasets_col or self.db.datasets
-            datasets = list(collection.find().sort("generated_at", -1).limit(limit))
+            collection = self._collection(self._col_datasets, 'datasets')
+            datasets = list(collection.find({}, DATASET_LIST_PROJECTION).sort("generated_at", -1).limit(limit))
             
             # Convert ObjectId to string and format for frontend
             formatted_datasets = []
@@ -139,16 +429,18 @@ class MongoDB:
             return []
     
     def get_latest_data(self, symbol):
-        """Return the latest dataset document for a given symbol."""
+        """Return the latest dataset document for a given symbol, with its rows as `data`."""
         try:
             if self.db is None:
                 raise Exception("Database not connected")
             
-            collection = self._datasets_col or self.db.datasets
+            collection = self._collection(self._col_datasets, 'datasets')
             latest = collection.find_one(
                 {"symbol": symbol},
                 sort=[("generated_at", -1)]
             )
+            if latest is not None and 'data' not in latest:
+                latest['data'] = list(self.iter_dataset_rows(latest['_id']))
             return latest
         except Exception as e:
             print(f"Error getting latest data: {e}")
@@ -160,8 +452,9 @@ class MongoDB:
             if self.db is None:
                 raise Exception("Database not connected")
             
-            collection = self._col_predictions or self.db.predictions
+            collection = self._collection(self._col_predictions, 'predictions')
             result = collection.insert_one(prediction_data)
+            self._notify_write('predictions', prediction_data.get('symbol'))
             return result
         except Exception as e:
             print(f"Error saving prediction: {e}")
@@ -173,7 +466,7 @@ class MongoDB:
             if self.db is None:
                 raise Exception("Database not connected")
             
-            collection = self._col_predictions or self.db.predictions
+            collection = self._collection(self._col_predictions, 'predictions')
             predictions = list(collection.find().sort("created_at", -1).limit(limit))
             
             # Convert ObjectId to string
@@ -186,22 +479,24 @@ class MongoDB:
             return []
 
     # New: Historical Prices APIs
-    def save_historical_prices(self, symbol, exchange, prices):
-        """Bulk-insert curated OHLCV rows into `historical_prices` for a symbol."""
+    def save_historical_prices(self, symbol, exchange, prices, indicator_fields=PRICE_INDICATOR_FIELDS):
+        """
+        Upsert curated OHLCV rows into `historical_prices`, keyed on (symbol, exchange, date).
+        Row keys listed in `indicator_fields` are stored as well (NaN as null).
+        """
         try:
             if self.db is None:
                 raise Exception("Database not connected")
-            collection = self._col_historical or self.db.historical_prices
+            collection = self._collection(self._col_historical, 'historical_prices')
             if not prices:
                 print("⚠️ No prices data provided to save_historical_prices")
                 return None
             
             print(f"💾 Saving {len(prices)} historical price records for {symbol}")
             
-            # First, remove existing records for this symbol to avoid duplicates
-            collection.delete_many({'symbol': symbol, 'exchange': exchange})
-            
-            docs = []
+            # One upsert per date: re-saving overlapping rows is idempotent and
+            # existing history stays readable while new bars are written
+            ops_by_date = {}
             for i, p in enumerate(prices):
                 try:
                     doc = {
@@ -214,14 +509,23 @@ class MongoDB:
                         'close': float(p.get('close_price') or p.get('close') or 0),
                         'volume': int(p.get('volume') or 0)
                     }
-                    docs.append(doc)
+                    for field in indicator_fields:
+                        if field in p:
+                            value = p[field]
+                            doc[field] = None if value is None or pd.isna(value) else float(value)
+                    ops_by_date[doc['date']] = UpdateOne(
+                        {'symbol': symbol, 'exchange': exchange, 'date': doc['date']},
+                        {'$set': doc},
+                        upsert=True
+                    )
                 except Exception as e:
                     print(f"⚠️ Error processing price record {i}: {e}")
                     continue
             
-            if docs:
-                result = collection.insert_many(docs, ordered=False)
-                print(f"✅ Successfully saved {len(result.inserted_ids)} historical price records")
+            if ops_by_date:
+                result = collection.bulk_write(list(ops_by_date.values()), ordered=False)
+                print(f"✅ Historical prices saved: {result.upserted_count} new, {result.modified_count} updated")
+                self._notify_write('prices', symbol)
                 return result
             else:
                 print("❌ No valid price records to save")
@@ -232,12 +536,58 @@ class MongoDB:
             traceback.print_exc()
             return None
 
+    def get_last_price_date(self, symbol, exchange=None):
+        """Return the most recent stored price date ('YYYY-MM-DD') for a symbol, or None."""
+        try:
+            if self.db is None:
+                raise Exception("Database not connected")
+            collection = self._collection(self._col_historical, 'historical_prices')
+            query = {'symbol': symbol}
+            if exchange:
+                query['exchange'] = exchange
+            latest = collection.find_one(query, projection={'date': 1, '_id': 0}, sort=[('date', -1)])
+            return latest.get('date') if latest else None
+        except Exception as e:
+            print(f"Error getting last price date: {e}")
+            return None
+
+    def get_indicator_state(self, symbol, exchange):
+        """Return the stored streaming indicator state dict for (symbol, exchange), or None."""
+        try:
+            if self.db is None:
+                raise Exception("Database not connected")
+            collection = self._collection(self._col_indicator_state, 'indicator_state')
+            doc = collection.find_one({'symbol': symbol, 'exchange': exchange}, projection={'state': 1, '_id': 0})
+            return doc.get('state') if doc else None
+        except Exception as e:
+            print(f"Error getting indicator state: {e}")
+            return None
+
+    def save_indicator_state(self, symbol, exchange, state):
+        """
+        Store the streaming indicator state (IndicatorState.to_dict()) of a
+        symbol next to its historical_prices rows; one document per (symbol, exchange).
+        """
+        try:
+            if self.db is None:
+                raise Exception("Database not connected")
+            collection = self._collection(self._col_indicator_state, 'indicator_state')
+            return collection.replace_one(
+                {'symbol': symbol, 'exchange': exchange},
+                {'symbol': symbol, 'exchange': exchange, 'state': state,
+                 'last_date': state.get('last_date'), 'updated_at': datetime.now()},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"❌ Error saving indicator state: {e}")
+            return None
+
     def get_prices(self, symbol, start_date=None, end_date=None, limit=500):
         """Query historical OHLCV rows filtered by symbol and optional date range."""
         try:
             if self.db is None:
                 raise Exception("Database not connected")
-            collection = self._col_historical or self.db.historical_prices
+            collection = self._collection(self._col_historical, 'historical_prices')
             query = {'symbol': symbol}
             if start_date or end_date:
                 query['date'] = {}
@@ -262,14 +612,85 @@ class MongoDB:
             print(f"Error getting prices: {e}")
             return []
 
+    def get_price_arrays(self, symbol, fields=('date', 'close'), start_date=None, end_date=None,
+                         limit=500):
+        """
+        Return historical price columns as NumPy arrays, e.g. {'date': ..., 'close': ...}.
+        
+        Same filter/sort/limit as get_prices, but the server packs the rows
+        into one array per field (`$group`/`$push`), so the client decodes a
+        single document instead of one dict per row. The result document is
+        bounded by MongoDB's 16 MB limit (several hundred thousand rows of a
+        few fields). Missing numeric values become NaN (0 for volume).
+        """
+        fields = list(fields)
+        unknown = [f for f in fields if f not in PRICE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown price fields: {unknown}")
+        try:
+            if self.db is None:
+                raise Exception("Database not connected")
+            collection = self._collection(self._col_historical, 'historical_prices')
+            query = {'symbol': symbol}
+            if start_date or end_date:
+                query['date'] = {}
+                if start_date:
+                    query['date']['$gte'] = start_date
+                if end_date:
+                    query['date']['$lte'] = end_date
+            pipeline = [{'$match': query}, {'$sort': {'date': 1}}]
+            if limit:
+                pipeline.append({'$limit': int(limit)})
+            # $ifNull keeps a slot for missing fields so the columns stay aligned
+            pipeline.append({'$group': dict(
+                {'_id': None},
+                **{f: {'$push': {'$ifNull': [f'${f}', None]}} for f in fields}
+            )})
+            packed = next(iter(collection.aggregate(pipeline)), None) or {}
+            arrays = {}
+            for field in fields:
+                values = packed.get(field, [])
+                dtype = PRICE_FIELDS[field]
+                if dtype is np.float64:
+                    arrays[field] = np.array(values, dtype=np.float64)
+                elif dtype is np.int64:
+                    arrays[field] = np.array([v or 0 for v in values], dtype=np.int64)
+                else:
+                    arrays[field] = np.array(values, dtype=object)
+            return arrays
+        except Exception as e:
+            print(f"Error getting price arrays: {e}")
+            return {f: np.array([], dtype=PRICE_FIELDS[f]) for f in fields}
+
+    def get_price_frame(self, symbol, fields=('close',), start_date=None, end_date=None, limit=500):
+        """Return historical price columns as a DataFrame indexed by (datetime) date."""
+        fields = [f for f in fields if f != 'date']
+        arrays = self.get_price_arrays(symbol, fields=['date'] + fields,
+                                       start_date=start_date, end_date=end_date, limit=limit)
+        index = pd.DatetimeIndex(pd.to_datetime(arrays.pop('date')), name='date')
+        return pd.DataFrame(arrays, index=index, columns=fields)
+
+    def iter_price_rows(self, symbols=None, batch_size=1000):
+        """Yield stored price rows (optionally only `symbols`) ordered by symbol and date."""
+        if self.db is None:
+            raise Exception("Database not connected")
+        collection = self._collection(self._col_historical, 'historical_prices')
+        query = {'symbol': {'$in': list(symbols)}} if symbols else {}
+        projection = {'_id': 0, 'symbol': 1, 'exchange': 1, 'date': 1}
+        projection.update({f: 1 for f in PRICE_FIELDS})
+        cursor = collection.find(query, projection=projection, batch_size=batch_size).sort([('symbol', 1), ('date', 1)])
+        for doc in cursor:
+            yield doc
+
     # New: Forecast and Metadata helpers
     def save_forecast(self, forecast_data):
         """Insert a forecast document with model metadata and predictions."""
         try:
             if self.db is None:
                 raise Exception("Database not connected")
-            collection = self._col_predictions or self.db.predictions
+            collection = self._collection(self._col_predictions, 'predictions')
             result = collection.insert_one(forecast_data)
+            self._notify_write('predictions', forecast_data.get('symbol'))
             return result
         except Exception as e:
             print(f"Error saving forecast: {e}")
@@ -280,7 +701,7 @@ class MongoDB:
         try:
             if self.db is None:
                 raise Exception("Database not connected")
-            collection = self._predictions_col or self.db.predictions
+            collection = self._collection(self._col_predictions, 'predictions')
             query = {}
             if symbol:
                 query['symbol'] = symbol
@@ -307,7 +728,7 @@ class MongoDB:
                 raise Exception("Database not connected")
             
             print(f"💾 Upserting metadata for symbol: {symbol}")
-            collection = self._col_metadata or self.db.metadata
+            collection = self._collection(self._col_metadata, 'metadata')
             from pymongo import ReturnDocument
             
             update_doc = {
@@ -335,6 +756,7 @@ class MongoDB:
                 updated['_id'] = str(updated['_id'])
             
             print(f"✅ Successfully upserted metadata for {symbol}")
+            self._notify_write('metadata', symbol)
             return updated
         except Exception as e:
             print(f"❌ Error upserting metadata for {symbol}: {e}")
@@ -347,7 +769,7 @@ class MongoDB:
         try:
             if self.db is None:
                 raise Exception("Database not connected")
-            collection = self._col_metadata or self.db.metadata
+            collection = self._collection(self._col_metadata, 'metadata')
             if symbol:
                 doc = collection.find_one({'symbol': symbol})
                 if doc and '_id' in doc:
@@ -367,7 +789,7 @@ class MongoDB:
             if self.db is None:
                 return 0
             
-            collection = self._col_datasets or self.db.datasets
+            collection = self._collection(self._col_datasets, 'datasets')
             return collection.count_documents({})
         except:
             return 0
@@ -378,7 +800,7 @@ class MongoDB:
             if self.db is None:
                 return 0
             
-            collection = self._col_datasets or self.db.datasets
+            collection = self._collection(self._col_datasets, 'datasets')
             pipeline = [{"$group": {"_id": None, "total": {"$sum": "$records"}}}]
             result = list(collection.aggregate(pipeline))
             return result[0]['total'] if result else 0
@@ -391,8 +813,8 @@ class MongoDB:
             if self.db is None:
                 return None
             
-            collection = self._datasets_col or self.db.datasets
-            latest = collection.find_one(sort=[("generated_at", -1)])
+            collection = self._collection(self._col_datasets, 'datasets')
+            latest = collection.find_one({}, {'generated_at': 1}, sort=[("generated_at", -1)])
             return latest['generated_at'].strftime('%Y-%m-%d %H:%M:%S') if latest else None
         except:
             return None
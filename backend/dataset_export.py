@@ -0,0 +1,349 @@
+"""
+Streaming dataset exports
+
+Row formatting for the CSV and JSON downloads plus generators that turn
+an iterable of dataset rows into text chunks. Rows are consumed as they
+arrive (e.g. from `MongoDB.iter_dataset_rows`, which pages the Mongo
+cursor), so memory use depends on the chunk size, not the dataset size.
+`gzip_chunks` compresses any chunk stream incrementally.
+
+Parquet and Arrow IPC exports need the optional `pyarrow` package; they
+keep column dtypes (float64 prices, int64 volume, date32 dates, list of
+string headlines) so files reload without text parsing.
+"""
+
+import csv
+import io
+import json
+import math
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency: only the columnar formats need it
+    pa = None
+    pq = None
+
+
+CSV_FIELDS = [
+    'symbol', 'exchange', 'date', 'open_price', 'high_price', 'low_price',
+    'close_price', 'volume', 'daily_return', 'volatility', 'sma_5', 'sma_20',
+    'rsi', 'news_headlines', 'news_sentiment_score', 'sentiment_backend'
+]
+
+# Rows formatted per yielded chunk
+EXPORT_CHUNK_ROWS = 500
+
+# Columnar formats by name -> file extension
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Column types for the columnar formats (pyarrow type names)
+MARKET_DATA_COLUMNS = [
+    ('symbol', 'string'), ('exchange', 'string'), ('date', 'date32'),
+    ('open_price', 'float64'), ('high_price', 'float64'), ('low_price', 'float64'),
+    ('close_price', 'float64'), ('volume', 'int64'), ('daily_return', 'float64'),
+    ('volatility', 'float64'), ('sma_5', 'float64'), ('sma_20', 'float64'), ('rsi', 'float64'),
+    ('news_headlines', 'list<string>'), ('news_sentiment_score', 'float64'),
+    ('sentiment_backend', 'string')
+]
+PRICE_HISTORY_COLUMNS = [
+    ('symbol', 'string'), ('exchange', 'string'), ('date', 'date32'),
+    ('open', 'float64'), ('high', 'float64'), ('low', 'float64'), ('close', 'float64'),
+    ('volume', 'int64')
+]
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _round(value, digits, default=''):
+    return default if _is_missing(value) else round(value, digits)
+
+
+def csv_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Format one dataset row for the CSV download."""
+    # Properly format news headlines for CSV
+    news_text = ' | '.join(item['news_headlines']) if item.get('news_headlines') else ''
+    # Replace problematic characters that could break CSV formatting
+    news_text = news_text.replace('\n', ' ').replace('\r', ' ').replace('"', '""')
+
+    return {
+        'symbol': item['symbol'],
+        'exchange': item['exchange'],
+        'date': item['date'],
+        'open_price': _round(item.get('open_price'), 4),
+        'high_price': _round(item.get('high_price'), 4),
+        'low_price': _round(item.get('low_price'), 4),
+        'close_price': _round(item.get('close_price'), 4),
+        'volume': 0 if _is_missing(item.get('volume')) else int(item['volume']),
+        'daily_return': _round(item.get('daily_return'), 6, 0),
+        'volatility': _round(item.get('volatility'), 6, 0),
+        'sma_5': _round(item.get('sma_5'), 4),
+        'sma_20': _round(item.get('sma_20'), 4),
+        'rsi': _round(item.get('rsi'), 2),
+        'news_headlines': news_text,
+        'news_sentiment_score': _round(item.get('news_sentiment_score'), 3, 0),
+        'sentiment_backend': item.get('sentiment_backend') or 'keyword'
+    }
+
+
+def json_record(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Format one dataset row for the JSON download (structured/unstructured split)."""
+    def safe_float(value):
+        if _is_missing(value):
+            return None
+        return round(float(value), 4) if isinstance(value, (int, float)) else value
+
+    def safe_int(value):
+        if _is_missing(value):
+            return 0
+        return int(value) if isinstance(value, (int, float)) else value
+
+    return {
+        'symbol': item['symbol'],
+        'exchange': item['exchange'],
+        'date': item['date'],
+        'structured_data': {
+            'open_price': safe_float(item.get('open_price')),
+            'high_price': safe_float(item.get('high_price')),
+            'low_price': safe_float(item.get('low_price')),
+            'close_price': safe_float(item.get('close_price')),
+            'volume': safe_int(item.get('volume')),
+            'daily_return': _round(item.get('daily_return'), 6, 0),
+            'volatility': _round(item.get('volatility'), 6, 0),
+            'sma_5': safe_float(item.get('sma_5')),
+            'sma_20': safe_float(item.get('sma_20')),
+            'rsi': _round(item.get('rsi'), 2, 50)
+        },
+        'unstructured_data': {
+            'news_headlines': item.get('news_headlines') or [],
+            'news_sentiment_score': _round(item.get('news_sentiment_score'), 3, 0),
+            'sentiment_backend': item.get('sentiment_backend') or 'keyword'
+        }
+    }
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Yield the CSV export as text chunks: the header, then `chunk_rows` rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+    for batch in _batches(rows, chunk_rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(csv_row(item) for item in batch)
+        yield buffer.getvalue()
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]], chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Yield newline-delimited JSON records, `chunk_rows` lines per chunk."""
+    for batch in _batches(rows, chunk_rows):
+        yield ''.join(json.dumps(json_record(item)) + '\n' for item in batch)
+
+
+def iter_json_array(rows: Iterable[Dict[str, Any]], chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Yield a single JSON array of records, built incrementally."""
+    yield '['
+    first = True
+    for batch in _batches(rows, chunk_rows):
+        body = ','.join(json.dumps(json_record(item)) for item in batch)
+        yield body if first else ',' + body
+        first = False
+    yield ']'
+
+
+def gzip_chunks(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """Gzip-compress a stream of text chunks without buffering the whole output."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def require_pyarrow() -> None:
+    """Raise ImportError with an install hint when pyarrow is missing."""
+    if pa is None:
+        raise ImportError("Parquet/Arrow export requires pyarrow (pip install pyarrow)")
+
+
+def _arrow_type(name: str):
+    return {
+        'string': pa.string(), 'date32': pa.date32(), 'float64': pa.float64(),
+        'int64': pa.int64(), 'list<string>': pa.list_(pa.string())
+    }[name]
+
+
+def arrow_schema(columns) -> 'pa.Schema':
+    """Build a pyarrow schema from MARKET_DATA_COLUMNS / PRICE_HISTORY_COLUMNS."""
+    require_pyarrow()
+    return pa.schema([(name, _arrow_type(type_name)) for name, type_name in columns])
+
+
+def _as_dict(item) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return item
+    # MarketDataBatch rows are __slots__ views without a __dict__
+    return item.to_dict() if hasattr(item, 'to_dict') else item.__dict__
+
+
+def rows_to_table(rows: Iterable, columns=MARKET_DATA_COLUMNS) -> 'pa.Table':
+    """Convert MarketData objects or row dicts to a typed Arrow table (NaN becomes null)."""
+    if columns is MARKET_DATA_COLUMNS and hasattr(rows, 'to_arrow'):
+        # A MarketDataBatch converts column by column
+        return rows.to_arrow()
+    schema = arrow_schema(columns)
+    records = [_as_dict(item) for item in rows]
+    arrays = []
+    for field in schema:
+        values = [record.get(field.name) for record in records]
+        if pa.types.is_date32(field.type):
+            arrays.append(pa.array(values, pa.string()).cast(pa.date32()))
+        elif pa.types.is_int64(field.type):
+            arrays.append(pa.array([0 if _is_missing(v) else int(v) for v in values], pa.int64()))
+        elif pa.types.is_list(field.type):
+            arrays.append(pa.array([list(v) if v else [] for v in values], field.type))
+        else:
+            arrays.append(pa.array(values, field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def table_to_rows(table: 'pa.Table') -> List[Dict[str, Any]]:
+    """Convert an Arrow table back to row dicts (ISO date strings, NaN for missing floats)."""
+    float_columns = [f.name for f in table.schema if pa.types.is_floating(f.type)]
+    date_columns = [f.name for f in table.schema if pa.types.is_date(f.type)]
+    rows = table.to_pylist()
+    for row in rows:
+        for name in float_columns:
+            if row[name] is None:
+                row[name] = float('nan')
+        for name in date_columns:
+            row[name] = row[name].isoformat() if row[name] is not None else None
+    return rows
+
+
+def write_table(table: 'pa.Table', sink, fmt: str = 'parquet') -> None:
+    """Write a table to a path or file object as Parquet or an Arrow IPC file."""
+    require_pyarrow()
+    if fmt == 'parquet':
+        pq.write_table(table, sink)
+    elif fmt == 'arrow':
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown columnar format: {fmt}")
+
+
+def read_table(path: str) -> 'pa.Table':
+    """Read a .parquet file, or memory-map an Arrow IPC (.arrow/.feather) file."""
+    require_pyarrow()
+    if path.endswith('.parquet'):
+        return pq.read_table(path)
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+class _ChunkSink:
+    """Minimal writable file object that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def iter_columnar(rows: Iterable, fmt: str = 'parquet', columns=MARKET_DATA_COLUMNS,
+                  chunk_rows: int = 10000) -> Iterator[bytes]:
+    """
+    Yield a Parquet file (one row group per chunk) or Arrow IPC file (one record
+    batch per chunk) as bytes, converting `chunk_rows` rows at a time.
+    """
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(sink, schema)
+    elif fmt == 'arrow':
+        writer = pa.ipc.new_file(sink, schema)
+    else:
+        raise ValueError(f"Unknown columnar format: {fmt}")
+    for batch in _batches(rows, chunk_rows):
+        writer.write_table(rows_to_table(batch, columns))
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+def export_price_history(db, path: str, symbols=None, fmt: str = None, chunk_rows: int = 10000) -> int:
+    """Write historical_prices (optionally only `symbols`) to a Parquet/Arrow file; returns rows written."""
+    fmt = fmt or ('arrow' if path.endswith(('.arrow', '.feather')) else 'parquet')
+    count = 0
+
+    def counted():
+        nonlocal count
+        for row in db.iter_price_rows(symbols=symbols, batch_size=chunk_rows):
+            count += 1
+            yield row
+
+    with open(path, 'wb') as f:
+        for chunk in iter_columnar(counted(), fmt, PRICE_HISTORY_COLUMNS, chunk_rows):
+            f.write(chunk)
+    return count
+
+
+def main():
+    import argparse
+    from database.mongodb import MongoDB
+
+    parser = argparse.ArgumentParser(description='Bulk-export historical_prices to Parquet or Arrow IPC')
+    parser.add_argument('output', help='output file (.parquet, .arrow or .feather)')
+    parser.add_argument('--symbols', nargs='*', help='limit the export to these symbols')
+    args = parser.parse_args()
+
+    mongo = MongoDB()
+    if mongo.db is None:
+        raise SystemExit("MongoDB is not available (check MONGOURI)")
+    rows = export_price_history(mongo, args.output, symbols=args.symbols)
+    print(f"✅ Exported {rows} price rows to {args.output}")
+    mongo.close()
+
+
+if __name__ == '__main__':
+    main()
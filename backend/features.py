@@ -0,0 +1,370 @@
+"""
+Declarative technical-indicator features
+
+A feature is declared by a short spec string such as `sma(5)`, `ema(12)`,
+`macd`, `bollinger(20,2)`, `atr(14)` or `obv`. The same list of specs
+drives the curator's indicator columns and the predictor's feature
+columns, so adding a feature is one declaration (see `FEATURE_SPEC`).
+
+`compute_features` evaluates every spec in one pass over NumPy arrays:
+the OHLCV columns are extracted once, shared intermediates (price change,
+gains/losses, moving averages, true range) are computed once and reused,
+and rolling windows are evaluated over strided window views. A
+multi-symbol panel is computed at once: rows are grouped by the `by`
+column and windows are masked where they would cross a symbol boundary.
+
+Frame columns keep the curator's labels (`SMA_5`, `RSI`, `MACD_Signal`);
+the lower-cased label is the MarketData/predictor field name (`sma_5`).
+Parameters equal to an indicator's defaults are left out of its labels,
+so `rsi` and `rsi(14)` both produce `RSI` and `rsi(7)` produces `RSI_7`.
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Environment variable holding the comma-separated feature specs
+FEATURES_ENV = 'FEATURE_SPEC'
+
+# The curator's original indicator set
+DEFAULT_FEATURES = ('daily_return', 'volatility', 'sma(5)', 'sma(20)', 'rsi')
+
+# Lookbacks count trading bars; fetches count calendar days. A week has five
+# trading days, and the margin covers market holidays in the window
+CALENDAR_DAYS_PER_BAR = 7 / 5
+HOLIDAY_MARGIN_DAYS = 4
+
+_SPEC_PATTERN = re.compile(r'^\s*([a-z_][a-z0-9_]*)\s*(?:\((.*)\))?\s*$')
+
+
+@dataclass
+class Indicator:
+    """Registry entry: output labels, parameter defaults and the kernel computing them."""
+    outputs: Tuple[str, ...]
+    params: Tuple[str, ...]
+    defaults: Tuple[Optional[float], ...]
+    kernel: Callable
+    # Bars of history the indicator needs, from its parameters
+    lookback: Callable
+
+
+INDICATORS: Dict[str, Indicator] = {}
+
+
+def register_indicator(name: str, outputs: Sequence[str], params: Sequence[str] = (),
+                       defaults: Sequence[Optional[float]] = (), lookback: Optional[Callable] = None):
+    """
+    Decorator registering `kernel(panel, *params) -> tuple of arrays` as
+    indicator `name`. `defaults` align with `params`; None marks a
+    required parameter.
+    """
+    def decorate(kernel):
+        INDICATORS[name] = Indicator(
+            outputs=tuple(outputs), params=tuple(params),
+            defaults=tuple(defaults) or (None,) * len(params),
+            kernel=kernel, lookback=lookback or (lambda *values: max(values, default=1))
+        )
+        return kernel
+    return decorate
+
+
+def _format_param(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """One declared indicator with its resolved parameters."""
+    name: str
+    params: Tuple[float, ...] = ()
+
+    @property
+    def indicator(self) -> Indicator:
+        return INDICATORS[self.name]
+
+    @property
+    def columns(self) -> List[str]:
+        """Frame column labels produced by this spec."""
+        indicator = self.indicator
+        if self.params == indicator.defaults:
+            return list(indicator.outputs)
+        suffix = '_'.join(_format_param(p) for p in self.params)
+        return [f"{label}_{suffix}" for label in indicator.outputs]
+
+    @property
+    def fields(self) -> List[str]:
+        """MarketData/predictor field names produced by this spec."""
+        return [label.lower() for label in self.columns]
+
+    @property
+    def lookback(self) -> int:
+        return int(self.indicator.lookback(*self.params))
+
+    def __str__(self) -> str:
+        if not self.params:
+            return self.name
+        return f"{self.name}({','.join(_format_param(p) for p in self.params)})"
+
+
+def parse_feature(text: str) -> FeatureSpec:
+    """Parse one spec such as 'ema(12)' or 'bollinger(20, 2)'; missing parameters take defaults."""
+    match = _SPEC_PATTERN.match(text.lower())
+    if not match or match.group(1) not in INDICATORS:
+        raise ValueError(f"Unknown feature spec '{text}' (available: {', '.join(sorted(INDICATORS))})")
+    name, args = match.group(1), match.group(2)
+    indicator = INDICATORS[name]
+    values = [a.strip() for a in args.split(',')] if args and args.strip() else []
+    if len(values) > len(indicator.params):
+        raise ValueError(f"Feature '{name}' takes at most {len(indicator.params)} parameters")
+    params = []
+    for i, (param, default) in enumerate(zip(indicator.params, indicator.defaults)):
+        if i < len(values):
+            try:
+                value = float(values[i])
+            except ValueError:
+                raise ValueError(f"Feature '{name}': {param} must be a number, got '{values[i]}'")
+        elif default is None:
+            raise ValueError(f"Feature '{name}' requires {param}")
+        else:
+            value = default
+        if value <= 0:
+            raise ValueError(f"Feature '{name}': {param} must be positive")
+        params.append(value)
+    return FeatureSpec(name, tuple(params))
+
+
+def parse_features(specs: Union[str, Iterable]) -> List[FeatureSpec]:
+    """
+    Parse a comma-separated spec string or an iterable of specs (strings or
+    FeatureSpec). Duplicates are dropped; columns must be unique.
+    """
+    if isinstance(specs, str):
+        specs = re.findall(r'[^,()]+(?:\([^)]*\))?', specs)
+        specs = [s for s in specs if s.strip()]
+    parsed = list(dict.fromkeys(s if isinstance(s, FeatureSpec) else parse_feature(s) for s in specs))
+    columns = [c for spec in parsed for c in spec.columns]
+    if len(columns) != len(set(columns)):
+        raise ValueError(f"Feature specs produce duplicate columns: {columns}")
+    return parsed
+
+
+def resolve_features(features: Union[str, Iterable, None] = None) -> List[FeatureSpec]:
+    """Specs to use: `features` if given, else FEATURE_SPEC from the environment, else DEFAULT_FEATURES."""
+    if features is None:
+        features = os.getenv(FEATURES_ENV) or DEFAULT_FEATURES
+    return parse_features(features)
+
+
+def feature_columns(specs: Iterable[FeatureSpec]) -> List[str]:
+    return [c for spec in specs for c in spec.columns]
+
+
+def feature_fields(specs: Iterable[FeatureSpec]) -> List[str]:
+    return [f for spec in specs for f in spec.fields]
+
+
+def warmup_bars(specs: Iterable[FeatureSpec]) -> int:
+    """Trading bars needed before the first wanted bar so every indicator is warmed up."""
+    return max((spec.lookback for spec in specs), default=0)
+
+
+def calendar_days(bars: int) -> int:
+    """Calendar days that span at least `bars` trading days (weekends plus a holiday margin)."""
+    return math.ceil(bars * CALENDAR_DAYS_PER_BAR) + HOLIDAY_MARGIN_DAYS if bars > 0 else 0
+
+
+def warmup_days(specs: Iterable[FeatureSpec]) -> int:
+    """Calendar days to fetch before the first wanted bar so every indicator is warmed up."""
+    return calendar_days(warmup_bars(specs))
+
+
+class _Panel:
+    """
+    Price arrays of one frame, ordered so each symbol's rows are contiguous,
+    plus a cache of intermediates shared between indicators.
+    """
+
+    def __init__(self, frame: pd.DataFrame, by: Optional[str], rsi_method: str):
+        self.frame = frame
+        self.rsi_method = rsi_method
+        self.n = len(frame)
+        if by is None:
+            self.order = None
+            self.codes = None
+            self.pos = np.arange(self.n)
+        else:
+            codes = frame.groupby(by, sort=False).ngroup().to_numpy()
+            order = np.argsort(codes, kind='stable')
+            self.order = None if np.array_equal(order, np.arange(self.n)) else order
+            self.codes = codes if self.order is None else codes[order]
+            # Position of each row within its symbol
+            starts = np.flatnonzero(np.r_[True, self.codes[1:] != self.codes[:-1]])
+            self.pos = np.arange(self.n) - np.repeat(starts, np.diff(np.r_[starts, self.n]))
+        self._cache: Dict[tuple, np.ndarray] = {}
+
+    def cached(self, key: tuple, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def column(self, name: str) -> np.ndarray:
+        def load():
+            if name not in self.frame.columns:
+                raise KeyError(f"Feature computation needs a '{name}' column")
+            values = self.frame[name].to_numpy(dtype='float64')
+            return values if self.order is None else values[self.order]
+        return self.cached(('column', name), load)
+
+    def shift(self, x: np.ndarray) -> np.ndarray:
+        """Previous bar's value (NaN on each symbol's first bar)."""
+        out = np.empty(self.n)
+        out[:1] = np.nan
+        out[1:] = x[:-1]
+        out[self.pos < 1] = np.nan
+        return out
+
+    def rolling(self, x: np.ndarray, window: int, how: str = 'mean') -> np.ndarray:
+        """Trailing-window mean or std (ddof 1, or 0 for 'pstd'); NaN until a symbol has `window` bars."""
+        out = np.full(self.n, np.nan)
+        if self.n >= window:
+            view = sliding_window_view(x, window)
+            if how == 'mean':
+                out[window - 1:] = view.mean(axis=1)
+            else:
+                out[window - 1:] = view.std(axis=1, ddof=0 if how == 'pstd' else 1)
+            out[self.pos < window - 1] = np.nan
+        return out
+
+    def ewm(self, x: np.ndarray, alpha: float) -> np.ndarray:
+        """Exponential moving average (adjust=False) per symbol; leading NaNs are skipped."""
+        series = pd.Series(x)
+        if self.codes is None:
+            return series.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        smoothed = series.groupby(self.codes, sort=False).ewm(alpha=alpha, adjust=False).mean()
+        return smoothed.droplevel(0).sort_index().to_numpy()
+
+    def wilder(self, x: np.ndarray, window: int) -> np.ndarray:
+        """Wilder's average: seeded with the first `window` values' mean, then alpha = 1/window."""
+        seeded = x.copy()
+        seeded[self.pos < window - 1] = np.nan
+        first = self.pos == window - 1
+        seeded[first] = self.rolling(x, window)[first]
+        return self.ewm(seeded, 1.0 / window)
+
+    # Shared intermediates
+
+    def close(self) -> np.ndarray:
+        return self.column('Close')
+
+    def delta(self) -> np.ndarray:
+        return self.cached(('delta',), lambda: self.close() - self.shift(self.close()))
+
+    def daily_return(self) -> np.ndarray:
+        return self.cached(('daily_return',), lambda: self.delta() / self.shift(self.close()))
+
+    def sma(self, window: int) -> np.ndarray:
+        return self.cached(('sma', window), lambda: self.rolling(self.close(), window))
+
+    def ema(self, window: int) -> np.ndarray:
+        return self.cached(('ema', window), lambda: self.ewm(self.close(), 2.0 / (window + 1)))
+
+
+@register_indicator('daily_return', ['Daily_Return'], lookback=lambda: 1)
+def _daily_return(panel):
+    return (panel.daily_return(),)
+
+
+@register_indicator('volatility', ['Volatility'], ['window'], [20])
+def _volatility(panel, window):
+    return (panel.rolling(panel.daily_return(), int(window), 'std'),)
+
+
+@register_indicator('sma', ['SMA'], ['window'])
+def _sma(panel, window):
+    return (panel.sma(int(window)),)
+
+
+@register_indicator('ema', ['EMA'], ['window'])
+def _ema(panel, window):
+    return (panel.ema(int(window)),)
+
+
+@register_indicator('rsi', ['RSI'], ['window'], [14])
+def _rsi(panel, window):
+    window = int(window)
+    delta = panel.delta()
+    # The first (missing) change counts as a zero gain and loss
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    if panel.rsi_method == 'wilder':
+        gain, loss = panel.wilder(gain, window), panel.wilder(loss, window)
+    else:
+        gain, loss = panel.rolling(gain, window), panel.rolling(loss, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (100 - 100 / (1 + gain / loss),)
+
+
+@register_indicator('macd', ['MACD', 'MACD_Signal', 'MACD_Hist'], ['fast', 'slow', 'signal'], [12, 26, 9],
+                    lookback=lambda fast, slow, signal: max(fast, slow) + signal)
+def _macd(panel, fast, slow, signal):
+    macd = panel.ema(int(fast)) - panel.ema(int(slow))
+    signal_line = panel.ewm(macd, 2.0 / (int(signal) + 1))
+    return macd, signal_line, macd - signal_line
+
+
+@register_indicator('bollinger', ['BB_Upper', 'BB_Middle', 'BB_Lower'], ['window', 'num_std'], [20, 2],
+                    lookback=lambda window, num_std: window)
+def _bollinger(panel, window, num_std):
+    window = int(window)
+    middle = panel.sma(window)
+    # Bands use the population standard deviation, as in Bollinger's definition
+    band = num_std * panel.rolling(panel.close(), window, 'pstd')
+    return middle + band, middle, middle - band
+
+
+@register_indicator('atr', ['ATR'], ['window'], [14], lookback=lambda window: window + 1)
+def _atr(panel, window):
+    high, low = panel.column('High'), panel.column('Low')
+    prev_close = panel.shift(panel.close())
+    # fmax ignores the missing previous close on a symbol's first bar
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return (panel.wilder(true_range, int(window)),)
+
+
+@register_indicator('obv', ['OBV'], lookback=lambda: 1)
+def _obv(panel):
+    flow = np.nan_to_num(np.sign(panel.delta())) * panel.column('Volume')
+    total = np.cumsum(flow)
+    # Restart the running total at each symbol's first bar
+    start = np.arange(panel.n) - panel.pos
+    return (total - (total[start] - flow[start]),)
+
+
+def compute_features(frame: pd.DataFrame, specs: Iterable[FeatureSpec], by: Optional[str] = None,
+                     rsi_method: str = 'sma') -> pd.DataFrame:
+    """
+    Return `frame` with one column per spec output added.
+
+    `frame` needs 'Close' (plus 'High'/'Low' for atr and 'Volume' for obv)
+    with each symbol's rows in time order. With `by`, rows are grouped by
+    that column and every indicator restarts at each symbol's first bar.
+    """
+    panel = _Panel(frame, by, rsi_method)
+    columns = {}
+    for spec in specs:
+        for label, values in zip(spec.columns, spec.indicator.kernel(panel, *spec.params)):
+            if panel.order is not None:
+                restored = np.empty(panel.n)
+                restored[panel.order] = values
+                values = restored
+            columns[label] = values
+    return frame.assign(**columns)
@@ -19,12 +19,22 @@ import csv
 from datetime import datetime, timedelta
 import time
 import logging
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, Iterable, List, Tuple, Optional, Any
 import os
-from dataclasses import dataclass
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlparse
 import warnings
 from email.utils import parsedate_to_datetime
 
+from http_cache import HTTPResponseCache, install_cache
+import dataset_export
+from market_data import MarketData, MarketDataBatch, as_batch, MARKET_DATA_FIELDS
+from indicators import IndicatorState, INDICATOR_FIELDS, RSI_METHODS, streams_features
+from features import (calendar_days, compute_features, feature_columns, feature_fields, resolve_features,
+                      warmup_bars, warmup_days)
+from sentiment import SentimentScorer, default_scorer
+
 # Suppress pandas warnings for cleaner output
 warnings.filterwarnings('ignore')
 
@@ -38,24 +48,75 @@ logging.basicConfig(
     ]
 )
 
-@dataclass
-class MarketData:
-    """Container for a single day's market snapshot and auxiliary signals."""
-    symbol: str
-    exchange: str
-    date: str
-    open_price: float
-    high_price: float
-    low_price: float
-    close_price: float
-    volume: int
-    daily_return: float
-    volatility: float
-    sma_5: float  # 5-day Simple Moving Average
-    sma_20: float  # 20-day Simple Moving Average
-    rsi: float  # Relative Strength Index
-    news_headlines: List[str]
-    news_sentiment_score: float
+# yfinance manages its own HTTP session; its calls share this rate-limit bucket
+YFINANCE_HOST = 'query2.finance.yahoo.com'
+
+DEFAULT_CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart'
+
+# Yahoo search endpoint that yfinance's Ticker.news reads, queried directly so it gets a timeout
+YAHOO_NEWS_URL = 'https://query2.finance.yahoo.com/v1/finance/search'
+
+# Overall seconds allowed for all news sources of one symbol (NEWS_DEADLINE_SECONDS)
+DEFAULT_NEWS_DEADLINE = 8.0
+# Per-request HTTP timeout of a news source; capped by the overall deadline
+NEWS_SOURCE_TIMEOUT = 10.0
+
+# Seconds per bar for chart intervals; period bounds are rounded to these
+_INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800, '60m': 3600, '90m': 5400, '1h': 3600
+}
+
+# Column order of curated frames (one column per MarketData field)
+CURATED_COLUMNS = MARKET_DATA_FIELDS
+
+# get_structured_data column -> (curated column, default when the column is missing)
+_STRUCTURED_COLUMNS = {
+    'Open': ('open_price', None),
+    'High': ('high_price', None),
+    'Low': ('low_price', None),
+    'Close': ('close_price', None),
+    'Daily_Return': ('daily_return', 0.0),
+    'Volatility': ('volatility', 0.0),
+    'SMA_5': ('sma_5', 0.0),
+    'SMA_20': ('sma_20', 0.0),
+    'RSI': ('rsi', 50.0),
+}
+
+
+def iter_market_data(frame: pd.DataFrame):
+    """Yield one MarketData per row of a curated frame (see `curate_frame`)."""
+    columns = [frame[name].tolist() for name in CURATED_COLUMNS]
+    headlines_at = CURATED_COLUMNS.index('news_headlines')
+    for values in zip(*columns):
+        values = list(values)
+        # Days aligned to the same news date share one list; give each record its own
+        values[headlines_at] = list(values[headlines_at])
+        yield MarketData(*values)
+
+class HostRateLimiter:
+    """
+    Thread-safe per-host request spacing.
+
+    Each host gets at most `requests_per_second` request starts; callers
+    that arrive early sleep until their slot instead of a fixed delay, so
+    requests to different hosts never wait on each other.
+    """
+
+    def __init__(self, requests_per_second: float = 4.0):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        """Block until a request to `host` may start."""
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
 
 class FinTechDataCurator:
     """
@@ -63,50 +124,118 @@ class FinTechDataCurator:
     yielding a compact dataset tailored for next-step forecasting.
     """
     
-    def __init__(self, days_history: int = 30):
+    def __init__(self, days_history: int = 30, requests_per_second: float = 4.0,
+                 rate_limiter: Optional[HostRateLimiter] = None, use_http_cache: bool = True,
+                 http_cache: Optional[HTTPResponseCache] = None, chart_base_url: Optional[str] = None,
+                 rsi_method: str = 'sma', features=None,
+                 sentiment_scorer: Optional[SentimentScorer] = None, news_deadline: Optional[float] = None):
         """
         Initialize curator state.
         
         Args:
             days_history: how many trading days to include
+            requests_per_second: per-host request rate limit
+            rate_limiter: shared limiter (overrides requests_per_second)
+            use_http_cache: serve repeat GETs from the on-disk response cache
+            http_cache: explicit cache (default: CURATOR_HTTP_CACHE_DIR)
+            chart_base_url: Yahoo chart endpoint (default: YAHOO_CHART_URL env)
+            rsi_method: 'sma' (rolling means) or 'wilder' (Wilder smoothing)
+            features: indicator specs, e.g. 'sma(5), ema(12), macd' (default:
+                FEATURE_SPEC env, else the original five; see features.py)
+            sentiment_scorer: headline scorer (default: the shared process-wide one,
+                configured by SENTIMENT_BACKEND; see sentiment.py)
+            news_deadline: seconds allowed for all news sources of a symbol
+                (default: NEWS_DEADLINE_SECONDS env, else 8)
         """
+        if rsi_method not in RSI_METHODS:
+            raise ValueError(f"rsi_method must be one of {RSI_METHODS}")
         self.days_history = days_history
+        self.rsi_method = rsi_method
+        self.features = resolve_features(features)
+        self.sentiment = sentiment_scorer or default_scorer()
+        self.news_deadline = float(news_deadline if news_deadline is not None
+                                   else os.getenv('NEWS_DEADLINE_SECONDS', DEFAULT_NEWS_DEADLINE))
+        self.news_timeout = min(NEWS_SOURCE_TIMEOUT, self.news_deadline)
+        # Per-symbol outcome of the last news fetch (see get_news_report)
+        self._news_reports: Dict[str, Dict[str, Any]] = {}
+        self._news_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
+        self.rate_limiter = rate_limiter or HostRateLimiter(requests_per_second)
+        self.chart_base_url = (chart_base_url or os.getenv('YAHOO_CHART_URL', DEFAULT_CHART_URL)).rstrip('/')
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.http_cache = (http_cache or HTTPResponseCache.from_env()) if use_http_cache else None
+        if self.http_cache is not None:
+            # The adapter waits for the rate limiter only when a request goes to the network
+            install_cache(self.session, self.http_cache, before_send=self._throttle)
+
+    def _throttle(self, url: str) -> None:
+        self.rate_limiter.wait(urlparse(url).netloc)
+
+    def _http_get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Rate-limited GET through the shared session. With the HTTP cache,
+        only requests that reach the network are rate limited; cache hits
+        return at once.
+        """
+        if self.http_cache is None:
+            self._throttle(url)
+        return self.session.get(url, **kwargs)
     
-    def get_structured_data(self, symbol: str, exchange: str) -> pd.DataFrame:
+    def get_structured_data(self, symbol: str, exchange: str, since: Optional[str] = None) -> pd.DataFrame:
         """
         Retrieve OHLCV time series from live providers.
         
         Args:
             symbol: equity or crypto ticker, e.g., 'AAPL', 'BTC-USD'
             exchange: used for logs/labels
+            since: last date already stored ('YYYY-MM-DD'); when given, only
+                bars after it are returned (indicators still get their warm-up)
             
         Returns:
             pandas DataFrame containing market data plus indicators
         """
-        self.logger.info(f"Fetching structured data for {symbol} on {exchange}")
+        self.logger.info(f"Fetching structured data for {symbol} on {exchange}" + (f" since {since}" if since else ""))
+        df, source = self._fetch_ohlcv(symbol, self._warmup_fetch_days(since))
+        df = self._calculate_technical_indicators(df)
+        df = self._rows_after(df, since) if since else df.tail(self.days_history)
+        self.logger.info(f"Successfully retrieved {len(df)} days of data for {symbol} via {source}")
+        return df
+
+    def _warmup_fetch_days(self, since: Optional[str] = None) -> int:
+        """
+        Calendar days to fetch: the wanted bars plus the longest indicator
+        lookback, both counted in trading bars and converted to calendar days
+        (74 for 30 days of history with the default features).
+        """
+        if since:
+            return max(1, (datetime.now() - datetime.strptime(since, '%Y-%m-%d')).days) + warmup_days(self.features)
+        return calendar_days(self.days_history + warmup_bars(self.features))
+
+    def _fetch_ohlcv(self, symbol: str, fetch_days: int) -> Tuple[pd.DataFrame, str]:
+        """
+        Raw daily OHLCV bars for the last `fetch_days` days and the source used.
+        
+        Tries the Yahoo chart API over HTTP first and falls back to yfinance.
+        """
         last_error: Optional[Exception] = None
         # 1) Primary: Yahoo Finance chart API over HTTP (live)
         try:
-            df_http = self._fetch_yahoo_chart(symbol, days=self.days_history + 22, interval='1d')
+            df_http = self._fetch_yahoo_chart(symbol, days=fetch_days, interval='1d')
             if df_http is not None and not df_http.empty:
-                df_http = self._calculate_technical_indicators(df_http)
-                df_http = df_http.tail(self.days_history)
-                self.logger.info(f"Successfully retrieved {len(df_http)} days of data for {symbol} via Yahoo chart API")
-                return df_http
+                return df_http, 'Yahoo chart API'
         except Exception as e:
             last_error = e
             self.logger.warning(f"Yahoo chart API failed for {symbol}: {str(e)}")
 
         # 2) Fallback: yfinance
         try:
+            self.rate_limiter.wait(YFINANCE_HOST)
             ticker = yf.Ticker(symbol)
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=self.days_history + 22)
+            start_date = end_date - timedelta(days=fetch_days)
             hist_data = ticker.history(
                 start=start_date.strftime('%Y-%m-%d'),
                 end=end_date.strftime('%Y-%m-%d'),
@@ -114,33 +243,56 @@ class FinTechDataCurator:
             )
             if hist_data is None or hist_data.empty:
                 raise ValueError(f"No data available for symbol {symbol}")
-            hist_data = self._calculate_technical_indicators(hist_data)
-            hist_data = hist_data.tail(self.days_history)
-            self.logger.info(f"Successfully retrieved {len(hist_data)} days of data for {symbol} via yfinance fallback")
-            return hist_data
+            return hist_data, 'yfinance fallback'
         except Exception as e:
             self.logger.error(f"Both primary and fallback structured data fetches failed for {symbol}: {str(e)}")
             if last_error is not None:
                 raise last_error
             raise
 
+    @staticmethod
+    def _market_dates(index) -> pd.Index:
+        """Normalize a (possibly tz-aware) price index to 'YYYY-MM-DD' strings."""
+        stamps = pd.DatetimeIndex(index)
+        if stamps.tz is not None:
+            stamps = stamps.tz_localize(None)
+        return stamps.strftime('%Y-%m-%d')
+
+    def _rows_after(self, df: pd.DataFrame, since: str) -> pd.DataFrame:
+        """Keep only bars dated strictly after `since`."""
+        return df[self._market_dates(df.index) > since]
+
+    def _chart_url(self, symbol: str, days: int, interval: str = '1d') -> str:
+        """
+        Build the chart URL for the last `days` days.
+        
+        period2 is rounded up to the next bar boundary (the next UTC midnight
+        for daily data) so repeat requests within a bar share a URL and can
+        be served from the HTTP cache.
+        """
+        step = _INTERVAL_SECONDS.get(interval, 24 * 60 * 60)
+        period2 = -(-int(time.time()) // step) * step
+        period1 = period2 - days * 24 * 60 * 60
+        return (
+            f"{self.chart_base_url}/{symbol}"
+            f"?period1={period1}&period2={period2}&interval={interval}&includePrePost=false"
+        )
+
     def _fetch_yahoo_chart(self, symbol: str, days: int, interval: str = '1d') -> Optional[pd.DataFrame]:
         """
         Pull OHLCV via Yahoo Finance chart API with simple retry logic.
         """
         try:
-            period2 = int(time.time())
-            period1 = period2 - days * 24 * 60 * 60
-            url = (
-                f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-                f"?period1={period1}&period2={period2}&interval={interval}&includePrePost=false"
-            )
+            url = self._chart_url(symbol, days, interval)
             attempts = 0
             last_exc: Optional[Exception] = None
             while attempts < 3:
                 attempts += 1
                 try:
-                    resp = self.session.get(url, timeout=10)
+                    resp = self._http_get(url, timeout=10)
+                    if 400 <= resp.status_code < 500 and resp.status_code != 429:
+                        # Unknown symbol or bad request: retrying will not help
+                        attempts = 3
                     resp.raise_for_status()
                     data = resp.json()
                     result = (data or {}).get('chart', {}).get('result', [])
@@ -170,7 +322,8 @@ class FinTechDataCurator:
                     return df
                 except Exception as e:
                     last_exc = e
-                    time.sleep(0.8 * attempts)
+                    if attempts < 3:
+                        time.sleep(0.8 * attempts)
             if last_exc:
                 raise last_exc
             return None
@@ -178,67 +331,179 @@ class FinTechDataCurator:
             self.logger.debug(f"_fetch_yahoo_chart error for {symbol}: {str(e)}")
             raise
     
-    def _calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def get_price_rows(self, symbol: str, exchange: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Enrich the OHLCV frame with returns, volatility, SMAs, and RSI.
+        Return OHLCV rows shaped for MongoDB.save_historical_prices.
+        
+        With `since`, only bars after that date are fetched and returned,
+        so callers can append the delta to already-stored history.
         """
-        try:
-            # Daily returns
-            df['Daily_Return'] = df['Close'].pct_change()
-            
-            # Rolling volatility (20-day)
-            df['Volatility'] = df['Daily_Return'].rolling(window=20).std()
-            
-            # Simple Moving Averages
-            df['SMA_5'] = df['Close'].rolling(window=5).mean()
-            df['SMA_20'] = df['Close'].rolling(window=20).mean()
-            
-            # Relative Strength Index (RSI)
-            df['RSI'] = self._calculate_rsi(df['Close'])
-            
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating technical indicators: {str(e)}")
-            raise
+        df = self.get_structured_data(symbol, exchange, since=since)
+        rows = []
+        for date_str, (_, row) in zip(self._market_dates(df.index), df.iterrows()):
+            rows.append({
+                'date': date_str,
+                'open': float(row['Open']),
+                'high': float(row['High']),
+                'low': float(row['Low']),
+                'close': float(row['Close']),
+                'volume': int(row['Volume'])
+            })
+        return rows
+
+    def can_resume(self, state: Optional[IndicatorState], since: Optional[str]) -> bool:
+        """
+        True when `state` can be advanced from `since`: it ends at that bar
+        and streams this curator's feature specs with its RSI method.
+        """
+        return (state is not None and since is not None and state.last_date == since
+                and state.matches(self.features, self.rsi_method))
+
+    def get_price_update(self, symbol: str, exchange: str, since: Optional[str] = None,
+                         state: Optional[IndicatorState] = None
+                         ) -> Tuple[List[Dict[str, Any]], Optional[IndicatorState]]:
+        """
+        OHLCV rows after `since` with their indicators, and the advanced state.
+        
+        When `state` is the symbol's IndicatorState as of `since` (as stored
+        by MongoDB.save_indicator_state) and `can_resume` accepts it, only
+        the bars after `since` are fetched and each advances the state in
+        constant time. Otherwise the warm-up window is fetched and replayed
+        into a new state. Rows carry the save_historical_prices fields plus
+        the configured feature fields (None until an indicator's window is
+        full).
+        
+        IndicatorState streams only the default features; with other specs
+        the rows are computed in bulk from the warm-up window and the
+        returned state is None.
+        """
+        if not streams_features(self.features):
+            return self._bulk_price_update(symbol, exchange, since), None
+
+        resume = self.can_resume(state, since)
+        if resume:
+            fetch_days = max(1, (datetime.now() - datetime.strptime(since, '%Y-%m-%d')).days)
+        else:
+            state = IndicatorState(self.rsi_method)
+            fetch_days = self._warmup_fetch_days(since)
+        df, source = self._fetch_ohlcv(symbol, fetch_days)
+        dates = self._market_dates(df.index)
+        keep = dates > since if since else np.arange(len(df)) >= len(df) - self.days_history
+        
+        rows = []
+        bars = zip(dates, keep, df['Open'], df['High'], df['Low'], df['Close'], df['Volume'])
+        for date_str, wanted, open_, high, low, close, volume in bars:
+            if resume and not wanted:
+                # Already folded into the stored state
+                continue
+            indicators = state.update(date_str, close)
+            if wanted:
+                row = {'date': date_str, 'open': float(open_), 'high': float(high), 'low': float(low),
+                       'close': float(close), 'volume': int(volume)}
+                for field in INDICATOR_FIELDS:
+                    value = indicators[field]
+                    row[field] = None if np.isnan(value) else value
+                rows.append(row)
+        self.logger.info(f"{'Resumed' if resume else 'Rebuilt'} indicator state for {symbol} via {source}: "
+                         f"{len(rows)} new bars")
+        return rows, state
+
+    def _bulk_price_update(self, symbol: str, exchange: str, since: Optional[str]) -> List[Dict[str, Any]]:
+        """get_price_update rows for feature specs IndicatorState does not stream."""
+        df = self.get_structured_data(symbol, exchange, since=since)
+        columns = list(zip(feature_columns(self.features), feature_fields(self.features)))
+        rows = []
+        for date_str, (_, row) in zip(self._market_dates(df.index), df.iterrows()):
+            record = {'date': date_str, 'open': float(row['Open']), 'high': float(row['High']),
+                      'low': float(row['Low']), 'close': float(row['Close']), 'volume': int(row['Volume'])}
+            for column, field in columns:
+                record[field] = None if np.isnan(row[column]) else float(row[column])
+            rows.append(record)
+        self.logger.info(f"Recomputed indicators for {symbol} in bulk (features {', '.join(map(str, self.features))}): "
+                         f"{len(rows)} new bars")
+        return rows
     
-    def _calculate_rsi(self, prices: pd.Series, window: int = 14) -> pd.Series:
+    def fetch_charts(self, symbols: List[str], days: Optional[int] = None, interval: str = '1d',
+                     max_workers: int = 8) -> Dict[str, Optional[pd.DataFrame]]:
         """
-        Compute a simple RSI over a sliding window.
+        Bulk-download raw OHLCV frames for many symbols in one pass.
+        
+        The chart endpoint serves one symbol per request, so requests are
+        issued concurrently through the shared cached, rate-limited session.
+        Symbols that fail map to None.
+        """
+        days = days or self._warmup_fetch_days()
+        symbols = list(dict.fromkeys(symbols))
+        frames: Dict[str, Optional[pd.DataFrame]] = {}
+        if not symbols:
+            return frames
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as pool:
+            futures = {pool.submit(self._fetch_yahoo_chart, symbol, days, interval): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    frames[symbol] = future.result()
+                except Exception as e:
+                    self.logger.warning(f"Bulk chart fetch failed for {symbol}: {str(e)}")
+                    frames[symbol] = None
+        return {symbol: frames[symbol] for symbol in symbols}
+    
+    def get_structured_panel(self, symbols: List[str], max_workers: int = 8) -> pd.DataFrame:
+        """
+        Indicator frame for many symbols at once.
+        
+        Raw bars come from `fetch_charts`; the indicators of all symbols are
+        then computed in one grouped pass. Returns the last `days_history`
+        bars per symbol with a 'Symbol' column; failed symbols are left out.
+        """
+        frames = {symbol: df for symbol, df in self.fetch_charts(symbols, max_workers=max_workers).items()
+                  if df is not None and not df.empty}
+        if not frames:
+            return pd.DataFrame(columns=['Symbol', 'Open', 'High', 'Low', 'Close', 'Volume']
+                                + feature_columns(self.features))
+        panel = pd.concat([df.assign(Symbol=symbol) for symbol, df in frames.items()])
+        panel = self._calculate_technical_indicators(panel, by='Symbol')
+        return panel.groupby('Symbol', sort=False).tail(self.days_history)
+    
+    def _calculate_technical_indicators(self, df: pd.DataFrame, by: Optional[str] = None) -> pd.DataFrame:
+        """
+        Enrich the OHLCV frame with the configured indicator columns
+        (returns, volatility, SMAs and RSI by default); `by` names a symbol
+        column when `df` holds several symbols.
         """
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            return compute_features(df, self.features, by=by, rsi_method=self.rsi_method)
             
         except Exception as e:
-            self.logger.error(f"Error calculating RSI: {str(e)}")
-            return pd.Series([np.nan] * len(prices), index=prices.index)
+            self.logger.error(f"Error calculating technical indicators: {str(e)}")
+            raise
     
     def get_unstructured_data(self, symbol: str, days: int = 5) -> Dict[str, List[Dict]]:
         """
         Collect recent headlines from multiple sources and group by day.
+        
+        Sources are fetched concurrently under one deadline (`news_deadline`);
+        headlines from sources that finished in time are merged, and sources
+        that timed out or failed (a source raises when its feed cannot be
+        fetched) are recorded as missing in the symbol's news report
+        (`get_news_report`).
         """
         try:
             self.logger.info(f"Fetching unstructured data (news) for {symbol}")
             
             news_data = {}
             
-            # Aggregate news from multiple sources
-            aggregated_news: List[Dict[str, Any]] = []
-            
-            # Yahoo Finance
-            aggregated_news.extend(self._get_yahoo_finance_news(symbol))
-            
-            # Google News RSS (broad coverage ensures non-empty headlines)
-            aggregated_news.extend(self._get_google_news(symbol))
-            
-            # Crypto-specific: CoinDesk RSS
+            # Yahoo Finance, Google News RSS (broad coverage ensures non-empty
+            # headlines) and, for crypto, CoinDesk RSS
+            sources = [('yahoo_finance', self._get_yahoo_finance_news), ('google_news', self._get_google_news)]
             if 'USD' in symbol or 'BTC' in symbol or 'ETH' in symbol:
-                aggregated_news.extend(self._get_crypto_news(symbol))
+                sources.append(('coindesk', self._get_crypto_news))
+            aggregated_news, report = self._fetch_news_sources(symbol, sources)
+            if 'coindesk' in report['missing']:
+                # Keep crypto datasets non-empty; the report still lists CoinDesk as missing
+                aggregated_news.extend(self._sample_crypto_news(symbol))
+            with self._news_lock:
+                self._news_reports[symbol] = report
             
             # Filter out empty/duplicate titles and normalize
             seen_titles = set()
@@ -273,16 +538,67 @@ class FinTechDataCurator:
             self.logger.error(f"Error fetching unstructured data: {str(e)}")
             return {}
     
+    def _fetch_news_sources(self, symbol: str, sources: List[Tuple[str, Any]]) -> Tuple[List[Dict], Dict[str, Any]]:
+        """
+        Run news sources concurrently and wait at most `news_deadline` seconds.
+        
+        Returns the articles of the sources that finished in time, in source
+        order so de-duplication stays deterministic, and a report of each
+        source's status ('ok', 'timeout' or 'error').
+        """
+        started = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='news')
+        futures = [pool.submit(fetch, symbol) for _, fetch in sources]
+        wait(futures, timeout=self.news_deadline)
+        # Late sources keep running in the background until their own HTTP
+        # timeout (`news_timeout`; every source fetches through _http_get),
+        # but the request no longer waits for them
+        pool.shutdown(wait=False, cancel_futures=True)
+        
+        articles: List[Dict[str, Any]] = []
+        status: Dict[str, str] = {}
+        for (name, _), future in zip(sources, futures):
+            if not future.done() or future.cancelled():
+                status[name] = 'timeout'
+            elif future.exception() is not None:
+                self.logger.warning(f"News source {name} failed for {symbol}: {future.exception()}")
+                status[name] = 'error'
+            else:
+                articles.extend(future.result())
+                status[name] = 'ok'
+        missing = [name for name, outcome in status.items() if outcome != 'ok']
+        if missing:
+            self.logger.warning(f"News for {symbol} is partial; missing sources: {', '.join(missing)}")
+        return articles, {
+            'sources': status,
+            'missing': missing,
+            'deadline_seconds': self.news_deadline,
+            'elapsed_seconds': round(time.monotonic() - started, 3),
+        }
+    
+    def get_news_report(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Outcome of the last news fetch for `symbol`: per-source status,
+        missing sources, deadline and elapsed seconds (None if never fetched).
+        """
+        with self._news_lock:
+            return self._news_reports.get(symbol)
+    
     def _get_yahoo_finance_news(self, symbol: str) -> List[Dict]:
         """
-        Pull headlines from Yahoo Finance (API first, HTML fallback).
+        Pull headlines from Yahoo Finance (search API first, HTML fallback).
+        
+        Both go through `_http_get`, so they are rate limited, cached and
+        bounded by `news_timeout`. Raises when both fail.
         """
         news_articles = []
         
         try:
-            # Try to get news using yfinance first
-            ticker = yf.Ticker(symbol)
-            news = ticker.news
+            # The search endpoint behind yfinance's Ticker.news, which has no timeout
+            response = self._http_get(YAHOO_NEWS_URL, params={'q': symbol, 'newsCount': 10, 'quotesCount': 0},
+                                      timeout=self.news_timeout)
+            response.raise_for_status()
+            news = response.json().get('news') or []
             
             for article in news[:10]:  # Limit to 10 most recent
                 news_articles.append({
@@ -300,7 +616,7 @@ class FinTechDataCurator:
             # Fallback to web scraping
             try:
                 url = f"https://finance.yahoo.com/quote/{symbol}/news"
-                response = self.session.get(url, timeout=10)
+                response = self._http_get(url, timeout=self.news_timeout)
                 response.raise_for_status()
                 
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -320,63 +636,93 @@ class FinTechDataCurator:
                         
             except Exception as web_e:
                 self.logger.warning(f"Web scraping fallback also failed: {str(web_e)}")
+                raise
         
         return news_articles
 
     def _get_google_news(self, symbol: str) -> List[Dict]:
         """
         Query Google News RSS to capture a broader headline set.
+        
+        Raises when the feed cannot be fetched.
         """
         articles: List[Dict[str, Any]] = []
+        # Query symbol plus common finance keywords to improve relevance
+        query = f"{symbol} stock OR {symbol} finance"
+        rss_url = f"https://news.google.com/rss/search?q={requests.utils.quote(query)}&hl=en-US&gl=US&ceid=US:en"
         try:
-            # Query symbol plus common finance keywords to improve relevance
-            query = f"{symbol} stock OR {symbol} finance"
-            rss_url = f"https://news.google.com/rss/search?q={requests.utils.quote(query)}&hl=en-US&gl=US&ceid=US:en"
-            resp = self.session.get(rss_url, timeout=10)
+            resp = self._http_get(rss_url, timeout=self.news_timeout)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, 'xml')
-            for item in soup.find_all('item')[:15]:
-                title = (item.title.get_text(strip=True) if item.title else '').strip()
-                description = (item.description.get_text(strip=True) if item.description else '').strip()
-                pub_date_raw = (item.pubDate.get_text(strip=True) if item.pubDate else '')
-                try:
-                    pub_dt = parsedate_to_datetime(pub_date_raw)
-                    date_str = pub_dt.strftime('%Y-%m-%d')
-                except Exception:
-                    date_str = datetime.now().strftime('%Y-%m-%d')
-                if title:
-                    articles.append({
-                        'title': title,
-                        'summary': description[:280],
-                        'date': date_str,
-                        'source': 'Google News RSS'
-                    })
         except Exception as e:
             self.logger.warning(f"Google News RSS fetch failed for {symbol}: {str(e)}")
+            raise
+        soup = BeautifulSoup(resp.content, 'xml')
+        for item in soup.find_all('item')[:15]:
+            title = (item.title.get_text(strip=True) if item.title else '').strip()
+            description = (item.description.get_text(strip=True) if item.description else '').strip()
+            pub_date_raw = (item.pubDate.get_text(strip=True) if item.pubDate else '')
+            try:
+                pub_dt = parsedate_to_datetime(pub_date_raw)
+                date_str = pub_dt.strftime('%Y-%m-%d')
+            except Exception:
+                date_str = datetime.now().strftime('%Y-%m-%d')
+            if title:
+                articles.append({
+                    'title': title,
+                    'summary': description[:280],
+                    'date': date_str,
+                    'source': 'Google News RSS'
+                })
         return articles
     
     def _get_crypto_news(self, symbol: str) -> List[Dict]:
         """
         Fetch coin-specific headlines using CoinDesk feeds with light filtering.
+        
+        Raises when the feed cannot be fetched; `get_unstructured_data` then
+        falls back to `_sample_crypto_news`.
         """
         crypto_news = []
-        
-        try:
-            crypto_name = symbol.split('-')[0].lower()  # 'btc' from 'BTC-USD'
-            # Choose a CoinDesk RSS feed based on common symbols
-            if 'btc' in crypto_name:
-                rss_url = 'https://www.coindesk.com/tag/bitcoin/rss/'
-            elif 'eth' in crypto_name:
-                rss_url = 'https://www.coindesk.com/tag/ethereum/rss/'
-            else:
-                rss_url = 'https://www.coindesk.com/arc/outboundfeeds/rss/'
+        crypto_name = symbol.split('-')[0].lower()  # 'btc' from 'BTC-USD'
+        # Choose a CoinDesk RSS feed based on common symbols
+        if 'btc' in crypto_name:
+            rss_url = 'https://www.coindesk.com/tag/bitcoin/rss/'
+        elif 'eth' in crypto_name:
+            rss_url = 'https://www.coindesk.com/tag/ethereum/rss/'
+        else:
+            rss_url = 'https://www.coindesk.com/arc/outboundfeeds/rss/'
 
-            response = self.session.get(rss_url, timeout=10)
+        try:
+            response = self._http_get(rss_url, timeout=self.news_timeout)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'xml')
-            items = soup.find_all('item')[:10]
+        except Exception as e:
+            self.logger.warning(f"CoinDesk RSS fetch failed: {str(e)}")
+            raise
+        soup = BeautifulSoup(response.content, 'xml')
+        items = soup.find_all('item')[:10]
+
+        for item in items:
+            title = (item.title.get_text(strip=True) if item.title else '').strip()
+            description = (item.description.get_text(strip=True) if item.description else '').strip()
+            pub_date_raw = (item.pubDate.get_text(strip=True) if item.pubDate else '')
+            try:
+                pub_dt = parsedate_to_datetime(pub_date_raw)
+                pub_date = pub_dt.strftime('%Y-%m-%d')
+            except Exception:
+                pub_date = datetime.now().strftime('%Y-%m-%d')
 
-            for item in items:
+            # If a coin name is specified (BTC/ETH), lightly filter to prefer relevant headlines
+            if crypto_name in title.lower() or crypto_name in description.lower() or crypto_name in rss_url:
+                crypto_news.append({
+                    'title': title,
+                    'summary': description[:280],
+                    'date': pub_date,
+                    'source': 'CoinDesk RSS'
+                })
+
+        # If RSS returned nothing relevant, keep a few general headlines from the feed
+        if not crypto_news and items:
+            for item in items[:5]:
                 title = (item.title.get_text(strip=True) if item.title else '').strip()
                 description = (item.description.get_text(strip=True) if item.description else '').strip()
                 pub_date_raw = (item.pubDate.get_text(strip=True) if item.pubDate else '')
@@ -385,172 +731,166 @@ class FinTechDataCurator:
                     pub_date = pub_dt.strftime('%Y-%m-%d')
                 except Exception:
                     pub_date = datetime.now().strftime('%Y-%m-%d')
+                crypto_news.append({
+                    'title': title,
+                    'summary': description[:280],
+                    'date': pub_date,
+                    'source': 'CoinDesk RSS'
+                })
 
-                # If a coin name is specified (BTC/ETH), lightly filter to prefer relevant headlines
-                if crypto_name in title.lower() or crypto_name in description.lower() or crypto_name in rss_url:
-                    crypto_news.append({
-                        'title': title,
-                        'summary': description[:280],
-                        'date': pub_date,
-                        'source': 'CoinDesk RSS'
-                    })
-
-            # If RSS returned nothing relevant, keep a few general headlines from the feed
-            if not crypto_news and items:
-                for item in items[:5]:
-                    title = (item.title.get_text(strip=True) if item.title else '').strip()
-                    description = (item.description.get_text(strip=True) if item.description else '').strip()
-                    pub_date_raw = (item.pubDate.get_text(strip=True) if item.pubDate else '')
-                    try:
-                        pub_dt = parsedate_to_datetime(pub_date_raw)
-                        pub_date = pub_dt.strftime('%Y-%m-%d')
-                    except Exception:
-                        pub_date = datetime.now().strftime('%Y-%m-%d')
-                    crypto_news.append({
-                        'title': title,
-                        'summary': description[:280],
-                        'date': pub_date,
-                        'source': 'CoinDesk RSS'
-                    })
-
-        except Exception as e:
-            self.logger.warning(f"CoinDesk RSS fetch failed: {str(e)}")
-
-        # Fallback to simple simulated headlines if RSS empty or failed
-        if not crypto_news:
-            try:
-                sample_headlines = [
-                    f"{crypto_name.upper()} shows strong momentum amid institutional interest",
-                    f"Market analysts bullish on {crypto_name.upper()} price action",
-                    f"Regulatory clarity boosts {crypto_name.upper()} adoption",
-                    f"{crypto_name.upper()} technical analysis suggests upward trend",
-                    f"Major exchange lists {crypto_name.upper()} futures contracts"
-                ]
-                for i, headline in enumerate(sample_headlines):
-                    date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-                    crypto_news.append({
-                        'title': headline,
-                        'summary': f"Market analysis and news regarding {crypto_name.upper()}",
-                        'date': date,
-                        'source': 'CryptoNews'
-                    })
-            except Exception as e:
-                self.logger.warning(f"Error generating fallback crypto news: {str(e)}")
-        
-        return crypto_news
+        # Fallback to simple simulated headlines if the feed was empty
+        return crypto_news or self._sample_crypto_news(symbol)
     
-    def _calculate_sentiment_score(self, headlines: List[str]) -> float:
+    def _sample_crypto_news(self, symbol: str) -> List[Dict]:
         """
-        Derive a naive sentiment score from keyword counts in headlines.
+        Simulated coin headlines, used when CoinDesk is empty or unavailable.
         """
-        if not headlines:
-            return 0.0
-        
-        # Simple keyword-based sentiment analysis
-        positive_words = [
-            'bullish', 'surge', 'rally', 'gains', 'rise', 'boost', 'strong',
-            'positive', 'growth', 'momentum', 'optimistic', 'buy', 'upgrade'
+        crypto_name = symbol.split('-')[0].upper()
+        sample_headlines = [
+            f"{crypto_name} shows strong momentum amid institutional interest",
+            f"Market analysts bullish on {crypto_name} price action",
+            f"Regulatory clarity boosts {crypto_name} adoption",
+            f"{crypto_name} technical analysis suggests upward trend",
+            f"Major exchange lists {crypto_name} futures contracts"
         ]
-        
-        negative_words = [
-            'bearish', 'fall', 'drop', 'decline', 'crash', 'weak', 'sell',
-            'negative', 'pessimistic', 'downgrade', 'concerns', 'risks'
-        ]
-        
-        total_score = 0
-        word_count = 0
-        
-        for headline in headlines:
-            headline_lower = headline.lower()
-            for word in positive_words:
-                total_score += headline_lower.count(word)
-                word_count += headline_lower.count(word)
-            
-            for word in negative_words:
-                total_score -= headline_lower.count(word)
-                word_count += headline_lower.count(word)
-        
-        if word_count == 0:
-            return 0.0
-        
-        # Normalize to [-1, 1]
-        return max(-1.0, min(1.0, total_score / word_count))
+        return [{
+            'title': headline,
+            'summary': f"Market analysis and news regarding {crypto_name}",
+            'date': (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d'),
+            'source': 'CryptoNews'
+        } for i, headline in enumerate(sample_headlines)]
     
-    def curate_dataset(self, symbol: str, exchange: str) -> List[MarketData]:
+    def _calculate_sentiment_score(self, headlines: List[str]) -> float:
+        """
+        Score headlines with the configured sentiment backend
+        (see sentiment.SentimentScorer).
+        """
+        return self.sentiment.score(headlines)
+    
+    def curate_dataset(self, symbol: str, exchange: str, since: Optional[str] = None) -> MarketDataBatch:
         """
         Build a day-by-day dataset by merging market rows with news features.
+        
+        With `since` ('YYYY-MM-DD'), only days after that date are curated.
+        Returns a columnar MarketDataBatch; indexing or iterating it yields
+        rows with the MarketData attributes.
+        """
+        return MarketDataBatch.from_frame(self.curate_frame(symbol, exchange, since))
+    
+    def curate_frame(self, symbol: str, exchange: str, since: Optional[str] = None) -> pd.DataFrame:
+        """
+        Curated dataset as a DataFrame: one row per trading day, one column
+        per MarketData field (CURATED_COLUMNS) followed by any extra configured
+        indicator (e.g. 'ema_12', 'macd'). `curate_dataset` wraps it in a
+        MarketDataBatch; `iter_market_data` builds MarketData objects from it.
         """
         try:
             self.logger.info(f"Starting data curation for {symbol} on {exchange}")
             
-            # Get structured data
-            structured_data = self.get_structured_data(symbol, exchange)
-            
-            # Get unstructured data
-            unstructured_data = self.get_unstructured_data(symbol)
-            
-            # Combine data
-            curated_data = []
-            
-            for date_idx, (date, row) in enumerate(structured_data.iterrows()):
-                # Normalize market date to naive date to avoid tz-aware vs tz-naive issues
-                try:
-                    market_date_naive = pd.Timestamp(date).tz_localize(None).date()
-                except Exception:
-                    # If already naive
-                    market_date_naive = pd.Timestamp(date).date()
-                date_str = market_date_naive.strftime('%Y-%m-%d')
-                
-                # Get news for this date (or closest available)
-                news_headlines = []
-                available_dates = list(unstructured_data.keys())
-                
-                if available_dates:
-                    # Find closest news date using date objects to prevent tz issues
-                    def _to_date(date_str_val: str):
-                        try:
-                            return datetime.strptime(date_str_val, '%Y-%m-%d').date()
-                        except Exception:
-                            return market_date_naive
-                    closest_date = min(
-                        available_dates,
-                        key=lambda x: abs((_to_date(x) - market_date_naive).days)
-                    )
-                    news_articles = unstructured_data.get(closest_date, [])
-                    news_headlines = [article.get('title', '') for article in news_articles]
-                
-                # Calculate sentiment
-                sentiment_score = self._calculate_sentiment_score(news_headlines)
-                
-                # Create MarketData object
-                market_data = MarketData(
-                    symbol=symbol,
-                    exchange=exchange,
-                    date=date_str,
-                    open_price=float(row['Open']),
-                    high_price=float(row['High']),
-                    low_price=float(row['Low']),
-                    close_price=float(row['Close']),
-                    volume=int(row['Volume']),
-                    daily_return=float(row.get('Daily_Return', 0)),
-                    volatility=float(row.get('Volatility', 0)),
-                    sma_5=float(row.get('SMA_5', 0)),
-                    sma_20=float(row.get('SMA_20', 0)),
-                    rsi=float(row.get('RSI', 50)),
-                    news_headlines=news_headlines,
-                    news_sentiment_score=sentiment_score
-                )
-                
-                curated_data.append(market_data)
+            # Fetch structured (prices) and unstructured (news) data concurrently
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                structured_future = pool.submit(self.get_structured_data, symbol, exchange, since)
+                unstructured_future = pool.submit(self.get_unstructured_data, symbol)
+            structured_data = structured_future.result()
+            unstructured_data = unstructured_future.result()
             
-            self.logger.info(f"Successfully curated {len(curated_data)} data points for {symbol}")
-            return curated_data
+            curated = self.build_curated_frame(structured_data, unstructured_data, symbol, exchange)
+            self.logger.info(f"Successfully curated {len(curated)} data points for {symbol}")
+            return curated
             
         except Exception as e:
             self.logger.error(f"Error curating dataset for {symbol}: {str(e)}")
             raise
     
-    def save_to_csv(self, data: List[MarketData], filename: str) -> None:
+    def _news_frame(self, unstructured_data: Dict[str, List[Dict]]) -> pd.DataFrame:
+        """
+        One row per news date, sorted: parsed date, headlines and their sentiment.
+        
+        Dates are parsed once; keys that are not 'YYYY-MM-DD' are dropped.
+        """
+        dates = pd.to_datetime(pd.Series(list(unstructured_data.keys()), dtype=object),
+                               format='%Y-%m-%d', errors='coerce')
+        headlines = [[article.get('title', '') for article in articles] for articles in unstructured_data.values()]
+        news = pd.DataFrame({
+            'news_date': dates.astype('datetime64[ns]'),
+            'news_headlines': pd.Series(headlines, dtype=object),
+        }).dropna(subset=['news_date'])
+        news = news.drop_duplicates('news_date').sort_values('news_date', kind='stable')
+        news['news_sentiment_score'] = self.sentiment.score_groups(news['news_headlines'].tolist())
+        return news.reset_index(drop=True)
+    
+    def build_curated_frame(self, structured_data: pd.DataFrame, unstructured_data: Dict[str, List[Dict]],
+                            symbol: str, exchange: str) -> pd.DataFrame:
+        """
+        Align news to trading days and assemble the curated columns.
+        
+        Each day takes the headlines of the nearest news date (ties go to the
+        earlier date) via `merge_asof`, so the cost is one sort of each side
+        instead of a scan of every news date per day. Sentiment is scored once
+        per news date. Rows keep the order of `structured_data`.
+        """
+        index = pd.DatetimeIndex(structured_data.index)
+        if index.tz is not None:
+            # Keep the exchange-local calendar day, dropping the timezone
+            index = index.tz_localize(None)
+        market_dates = index.normalize().astype('datetime64[ns]')
+        
+        n_rows = len(structured_data)
+        curated = pd.DataFrame({'symbol': symbol, 'exchange': exchange,
+                                'date': market_dates.strftime('%Y-%m-%d')}, index=range(n_rows))
+        for source, (column, default) in _STRUCTURED_COLUMNS.items():
+            if source in structured_data.columns or default is None:
+                curated[column] = structured_data[source].to_numpy(dtype='float64')
+            else:
+                curated[column] = default
+        curated['volume'] = structured_data['Volume'].to_numpy().astype('int64')
+        # Configured indicators beyond the MarketData fields, under their lower-cased labels
+        extra_columns = [label for label in feature_columns(self.features)
+                         if label not in _STRUCTURED_COLUMNS and label in structured_data.columns]
+        for label in extra_columns:
+            curated[label.lower()] = structured_data[label].to_numpy(dtype='float64')
+        
+        news = self._news_frame(unstructured_data)
+        if len(news) and n_rows:
+            days = pd.DataFrame({'news_date': market_dates, 'row': range(n_rows)})
+            aligned = pd.merge_asof(days.sort_values('news_date', kind='stable'), news,
+                                    on='news_date', direction='nearest').sort_values('row')
+            curated['news_headlines'] = aligned['news_headlines'].to_numpy()
+            curated['news_sentiment_score'] = aligned['news_sentiment_score'].to_numpy(dtype='float64')
+        else:
+            empty: List[str] = []
+            curated['news_headlines'] = pd.Series([empty] * n_rows, dtype=object)
+            curated['news_sentiment_score'] = self._calculate_sentiment_score(empty)
+        curated['sentiment_backend'] = self.sentiment.name
+        return curated[CURATED_COLUMNS + [label.lower() for label in extra_columns]]
+    
+    def curate_many(self, symbols: List[str], exchange: str, max_workers: int = 8) -> Dict[str, Any]:
+        """
+        Curate several symbols concurrently on a bounded thread pool.
+        
+        Network waits overlap across symbols; the per-host rate limiter keeps
+        the combined request rate polite. Returns a dict mapping each symbol
+        (in input order) to its MarketDataBatch, or to the exception that
+        curating it raised.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        results: Dict[str, Any] = {}
+        if not symbols:
+            return results
+        self.logger.info(f"Curating {len(symbols)} symbols on {exchange} with {min(max_workers, len(symbols))} workers")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as pool:
+            futures = {pool.submit(self.curate_dataset, symbol, exchange): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    results[symbol] = e
+        failed = sum(1 for value in results.values() if isinstance(value, Exception))
+        self.logger.info(f"Batch curation finished: {len(symbols) - failed} succeeded, {failed} failed")
+        return {symbol: results[symbol] for symbol in symbols}
+    
+    def save_to_csv(self, data: Iterable[MarketData], filename: str) -> None:
         """
         Write curated records to a CSV file with safe formatting.
         """
@@ -561,7 +901,7 @@ class FinTechDataCurator:
                 fieldnames = [
                     'symbol', 'exchange', 'date', 'open_price', 'high_price', 'low_price',
                     'close_price', 'volume', 'daily_return', 'volatility', 'sma_5', 'sma_20',
-                    'rsi', 'news_headlines', 'news_sentiment_score'
+                    'rsi', 'news_headlines', 'news_sentiment_score', 'sentiment_backend'
                 ]
                 
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -588,7 +928,8 @@ class FinTechDataCurator:
                         'sma_20': round(item.sma_20, 4) if not pd.isna(item.sma_20) else '',
                         'rsi': round(item.rsi, 2) if not pd.isna(item.rsi) else '',
                         'news_headlines': news_text,
-                        'news_sentiment_score': round(item.news_sentiment_score, 3) if not pd.isna(item.news_sentiment_score) else 0
+                        'news_sentiment_score': round(item.news_sentiment_score, 3) if not pd.isna(item.news_sentiment_score) else 0,
+                        'sentiment_backend': getattr(item, 'sentiment_backend', None) or 'keyword'
                     })
             
             self.logger.info(f"Data saved to {filename}")
@@ -597,7 +938,7 @@ class FinTechDataCurator:
             self.logger.error(f"Error saving to CSV: {str(e)}")
             raise
     
-    def save_to_json(self, data: List[MarketData], filename: str) -> None:
+    def save_to_json(self, data: Iterable[MarketData], filename: str) -> None:
         """
         Serialize curated records to JSON with numeric cleanup.
         """
@@ -635,7 +976,8 @@ class FinTechDataCurator:
                     },
                     'unstructured_data': {
                         'news_headlines': item.news_headlines if item.news_headlines else [],
-                        'news_sentiment_score': round(item.news_sentiment_score, 3) if not pd.isna(item.news_sentiment_score) else 0
+                        'news_sentiment_score': round(item.news_sentiment_score, 3) if not pd.isna(item.news_sentiment_score) else 0,
+                        'sentiment_backend': getattr(item, 'sentiment_backend', None) or 'keyword'
                     }
                 })
             
@@ -647,6 +989,42 @@ class FinTechDataCurator:
         except Exception as e:
             self.logger.error(f"Error saving to JSON: {str(e)}")
             raise
+    
+    def save_to_parquet(self, data: Iterable[MarketData], filename: str) -> None:
+        """
+        Write curated records to a Parquet file with typed columns (needs pyarrow).
+        """
+        self._save_columnar(data, filename, 'parquet')
+    
+    def save_to_arrow(self, data: Iterable[MarketData], filename: str) -> None:
+        """
+        Write curated records to an Arrow IPC (Feather v2) file (needs pyarrow).
+        """
+        self._save_columnar(data, filename, 'arrow')
+    
+    def load_from_parquet(self, filename: str) -> MarketDataBatch:
+        """
+        Load records written by save_to_parquet.
+        """
+        return self._load_columnar(filename)
+    
+    def load_from_arrow(self, filename: str) -> MarketDataBatch:
+        """
+        Load records written by save_to_arrow (the file is memory-mapped).
+        """
+        return self._load_columnar(filename)
+    
+    def _save_columnar(self, data: Iterable[MarketData], filename: str, fmt: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+            dataset_export.write_table(as_batch(data).to_arrow(), filename, fmt)
+            self.logger.info(f"Data saved to {filename}")
+        except Exception as e:
+            self.logger.error(f"Error saving to {fmt}: {str(e)}")
+            raise
+    
+    def _load_columnar(self, filename: str) -> MarketDataBatch:
+        return MarketDataBatch.from_arrow(dataset_export.read_table(filename))
 
 def demo_single_stock(symbol, exchange, days=7):
     """
@@ -663,7 +1041,38 @@ def demo_single_stock(symbol, exchange, days=7):
         # Collect data
         print(f"Collecting {days} days of data for {symbol}...")
         dataset = curator.curate_dataset(symbol, exchange)
+        return report_dataset(curator, symbol, dataset)
         
+    except Exception as e:
+        print(f"Error processing {symbol}: {str(e)}")
+        return False
+
+def demo_multiple_stocks(symbols, exchange, days=7):
+    """
+    Demonstrate concurrent data collection for several stocks/cryptos.
+    """
+    print(f"\n{'='*60}")
+    print(f"DEMO: {', '.join(symbols)} on {exchange}")
+    print(f"{'='*60}")
+    
+    curator = FinTechDataCurator(days_history=days)
+    print(f"Collecting {days} days of data for {len(symbols)} symbols concurrently...")
+    batch = curator.curate_many(symbols, exchange)
+    
+    results = {}
+    for symbol, dataset in batch.items():
+        if isinstance(dataset, Exception):
+            print(f"Error processing {symbol}: {str(dataset)}")
+            results[symbol] = False
+            continue
+        results[symbol] = report_dataset(curator, symbol, dataset)
+    return results
+
+def report_dataset(curator, symbol, dataset):
+    """
+    Save a curated dataset to output/csv and output/json and print a sample.
+    """
+    try:
         # Save data to separate folders
         os.makedirs(os.path.join('output', 'csv'), exist_ok=True)
         os.makedirs(os.path.join('output', 'json'), exist_ok=True)
@@ -829,11 +1238,7 @@ def main():
             verify_outputs(results.keys())
         elif choice == '2':
             exchange, symbols_list, days = prompt_multiple()
-            results = {}
-            for sym in symbols_list:
-                success = demo_single_stock(sym, exchange, days)
-                results[sym] = success
-                time.sleep(1)
+            results = demo_multiple_stocks(symbols_list, exchange, days)
             generate_summary_report(results)
             verify_outputs(results.keys())
         elif choice == '3':
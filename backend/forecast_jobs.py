@@ -0,0 +1,262 @@
+"""
+Background forecast jobs
+
+Forecast requests are queued here and run off the request thread. Each
+job trains its models in a worker process pool and records per-model
+progress in an in-process job store, so no external broker is needed.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from ml_models.pipeline import MODEL_ORDER, configure_worker, run_forecast_models, selected_models
+
+
+class JobStoreFull(RuntimeError):
+    """Raised when every retained job is still queued or running."""
+
+
+class JobStore:
+    """
+    Thread-safe in-memory store of job state with bounded retention.
+
+    Only finished jobs are evicted; a job that is queued or running stays
+    pollable until it ends, so a store full of active jobs refuses new ones.
+    """
+
+    def __init__(self, max_jobs: int = 500, ttl_seconds: float = 6 * 3600):
+        self.max_jobs = int(max_jobs)
+        self.ttl_seconds = float(ttl_seconds)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, **fields) -> Dict[str, Any]:
+        """Register a new queued job and return a copy of it (JobStoreFull if no room)."""
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'status': 'queued',
+            'created_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'error': None,
+            'results': [],
+            **fields
+        }
+        with self._lock:
+            self._prune()
+            self._jobs[job['job_id']] = job
+            return self._copy(job)
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def set_progress(self, job_id: str, model: str, state: str, result: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job['progress'][model] = state
+            if result is not None:
+                # A retried run replaces earlier output for the same model
+                job['results'] = [r for r in job['results'] if r.get('key') != result.get('key')] + [result]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._copy(job) if job else None
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return counts
+
+    def _copy(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        copied = dict(job)
+        copied['progress'] = dict(job.get('progress', {}))
+        copied['results'] = list(job.get('results', []))
+        return copied
+
+    def _prune(self) -> None:
+        # Caller holds self._lock; drop expired finished jobs, then the oldest finished
+        now = time.time()
+        finished = sorted(
+            (job.get('_finished_ts', now), job_id) for job_id, job in self._jobs.items()
+            if job['status'] in ('completed', 'failed')
+        )
+        for finished_ts, job_id in finished:
+            if now - finished_ts > self.ttl_seconds or len(self._jobs) >= self.max_jobs:
+                del self._jobs[job_id]
+        if len(self._jobs) >= self.max_jobs:
+            raise JobStoreFull(f"{len(self._jobs)} forecast jobs are still queued or running; try again later")
+
+
+class ForecastJobManager:
+    """
+    Run forecast jobs in the background and track their progress.
+
+    Jobs are coordinated by a small thread pool; the model training itself
+    is sent to a process pool. If a process pool cannot be started (or
+    breaks), jobs fall back to running the models in the coordinator thread.
+
+    The pool has one worker per model by default so a parallel run can train
+    every model at once; each worker is limited to `threads_per_worker`
+    TensorFlow/BLAS threads so the workers together do not oversubscribe
+    the cores.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, max_workers: Optional[int] = None,
+                 executor_kind: Optional[str] = None, max_concurrent_jobs: int = 4,
+                 threads_per_worker: Optional[int] = None):
+        cpus = os.cpu_count() or 1
+        self.store = store or JobStore()
+        self.max_workers = int(max_workers or os.getenv('FORECAST_JOB_WORKERS', 0) or min(len(MODEL_ORDER), cpus))
+        self.threads_per_worker = int(
+            threads_per_worker or os.getenv('FORECAST_WORKER_THREADS', 0) or max(1, cpus // self.max_workers)
+        )
+        self.executor_kind = (executor_kind or os.getenv('FORECAST_JOB_EXECUTOR', 'process')).lower()
+        self._coordinator = ThreadPoolExecutor(max_workers=max_concurrent_jobs, thread_name_prefix='forecast-job')
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def get_pool(self):
+        """Return the shared model-training pool, or None to run inline."""
+        if self.executor_kind != 'process':
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                try:
+                    # spawn: forking a process that already initialised TensorFlow is unsafe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=configure_worker,
+                        initargs=(self.threads_per_worker,)
+                    )
+                except Exception as e:
+                    print(f"⚠️ Process pool unavailable, running forecast jobs in-process: {e}")
+                    self.executor_kind = 'thread'
+            return self._pool
+
+    def _discard_pool(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self.executor_kind = 'thread'
+
+    def run_models(self, symbol: str, models: List[str], params: Dict[str, Any], train_series: pd.Series,
+                   test_series: pd.Series, preview_days: int, ensemble: bool = False, weighting: str = 'equal',
+                   parallel: bool = False, on_progress=None) -> List[Dict[str, Any]]:
+        """
+        Run models on the shared pool and wait for them (used by jobs and
+        synchronous parallel runs). A broken pool is discarded and the
+        models that had not finished are retried in-process; finished ones
+        are reused, so `on_progress` reports each model's result once.
+        """
+        finished: Dict[str, Dict[str, Any]] = {}
+
+        def track(key, state, result):
+            if state == 'done' and result is not None:
+                finished[key] = result
+            if on_progress:
+                on_progress(key, state, result)
+
+        try:
+            return run_forecast_models(
+                symbol, models, params, train_series, test_series, preview_days,
+                ensemble=ensemble, weighting=weighting, executor=self.get_pool(),
+                parallel=parallel, on_progress=track
+            )
+        except BrokenProcessPool as e:
+            print(f"⚠️ Forecast worker pool broke ({e}); retrying {symbol} in-process")
+            self._discard_pool()
+            return run_forecast_models(
+                symbol, models, params, train_series, test_series, preview_days,
+                ensemble=ensemble, weighting=weighting, executor=None, on_progress=track,
+                completed=finished
+            )
+
+    def submit(self, symbol: str, models: List[str], params: Dict[str, Any], train_series: pd.Series,
+               test_series: pd.Series, preview_days: int, ensemble: bool = False, weighting: str = 'equal',
+               parallel: bool = False,
+               on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+               on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+               meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Queue a forecast job and return its initial state immediately.
+
+        `on_result(symbol, result)` runs as each model finishes (e.g. to save
+        it); `on_complete(job)` runs once after all models succeed. `meta` is
+        stored on the job as-is for the caller's own bookkeeping.
+        """
+        keys = selected_models(models)
+        progress = {key: 'pending' for key in keys}
+        if ensemble and keys:
+            progress['ensemble'] = 'pending'
+        job = self.store.create(
+            symbol=symbol,
+            models=keys,
+            ensemble=bool(ensemble),
+            progress=progress,
+            meta=dict(meta or {}),
+            _created_ts=time.time()
+        )
+        self._coordinator.submit(
+            self._run, job['job_id'], symbol, models, params, train_series, test_series,
+            preview_days, ensemble, weighting, parallel, on_result, on_complete
+        )
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def _run(self, job_id, symbol, models, params, train_series, test_series, preview_days,
+             ensemble, weighting, parallel, on_result, on_complete) -> None:
+        self.store.update(job_id, status='running', started_at=datetime.now().isoformat())
+
+        def on_progress(key, state, result):
+            if state == 'done' and result is not None and on_result:
+                on_result(symbol, result)
+            self.store.set_progress(job_id, key, state, result)
+
+        try:
+            self.run_models(
+                symbol, models, params, train_series, test_series, preview_days,
+                ensemble=ensemble, weighting=weighting, parallel=parallel, on_progress=on_progress
+            )
+            self.store.update(job_id, status='completed', finished_at=datetime.now().isoformat(), _finished_ts=time.time())
+            if on_complete:
+                on_complete(self.store.get(job_id))
+        except Exception as e:
+            traceback.print_exc()
+            self.store.update(job_id, status='failed', error=str(e), finished_at=datetime.now().isoformat(), _finished_ts=time.time())
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarise job counts and executor configuration."""
+        return {
+            'executor': self.executor_kind,
+            'max_workers': self.max_workers,
+            'threads_per_worker': self.threads_per_worker,
+            'jobs': self.store.counts()
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._coordinator.shutdown(wait=wait)
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration for the FinTech DataGen API
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+This runs ONE worker process with threads. Forecast jobs
+(forecast_jobs.JobStore) and the response cache live in process memory,
+so with several workers a job polled from another worker returns 404 and
+cache invalidation after a write only reaches the worker that made it.
+The pre-fork machinery is kept, but with one worker there is nothing to
+share copy-on-write: preloading the app in the master only means a
+replacement worker (after a crash or `kill -HUP`) is forked ready to
+serve instead of re-importing everything. Concurrency comes from threads,
+and model training runs in the forecast job process pool.
+
+Raise WEB_CONCURRENCY only when neither in-memory store is in use (e.g.
+behind sticky sessions with RESPONSE_CACHE_TTL=0).
+
+The app is preloaded in the master (see wsgi.py), and the worker
+reconnects to MongoDB after the fork. Reloading:
+- `kill -HUP <master>` gracefully replaces the worker (in-flight requests
+  finish within graceful_timeout); with preload_app it re-forks from the
+  already-loaded master, so it picks up configuration but not new code.
+- `kill -USR2 <master>` starts a new master with the new code; once it is
+  serving, `kill -TERM <old master>` retires the old one.
+
+Settings can be overridden with the environment variables below.
+"""
+
+import os
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+# One worker: job state and the response cache are per process (see above)
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+# Threads let the worker keep answering while one request trains a model
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+preload_app = True
+# Synchronous forecast runs (/api/forecast/run) can train several models
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 300))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 60))
+keepalive = 5
+# Optional worker recycling (0 = never); in-flight keep-alive clients see a reset when it happens
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(max_requests * 0.1)
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    import wsgi
+    wsgi.init_worker()
+
+
+def worker_exit(server, worker):
+    import wsgi
+    wsgi.shutdown_worker()
@@ -0,0 +1,246 @@
+"""
+Disk-backed HTTP response cache for the data curator
+
+`CachingHTTPAdapter` is mounted on a `requests.Session`. Successful GET
+responses are stored on disk keyed by URL, with a time-to-live chosen per
+URL (intraday chart data goes stale in a minute, daily bars in an hour).
+Stale entries that carry an ETag or Last-Modified header are revalidated
+with a conditional request; a 304 reply refreshes the entry without
+downloading the body again. An optional `before_send` hook (e.g. a rate
+limiter) runs only for requests that go to the network, so cache hits
+are never throttled.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+DEFAULT_HTTP_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'http')
+
+# Seconds a chart response stays fresh, by its `interval` query parameter
+CHART_INTERVAL_TTLS = {
+    '1m': 60, '2m': 60, '5m': 120, '15m': 300, '30m': 600, '60m': 900, '90m': 900, '1h': 900,
+    '1d': 3600, '5d': 6 * 3600, '1wk': 6 * 3600, '1mo': 24 * 3600, '3mo': 24 * 3600
+}
+DEFAULT_TTL = 600
+
+# Seconds between prunes of a cache directory, across all caches opened on it
+PRUNE_INTERVAL = 3600
+# Marker file whose mtime records the last prune
+_PRUNE_MARKER = '.last_prune'
+
+# Response headers worth keeping with a cached body
+_STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Date')
+
+
+def default_ttl(url: str) -> float:
+    """Pick a freshness lifetime for `url`: chart data by interval, everything else 10 minutes."""
+    parsed = urlparse(url)
+    if '/chart/' in parsed.path:
+        interval = parse_qs(parsed.query).get('interval', ['1d'])[0]
+        return CHART_INTERVAL_TTLS.get(interval, DEFAULT_TTL)
+    return DEFAULT_TTL
+
+
+class HTTPResponseCache:
+    """
+    Store of response bodies and validators, one pair of files per URL.
+
+    Entries older than `max_age_seconds` (regardless of TTL) are removed
+    when the cache is opened, at most once per PRUNE_INTERVAL per directory.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_HTTP_CACHE_DIR, max_age_seconds: float = 7 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_age_seconds = float(max_age_seconds)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0}
+        self.maybe_prune()
+
+    @classmethod
+    def from_env(cls) -> Optional['HTTPResponseCache']:
+        """Build the cache from CURATOR_HTTP_CACHE_DIR ("off" disables it)."""
+        cache_dir = os.getenv('CURATOR_HTTP_CACHE_DIR', DEFAULT_HTTP_CACHE_DIR)
+        if cache_dir.lower() in ('', 'none', 'off'):
+            return None
+        return cls(cache_dir)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.body"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return {'meta': {...}, 'body': bytes} for `url`, or None."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url:
+            return None
+        return {'meta': meta, 'body': body}
+
+    def put(self, url: str, headers, body: bytes) -> None:
+        """Store a fresh 200 response for `url`."""
+        meta = {
+            'url': url,
+            'stored_at': time.time(),
+            'headers': {name: headers[name] for name in _STORED_HEADERS if name in headers}
+        }
+        self._write(url, meta, body)
+        self.record('stores')
+
+    def touch(self, url: str, meta: Dict[str, Any]) -> None:
+        """Mark an entry fresh again after a 304 revalidation."""
+        meta = dict(meta, stored_at=time.time())
+        meta_path, _ = self._paths(url)
+        self._atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def maybe_prune(self, interval: float = PRUNE_INTERVAL) -> bool:
+        """
+        Prune unless the directory was pruned in the last `interval` seconds
+        (one stat instead of a full scan); returns whether it pruned.
+        """
+        marker = os.path.join(self.cache_dir, _PRUNE_MARKER)
+        try:
+            if time.time() - os.path.getmtime(marker) < interval:
+                return False
+        except OSError:
+            pass
+        self.prune()
+        return True
+
+    def prune(self) -> None:
+        """Delete entries stored more than max_age_seconds ago."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        marker = os.path.join(self.cache_dir, _PRUNE_MARKER)
+        try:
+            # Mark first, so caches opened during the scan do not start another one
+            with open(marker, 'a'):
+                pass
+            os.utime(marker)
+        except OSError:
+            pass
+        cutoff = time.time() - self.max_age_seconds
+        for name in os.listdir(self.cache_dir):
+            if name == _PRUNE_MARKER:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _write(self, url: str, meta: Dict[str, Any], body: bytes) -> None:
+        meta_path, body_path = self._paths(url)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Body first: a reader that sees new metadata always finds its body
+            self._atomic_write(body_path, body)
+            self._atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError:
+            pass
+
+    def _atomic_write(self, path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter serving GETs from an HTTPResponseCache.
+
+    Responses built from the cache have `from_cache = True`.
+    `before_send(url)` is called before each request that goes to the
+    network (misses and revalidations), not for cache hits.
+    """
+
+    def __init__(self, cache: HTTPResponseCache, ttl_for: Callable[[str], float] = default_ttl,
+                 before_send: Optional[Callable[[str], None]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.ttl_for = ttl_for
+        self.before_send = before_send
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return self._send(request, **kwargs)
+
+        url = request.url
+        entry = self.cache.get(url)
+        if entry is not None:
+            meta = entry['meta']
+            if time.time() - meta['stored_at'] <= self.ttl_for(url):
+                self.cache.record('hits')
+                return self._build_response(request, meta, entry['body'])
+            validators = CaseInsensitiveDict(meta.get('headers', {}))
+            if 'ETag' in validators:
+                request.headers['If-None-Match'] = validators['ETag']
+            if 'Last-Modified' in validators:
+                request.headers['If-Modified-Since'] = validators['Last-Modified']
+
+        response = self._send(request, **kwargs)
+        if entry is not None and response.status_code == 304:
+            self.cache.touch(url, entry['meta'])
+            self.cache.record('revalidated')
+            return self._build_response(request, entry['meta'], entry['body'])
+
+        self.cache.record('misses')
+        if response.status_code == 200:
+            # Reading .content consumes the stream; the body stays on the response
+            self.cache.put(url, response.headers, response.content)
+        response.from_cache = False
+        return response
+
+    def _send(self, request, **kwargs):
+        if self.before_send is not None:
+            self.before_send(request.url)
+        return super().send(request, **kwargs)
+
+    def _build_response(self, request, meta: Dict[str, Any], body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+
+def install_cache(session: requests.Session, cache: HTTPResponseCache,
+                  ttl_for: Callable[[str], float] = default_ttl,
+                  before_send: Optional[Callable[[str], None]] = None) -> CachingHTTPAdapter:
+    """Mount a caching adapter on `session` for http and https URLs."""
+    adapter = CachingHTTPAdapter(cache, ttl_for=ttl_for, before_send=before_send)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return adapter
@@ -0,0 +1,238 @@
+"""
+Streaming technical indicators
+
+`IndicatorState` holds the rolling state of one symbol's daily series and
+advances it one bar at a time in constant time:
+- SMA_5 / SMA_20: running sums over a ring buffer of the last 21 closes
+- Volatility: sliding-window Welford mean/M2 of the last 20 daily returns
+  (sample standard deviation, like `rolling(20).std()`)
+- RSI: running sums of the last 14 gains/losses ('sma', the curator's
+  default) or Wilder smoothing ('wilder')
+
+Values match `FinTechDataCurator._calculate_technical_indicators` on the
+same bars. The state streams exactly the default feature set
+(`STREAMED_FEATURES`); a curator configured with other specs recomputes
+its indicators in bulk instead. The state serializes to a plain dict
+(`to_dict`/`from_dict`), including the specs and RSI method it was built
+with, so it can be stored next to `historical_prices` and resumed later
+without refetching the warm-up window.
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from features import DEFAULT_FEATURES, parse_features
+
+SMA_WINDOWS = (5, 20)
+VOLATILITY_WINDOW = 20
+RSI_WINDOW = 14
+RSI_METHODS = ('sma', 'wilder')
+
+# Bars after which running sums are recomputed from their windows to shed rounding drift
+RESYNC_EVERY = 1000
+
+# Indicator keys produced by IndicatorState.update
+INDICATOR_FIELDS = ('daily_return', 'volatility', 'sma_5', 'sma_20', 'rsi')
+
+# Canonical specs of the features IndicatorState streams (INDICATOR_FIELDS are their fields)
+STREAMED_FEATURES = tuple(str(spec) for spec in parse_features(DEFAULT_FEATURES))
+
+
+def streams_features(specs: Union[str, Iterable]) -> bool:
+    """True when `specs` (in any order) are exactly the features IndicatorState streams."""
+    return {str(spec) for spec in parse_features(specs)} == set(STREAMED_FEATURES)
+
+NAN = float('nan')
+
+
+class IndicatorState:
+    """Rolling indicator state for one symbol; `update` consumes one daily bar."""
+
+    def __init__(self, rsi_method: str = 'sma'):
+        if rsi_method not in RSI_METHODS:
+            raise ValueError(f"rsi_method must be one of {RSI_METHODS}")
+        self.rsi_method = rsi_method
+        self.features = STREAMED_FEATURES
+        self.bars = 0
+        self.last_date: Optional[str] = None
+        self.last_close: Optional[float] = None
+        # One extra close so the value leaving each SMA window is still at hand
+        self.closes = deque(maxlen=max(SMA_WINDOWS) + 1)
+        self.sma_sums = {w: 0.0 for w in SMA_WINDOWS}
+        self.returns = deque(maxlen=VOLATILITY_WINDOW)
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+        # Run of identical returns; a window of one repeated value has exactly zero spread
+        self.same_returns = 0
+        self.gains = deque(maxlen=RSI_WINDOW)
+        self.losses = deque(maxlen=RSI_WINDOW)
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+
+    def matches(self, specs: Union[str, Iterable], rsi_method: str) -> bool:
+        """True when this state computes `specs` with `rsi_method`, so it can be resumed for them."""
+        return rsi_method == self.rsi_method and {str(spec) for spec in parse_features(specs)} == set(self.features)
+
+    def update(self, date: str, close: float) -> Dict[str, float]:
+        """
+        Advance by one bar (dates must increase) and return its indicators.
+
+        Indicators without a full window yet are NaN, as in the bulk
+        pandas computation.
+        """
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"Bar {date} is not after the last bar {self.last_date}")
+        close = float(close)
+        daily_return = NAN
+        if self.last_close is None:
+            # pandas treats the first (missing) price change as a zero gain and loss
+            delta = 0.0
+        else:
+            delta = close - self.last_close
+            daily_return = delta / self.last_close if self.last_close else NAN
+
+        self._push_close(close)
+        if not math.isnan(daily_return):
+            self._push_return(daily_return)
+        self._push_delta(delta)
+
+        self.bars += 1
+        self.last_date = date
+        self.last_close = close
+        if self.bars % RESYNC_EVERY == 0:
+            self._resync()
+        return {
+            'daily_return': daily_return,
+            'volatility': self.volatility(),
+            'sma_5': self.sma(5),
+            'sma_20': self.sma(20),
+            'rsi': self.rsi(),
+        }
+
+    def update_many(self, bars: Iterable) -> List[Dict[str, float]]:
+        """Apply `update` to (date, close) pairs in order; returns the indicator dicts."""
+        return [self.update(date, close) for date, close in bars]
+
+    def _push_close(self, close: float) -> None:
+        self.closes.append(close)
+        for window in SMA_WINDOWS:
+            self.sma_sums[window] += close
+            if len(self.closes) > window:
+                self.sma_sums[window] -= self.closes[-window - 1]
+
+    def _push_return(self, value: float) -> None:
+        self.same_returns = self.same_returns + 1 if self.returns and value == self.returns[-1] else 1
+        # Sliding-window Welford: add to a filling window, replace the oldest in a full one
+        if len(self.returns) < self.returns.maxlen:
+            self.returns.append(value)
+            delta = value - self.return_mean
+            self.return_mean += delta / len(self.returns)
+            self.return_m2 += delta * (value - self.return_mean)
+        else:
+            oldest = self.returns[0]
+            self.returns.append(value)
+            old_mean = self.return_mean
+            self.return_mean += (value - oldest) / len(self.returns)
+            self.return_m2 += (value - oldest) * (value - self.return_mean + oldest - old_mean)
+
+    def _push_delta(self, delta: float) -> None:
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if len(self.gains) == self.gains.maxlen:
+            self.gain_sum -= self.gains[0]
+            self.loss_sum -= self.losses[0]
+        self.gains.append(gain)
+        self.losses.append(loss)
+        self.gain_sum += gain
+        self.loss_sum += loss
+        if self.avg_gain is not None:
+            self.avg_gain = (self.avg_gain * (RSI_WINDOW - 1) + gain) / RSI_WINDOW
+            self.avg_loss = (self.avg_loss * (RSI_WINDOW - 1) + loss) / RSI_WINDOW
+        elif len(self.gains) == RSI_WINDOW:
+            # Wilder averages are seeded with the first full window's mean
+            self.avg_gain = self.gain_sum / RSI_WINDOW
+            self.avg_loss = self.loss_sum / RSI_WINDOW
+
+    def _resync(self) -> None:
+        closes = list(self.closes)
+        for window in SMA_WINDOWS:
+            self.sma_sums[window] = math.fsum(closes[-window:])
+        if self.returns:
+            self.return_mean = math.fsum(self.returns) / len(self.returns)
+            self.return_m2 = math.fsum((r - self.return_mean) ** 2 for r in self.returns)
+        self.gain_sum = math.fsum(self.gains)
+        self.loss_sum = math.fsum(self.losses)
+
+    def sma(self, window: int) -> float:
+        if len(self.closes) < window:
+            return NAN
+        return self.sma_sums[window] / window
+
+    def volatility(self) -> float:
+        if len(self.returns) < VOLATILITY_WINDOW:
+            return NAN
+        if self.same_returns >= VOLATILITY_WINDOW:
+            return 0.0
+        return math.sqrt(max(self.return_m2, 0.0) / (VOLATILITY_WINDOW - 1))
+
+    def rsi(self) -> float:
+        if self.rsi_method == 'wilder':
+            if self.avg_gain is None:
+                return NAN
+            gain, loss = self.avg_gain, self.avg_loss
+        else:
+            if len(self.gains) < RSI_WINDOW:
+                return NAN
+            gain, loss = max(self.gain_sum, 0.0), max(self.loss_sum, 0.0)
+        if loss == 0:
+            return NAN if gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form for storage (see MongoDB.save_indicator_state)."""
+        return {
+            'rsi_method': self.rsi_method,
+            'features': list(self.features),
+            'bars': self.bars,
+            'last_date': self.last_date,
+            'last_close': self.last_close,
+            'closes': list(self.closes),
+            'sma_sums': {str(w): s for w, s in self.sma_sums.items()},
+            'returns': list(self.returns),
+            'return_mean': self.return_mean,
+            'return_m2': self.return_m2,
+            'same_returns': self.same_returns,
+            'gains': list(self.gains),
+            'losses': list(self.losses),
+            'gain_sum': self.gain_sum,
+            'loss_sum': self.loss_sum,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IndicatorState':
+        state = cls(rsi_method=data.get('rsi_method', 'sma'))
+        # States stored before specs were recorded always streamed the defaults
+        state.features = tuple(data.get('features', STREAMED_FEATURES))
+        state.bars = int(data['bars'])
+        state.last_date = data['last_date']
+        state.last_close = data['last_close']
+        state.closes.extend(data['closes'])
+        state.sma_sums = {int(w): float(s) for w, s in data['sma_sums'].items()}
+        state.returns.extend(data['returns'])
+        state.return_mean = float(data['return_mean'])
+        state.return_m2 = float(data['return_m2'])
+        state.same_returns = int(data.get('same_returns', 0))
+        state.gains.extend(data['gains'])
+        state.losses.extend(data['losses'])
+        state.gain_sum = float(data['gain_sum'])
+        state.loss_sum = float(data['loss_sum'])
+        state.avg_gain = data['avg_gain']
+        state.avg_loss = data['avg_loss']
+        return state
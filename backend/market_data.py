@@ -0,0 +1,318 @@
+"""
+Market data records and their columnar batch container
+
+`MarketData` is one day's snapshot as produced by the curator.
+`MarketDataBatch` holds many days column by column: a NumPy array per
+field, plus the news headlines of all rows in one flat array addressed by
+an offsets array (row i owns values[offsets[i]:offsets[i + 1]]). Indexing
+a batch returns a `MarketDataRow`, a two-slot view that reads its fields
+from the arrays on access.
+
+A batch built from a curated frame also carries its extra indicator
+columns (see features.py) as float arrays. They follow the batch through
+slices, `take`, `concat`, `to_frame` and `to_records` (so stored dataset
+rows keep them for the predictor), but are not part of the exported
+MarketData schema (`to_arrow`).
+
+`sentiment_backend` names the scorer behind `news_sentiment_score` (see
+sentiment.py); records, frames and tables without it read as 'keyword'.
+
+Numeric columns are shared, not copied, when a batch is converted to a
+DataFrame or an Arrow table and, when they have no nulls, when one is
+built from an Arrow table.
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+from dataclasses import dataclass, fields
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import dataset_export
+
+# Backend recorded for data scored before sentiment backends were pluggable
+DEFAULT_SENTIMENT_BACKEND = 'keyword'
+
+
+@dataclass
+class MarketData:
+    """Container for a single day's market snapshot and auxiliary signals."""
+    symbol: str
+    exchange: str
+    date: str
+    open_price: float
+    high_price: float
+    low_price: float
+    close_price: float
+    volume: int
+    daily_return: float
+    volatility: float
+    sma_5: float  # 5-day Simple Moving Average
+    sma_20: float  # 20-day Simple Moving Average
+    rsi: float  # Relative Strength Index
+    news_headlines: List[str]
+    news_sentiment_score: float
+    sentiment_backend: str = DEFAULT_SENTIMENT_BACKEND  # Backend that produced news_sentiment_score
+
+MARKET_DATA_FIELDS = [f.name for f in fields(MarketData)]
+
+# NumPy dtype of every array-backed field ('news_headlines' uses the offsets store)
+FIELD_DTYPES = {
+    'symbol': object, 'exchange': object, 'date': 'datetime64[D]',
+    'open_price': 'float64', 'high_price': 'float64', 'low_price': 'float64',
+    'close_price': 'float64', 'volume': 'int64', 'daily_return': 'float64',
+    'volatility': 'float64', 'sma_5': 'float64', 'sma_20': 'float64', 'rsi': 'float64',
+    'news_sentiment_score': 'float64', 'sentiment_backend': object,
+}
+FLOAT_FIELDS = [name for name, dtype in FIELD_DTYPES.items() if dtype == 'float64']
+
+
+def _column(name):
+    def get(self):
+        value = self._batch.columns[name][self._index]
+        # NumPy scalars come back as Python int/float, like MarketData's fields
+        return value.item() if isinstance(value, np.generic) else value
+    return property(get)
+
+
+class MarketDataRow:
+    """Read-only view of one row of a MarketDataBatch, with MarketData's attributes."""
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: 'MarketDataBatch', index: int):
+        self._batch = batch
+        self._index = index
+
+    symbol = _column('symbol')
+    exchange = _column('exchange')
+    open_price = _column('open_price')
+    high_price = _column('high_price')
+    low_price = _column('low_price')
+    close_price = _column('close_price')
+    volume = _column('volume')
+    daily_return = _column('daily_return')
+    volatility = _column('volatility')
+    sma_5 = _column('sma_5')
+    sma_20 = _column('sma_20')
+    rsi = _column('rsi')
+    news_sentiment_score = _column('news_sentiment_score')
+    sentiment_backend = _column('sentiment_backend')
+
+    @property
+    def date(self) -> str:
+        return str(self._batch.columns['date'][self._index])
+
+    @property
+    def news_headlines(self) -> List[str]:
+        return self._batch.headlines(self._index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in MARKET_DATA_FIELDS}
+
+    def to_market_data(self) -> MarketData:
+        return MarketData(**self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"MarketDataRow({self.symbol!r}, {self.date!r}, close_price={self.close_price!r})"
+
+
+class MarketDataBatch:
+    """Columnar MarketData: one array per field plus an offsets-encoded headline store."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], headline_offsets: np.ndarray, headline_values: np.ndarray):
+        self.columns = columns
+        self.headline_offsets = headline_offsets
+        self.headline_values = headline_values
+
+    def __len__(self) -> int:
+        return len(self.columns['date'])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield MarketDataRow(self, i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return self.take(np.arange(start, stop, step))
+            stop = max(start, stop)
+            # Views: the headline values are shared and the offsets keep their absolute positions
+            return MarketDataBatch(
+                {name: col[start:stop] for name, col in self.columns.items()},
+                self.headline_offsets[start:stop + 1],
+                self.headline_values
+            )
+        index = int(key)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('MarketDataBatch index out of range')
+        return MarketDataRow(self, index)
+
+    @property
+    def extra_fields(self) -> List[str]:
+        """Indicator columns beyond the MarketData fields."""
+        return [name for name in self.columns if name not in FIELD_DTYPES]
+
+    def __repr__(self) -> str:
+        return f"MarketDataBatch({len(self)} rows, {len(self.headline_values)} headlines)"
+
+    def headlines(self, index: int) -> List[str]:
+        """Headlines of row `index` as a new list."""
+        return self.headline_values[self.headline_offsets[index]:self.headline_offsets[index + 1]].tolist()
+
+    def take(self, indices) -> 'MarketDataBatch':
+        """A new batch with the rows at `indices` (copies)."""
+        indices = np.asarray(indices, dtype='int64')
+        starts = self.headline_offsets[indices]
+        counts = self.headline_offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype='int64')
+        np.cumsum(counts, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], counts) + np.arange(offsets[-1])
+        return MarketDataBatch(
+            {name: col[indices] for name, col in self.columns.items()},
+            offsets,
+            self.headline_values[positions]
+        )
+
+    @classmethod
+    def _from_headline_lists(cls, columns: Dict[str, np.ndarray], headline_lists: Iterable) -> 'MarketDataBatch':
+        headline_lists = [h if h else () for h in headline_lists]
+        offsets = np.zeros(len(headline_lists) + 1, dtype='int64')
+        np.cumsum([len(h) for h in headline_lists], out=offsets[1:])
+        values = np.empty(offsets[-1], dtype=object)
+        values[:] = list(chain.from_iterable(headline_lists))
+        return cls(columns, offsets, values)
+
+    @classmethod
+    def from_records(cls, records: Iterable) -> 'MarketDataBatch':
+        """Build a batch from MarketData objects, row views or row dicts."""
+        records = list(records)
+        get = (lambda r, name: r.get(name)) if records and isinstance(records[0], dict) else \
+            (lambda r, name: getattr(r, name, None))
+        columns = {}
+        for name, dtype in FIELD_DTYPES.items():
+            values = [get(r, name) for r in records]
+            if name == 'volume':
+                values = [0 if v is None or pd.isna(v) else int(v) for v in values]
+            elif name == 'sentiment_backend':
+                values = [v or DEFAULT_SENTIMENT_BACKEND for v in values]
+            columns[name] = np.array(values, dtype=dtype)
+        return cls._from_headline_lists(columns, (get(r, 'news_headlines') for r in records))
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> 'MarketDataBatch':
+        """
+        Build a batch from a DataFrame with MARKET_DATA_FIELDS columns (e.g. a
+        curated frame). Numeric columns already of the right dtype are shared;
+        any other numeric columns are kept as extra float columns.
+        """
+        columns = {}
+        for name, dtype in FIELD_DTYPES.items():
+            if name == 'date':
+                columns[name] = pd.to_datetime(frame[name]).to_numpy().astype('datetime64[D]')
+            elif name == 'sentiment_backend':
+                columns[name] = np.full(len(frame), DEFAULT_SENTIMENT_BACKEND, dtype=object)
+                if name in frame:
+                    columns[name][:] = frame[name].fillna(DEFAULT_SENTIMENT_BACKEND).to_numpy(dtype=object)
+            else:
+                columns[name] = frame[name].to_numpy(dtype=dtype)
+        for name in frame.columns:
+            if name not in columns and name != 'news_headlines' and pd.api.types.is_numeric_dtype(frame[name]):
+                columns[name] = frame[name].to_numpy(dtype='float64')
+        return cls._from_headline_lists(columns, frame['news_headlines'].tolist())
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        DataFrame in curated-frame layout (dates as 'YYYY-MM-DD', headlines as
+        lists) plus any extra columns. Numeric columns share memory with the
+        batch; pass `columns` to skip building the date and headline columns
+        when they are not needed.
+        """
+        columns = columns or MARKET_DATA_FIELDS + self.extra_fields
+        data = {}
+        for name in columns:
+            if name == 'news_headlines':
+                data[name] = [self.headlines(i) for i in range(len(self))]
+            elif name == 'date':
+                data[name] = np.datetime_as_string(self.columns['date'], unit='D')
+            else:
+                data[name] = self.columns[name]
+        return pd.DataFrame(data, columns=columns, copy=False)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Row dicts for storage, extra columns included: NaN becomes None and headlines are lists."""
+        data = {name: self.columns[name].tolist() for name in ('symbol', 'exchange', 'volume', 'sentiment_backend')}
+        data['date'] = np.datetime_as_string(self.columns['date'], unit='D').tolist()
+        names = MARKET_DATA_FIELDS + self.extra_fields
+        for name in FLOAT_FIELDS + self.extra_fields:
+            col = self.columns[name]
+            data[name] = np.where(np.isnan(col), None, col).tolist()
+        data['news_headlines'] = [self.headlines(i) for i in range(len(self))]
+        return [dict(zip(names, values)) for values in zip(*(data[name] for name in names))]
+
+    def to_arrow(self) -> 'dataset_export.pa.Table':
+        """Arrow table with the MARKET_DATA_COLUMNS schema; NaN becomes null (needs pyarrow)."""
+        pa = dataset_export.pa
+        schema = dataset_export.arrow_schema(dataset_export.MARKET_DATA_COLUMNS)
+        arrays = []
+        for field in schema:
+            if field.name == 'news_headlines':
+                values = pa.array(self.headline_values, pa.string())
+                offsets = pa.array(self.headline_offsets.astype('int32'))
+                arrays.append(pa.ListArray.from_arrays(offsets, values))
+            else:
+                arrays.append(pa.array(self.columns[field.name], field.type, from_pandas=True))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    @classmethod
+    def from_arrow(cls, table) -> 'MarketDataBatch':
+        """
+        Build a batch from a table with the MARKET_DATA_COLUMNS schema. Nulls
+        become NaN (0 for volume); null-free numeric columns are not copied.
+        """
+        pa = dataset_export.pa
+        table = table.combine_chunks()
+        columns = {}
+        for name, dtype in FIELD_DTYPES.items():
+            if name not in table.column_names:
+                # Tables written before the field existed
+                columns[name] = np.full(table.num_rows, DEFAULT_SENTIMENT_BACKEND, dtype=object)
+                continue
+            arr = table.column(name).chunk(0) if table.num_rows else pa.array([], table.schema.field(name).type)
+            if name == 'volume':
+                arr = arr.fill_null(0)
+            elif name == 'sentiment_backend':
+                arr = arr.fill_null(DEFAULT_SENTIMENT_BACKEND)
+            columns[name] = arr.to_numpy(zero_copy_only=False).astype(dtype, copy=False)
+        headlines = table.column('news_headlines')
+        headlines = headlines.chunk(0) if table.num_rows else pa.array([], headlines.type)
+        offsets = headlines.offsets.to_numpy().astype('int64')
+        values = np.empty(len(headlines.values), dtype=object)
+        values[:] = headlines.values.to_pylist()
+        return cls(columns, offsets, values)
+
+    @classmethod
+    def concat(cls, batches: List['MarketDataBatch']) -> 'MarketDataBatch':
+        """Stack several batches (e.g. one per symbol) into one; extra columns must match."""
+        if not batches:
+            return cls.from_records([])
+        columns = {name: np.concatenate([b.columns[name] for b in batches]) for name in batches[0].columns}
+        offsets, values, total = [np.zeros(1, dtype='int64')], [], 0
+        for b in batches:
+            start, stop = b.headline_offsets[0], b.headline_offsets[-1]
+            offsets.append(b.headline_offsets[1:] - start + total)
+            values.append(b.headline_values[start:stop])
+            total += stop - start
+        return cls(columns, np.concatenate(offsets), np.concatenate(values))
+
+
+def as_batch(data) -> MarketDataBatch:
+    """Return `data` as a MarketDataBatch (lists of MarketData or row dicts are converted)."""
+    return data if isinstance(data, MarketDataBatch) else MarketDataBatch.from_records(data)
@@ -1,15 +1,12 @@
+import inspect
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, Any, List, Optional, Tuple
 
-# Traditional models
-from statsmodels.tsa.arima.model import ARIMA
-
-# Neural model (Keras)
-from tensorflow.keras.models import Sequential, Model
-from tensorflow.keras.layers import LSTM, Dense, Input, LayerNormalization, Dropout, MultiHeadAttention
-from tensorflow.keras.optimizers import Adam
-from tensorflow.keras.callbacks import EarlyStopping
+# statsmodels (ARIMA) and TensorFlow/Keras (LSTM, Transformer) take seconds
+# to import, so they are imported inside the functions that use them. Code
+# that only needs moving averages or metrics never pays for them.
 
 
 def train_test_split_series(series: pd.Series, test_size: int = 10) -> Tuple[pd.Series, pd.Series]:
@@ -29,12 +26,43 @@ def calculate_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float
     return {"rmse": rmse, "mae": mae, "mape": mape}
 
 
+def sliding_windows(sequence: np.ndarray, lookback: int, stride: int = 1, target_col: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build supervised (X, y) training pairs as zero-copy strided views.
+
+    `sequence` may be 1-D (n,) or 2-D (n, features). X has shape
+    (windows, lookback, features) and y holds the `target_col` value that
+    immediately follows each window. Both share memory with `sequence`.
+    """
+    arr = np.asarray(sequence)
+    if arr.ndim == 1:
+        arr = arr[:, None]
+    lookback = int(lookback)
+    stride = max(1, int(stride))
+    n_rows, n_features = arr.shape
+    if lookback < 1 or n_rows <= lookback:
+        return np.empty((0, max(lookback, 0), n_features), dtype=arr.dtype), np.empty((0,), dtype=arr.dtype)
+    # Drop the last row so every window has a following target value
+    windows = sliding_window_view(arr[:-1], lookback, axis=0)[::stride]
+    X = windows.transpose(0, 2, 1)
+    y = arr[lookback::stride, target_col]
+    return X, y
+
+
 # ---------- Class-based API ----------
 
 class ForecasterBase:
     def fit(self, train_series: pd.Series) -> None:
         raise NotImplementedError
 
+    def get_params(self) -> Dict[str, Any]:
+        """Return the constructor hyperparameters of this forecaster."""
+        params: Dict[str, Any] = {}
+        for name in inspect.signature(type(self).__init__).parameters:
+            if name != 'self' and hasattr(self, name):
+                params[name] = getattr(self, name)
+        return params
+
     def predict(self, horizon: int) -> List[float]:
         raise NotImplementedError
 
@@ -75,6 +103,7 @@ class ARIMAForecaster(ForecasterBase):
         self._fit_result = None
 
     def fit(self, train_series: pd.Series) -> None:
+        from statsmodels.tsa.arima.model import ARIMA
         model = ARIMA(train_series.values, order=self.order)
         self._fit_result = model.fit()
 
@@ -85,17 +114,40 @@ class ARIMAForecaster(ForecasterBase):
         return preds.astype(float).tolist()
 
 
-class LSTMForecaster(ForecasterBase):
-    def __init__(self, lookback: int = 10, epochs: int = 50, batch_size: int = 16, lr: float = 0.01):
-        self.lookback = int(lookback)
-        self.epochs = int(epochs)
-        self.batch_size = int(batch_size)
-        self.lr = float(lr)
-        self.min_v: float = 0.0
-        self.max_v: float = 1.0
-        self.model = None
-        self.train_scaled: Optional[np.ndarray] = None
-        self.train_all_scaled: Optional[np.ndarray] = None
+def _seed_window(history: np.ndarray, lookback: int) -> np.ndarray:
+    """Return the last `lookback` values, edge-padding short histories."""
+    window_seq = np.asarray(history, dtype='float32')[-lookback:]
+    if len(window_seq) < lookback:
+        window_seq = np.pad(window_seq, (lookback - len(window_seq), 0), 'edge')
+    return window_seq
+
+
+def compile_rollout(model, lookback: int):
+    """
+    Compile an autoregressive multi-step rollout of a one-step `model`.
+
+    The returned tf.function takes a (batch, lookback, 1) float32 window
+    tensor and an int32 horizon, runs every step in one graph by calling
+    the model with training=False, and returns a (batch, horizon) tensor.
+    """
+    import tensorflow as tf
+
+    @tf.function(input_signature=[
+        tf.TensorSpec(shape=[None, lookback, 1], dtype=tf.float32),
+        tf.TensorSpec(shape=[], dtype=tf.int32)
+    ])
+    def rollout(windows, horizon):
+        preds = tf.TensorArray(tf.float32, size=horizon)
+        for step in tf.range(horizon):
+            yhat = tf.reshape(model(windows, training=False), [-1, 1])
+            preds = preds.write(step, yhat[:, 0])
+            windows = tf.concat([windows[:, 1:, :], yhat[:, :, tf.newaxis]], axis=1)
+        return tf.transpose(preds.stack())
+    return rollout
+
+
+class _NeuralForecaster(ForecasterBase):
+    """Shared min-max scaling and compiled rollout for Keras forecasters."""
 
     def _scale_fit(self, arr: np.ndarray) -> np.ndarray:
         self.min_v = float(np.min(arr))
@@ -111,11 +163,62 @@ class LSTMForecaster(ForecasterBase):
         denom = (self.max_v - self.min_v) if (self.max_v - self.min_v) != 0 else 1.0
         return arr * denom + self.min_v
 
+    def _rollout(self, windows: np.ndarray, horizon: int) -> np.ndarray:
+        if self._rollout_fn is None:
+            self._rollout_fn = compile_rollout(self.model, self.lookback)
+        import tensorflow as tf
+        x = tf.convert_to_tensor(windows.reshape((-1, self.lookback, 1)), dtype=tf.float32)
+        return self._rollout_fn(x, tf.constant(int(horizon), dtype=tf.int32)).numpy()
+
+    def predict(self, horizon: int) -> List[float]:
+        if self.model is None or int(horizon) <= 0:
+            return []
+        history = self.train_all_scaled if self.train_all_scaled is not None else np.zeros(1, dtype='float32')
+        preds_scaled = self._rollout(_seed_window(history, self.lookback), horizon)[0]
+        preds = self._inv_scale(preds_scaled)
+        return preds.astype(float).tolist()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Compiled tf.functions are not picklable; they are rebuilt on demand
+        state = self.__dict__.copy()
+        state['_rollout_fn'] = None
+        return state
+
+    def predict_batch(self, histories: List[Any], horizon: int) -> List[List[float]]:
+        """
+        Roll out many price histories (symbols or scenarios) in one call.
+
+        Each history is given in price units and scaled with the fitted
+        min/max before its last `lookback` values seed the rollout.
+        """
+        if self.model is None or int(horizon) <= 0 or not histories:
+            return [[] for _ in histories]
+        windows = np.stack([_seed_window(self._scale(np.asarray(h, dtype='float32')), self.lookback) for h in histories])
+        preds = self._inv_scale(self._rollout(windows, horizon))
+        return [row.astype(float).tolist() for row in preds]
+
+
+class LSTMForecaster(_NeuralForecaster):
+    def __init__(self, lookback: int = 10, epochs: int = 50, batch_size: int = 16, lr: float = 0.01):
+        self.lookback = int(lookback)
+        self.epochs = int(epochs)
+        self.batch_size = int(batch_size)
+        self.lr = float(lr)
+        self.min_v: float = 0.0
+        self.max_v: float = 1.0
+        self.model = None
+        self.train_scaled: Optional[np.ndarray] = None
+        self.train_all_scaled: Optional[np.ndarray] = None
+        self._rollout_fn = None
+
     def fit(self, train_series: pd.Series) -> None:
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense
+        from tensorflow.keras.optimizers import Adam
+        from tensorflow.keras.callbacks import EarlyStopping
         train_values = train_series.values.astype('float32')
         train_scaled = self._scale_fit(train_values)
-        X_train, y_train = _create_supervised(train_scaled, self.lookback)
-        X_train = X_train.reshape((X_train.shape[0], X_train.shape[1], 1)) if len(X_train) > 0 else X_train
+        X_train, y_train = sliding_windows(train_scaled, self.lookback)
         model = Sequential([
             LSTM(32, input_shape=(self.lookback, 1)),
             Dense(1)
@@ -126,25 +229,10 @@ class LSTMForecaster(ForecasterBase):
             model.fit(X_train, y_train, epochs=self.epochs, batch_size=self.batch_size, verbose=0, callbacks=callbacks)
         self.model = model
         self.train_all_scaled = train_scaled
-
-    def predict(self, horizon: int) -> List[float]:
-        if self.model is None:
-            return []
-        history = list(self.train_all_scaled) if self.train_all_scaled is not None else []
-        preds_scaled: List[float] = []
-        for _ in range(max(0, int(horizon))):
-            window_seq = np.array(history[-self.lookback:]) if len(history) >= self.lookback else np.array(history)
-            if len(window_seq) < self.lookback:
-                window_seq = np.pad(window_seq, (self.lookback - len(window_seq), 0), 'edge')
-            x = window_seq.reshape((1, self.lookback, 1))
-            yhat = float(self.model.predict(x, verbose=0)[0][0])
-            preds_scaled.append(yhat)
-            history.append(yhat)
-        preds = self._inv_scale(np.array(preds_scaled))
-        return preds.astype(float).tolist()
+        self._rollout_fn = None
 
 
-class TransformerForecaster(ForecasterBase):
+class TransformerForecaster(_NeuralForecaster):
     def __init__(self, lookback: int = 24, d_model: int = 32, num_heads: int = 2, ff_dim: int = 64, epochs: int = 40, batch_size: int = 16, dropout: float = 0.1, lr: float = 0.005):
         self.lookback = int(lookback)
         self.d_model = int(d_model)
@@ -158,29 +246,23 @@ class TransformerForecaster(ForecasterBase):
         self.max_v: float = 1.0
         self.model = None
         self.train_all_scaled: Optional[np.ndarray] = None
-
-    def _scale_fit(self, arr: np.ndarray) -> np.ndarray:
-        self.min_v = float(np.min(arr))
-        self.max_v = float(np.max(arr))
-        denom = (self.max_v - self.min_v) if (self.max_v - self.min_v) != 0 else 1.0
-        return (arr - self.min_v) / denom
-
-    def _inv_scale(self, arr: np.ndarray) -> np.ndarray:
-        denom = (self.max_v - self.min_v) if (self.max_v - self.min_v) != 0 else 1.0
-        return arr * denom + self.min_v
+        self._rollout_fn = None
 
     def fit(self, train_series: pd.Series) -> None:
+        from tensorflow.keras.models import Model
+        from tensorflow.keras.layers import Dense, Input, LayerNormalization, Dropout, MultiHeadAttention
+        from tensorflow.keras.optimizers import Adam
+        from tensorflow.keras.callbacks import EarlyStopping
         train_values = train_series.values.astype('float32')
         train_scaled = self._scale_fit(train_values)
-        X_train, y_train = _create_supervised(train_scaled, self.lookback)
-        X_train = X_train.reshape((X_train.shape[0], X_train.shape[1], 1)) if len(X_train) > 0 else X_train
+        X_train, y_train = sliding_windows(train_scaled, self.lookback)
 
         inp = Input(shape=(self.lookback, 1))
         x = Dense(self.d_model)(inp)
         attn_out = MultiHeadAttention(num_heads=self.num_heads, key_dim=self.d_model)(x, x)
         x = LayerNormalization(epsilon=1e-6)(x + attn_out)
-        ff = Sequential([Dense(self.ff_dim, activation='relu'), Dense(self.d_model)])
-        x = LayerNormalization(epsilon=1e-6)(x + ff(x))
+        ff = Dense(self.d_model)(Dense(self.ff_dim, activation='relu')(x))
+        x = LayerNormalization(epsilon=1e-6)(x + ff)
         x = Dropout(self.dropout)(x)
         out = Dense(1)(x[:, -1, :])
         model = Model(inputs=inp, outputs=out)
@@ -190,41 +272,92 @@ class TransformerForecaster(ForecasterBase):
             model.fit(X_train, y_train, epochs=self.epochs, batch_size=self.batch_size, verbose=0, callbacks=callbacks)
         self.model = model
         self.train_all_scaled = train_scaled
-
-    def predict(self, horizon: int) -> List[float]:
-        if self.model is None:
-            return []
-        history = list(self.train_all_scaled) if self.train_all_scaled is not None else []
-        preds_scaled: List[float] = []
-        for _ in range(max(0, int(horizon))):
-            window_seq = np.array(history[-self.lookback:]) if len(history) >= self.lookback else np.array(history)
-            if len(window_seq) < self.lookback:
-                window_seq = np.pad(window_seq, (self.lookback - len(window_seq), 0), 'edge')
-            x_in = window_seq.reshape((1, self.lookback, 1))
-            yhat = float(self.model.predict(x_in, verbose=0)[0])
-            preds_scaled.append(yhat)
-            history.append(yhat)
-        preds = self._inv_scale(np.array(preds_scaled))
-        return preds.astype(float).tolist()
+        self._rollout_fn = None
+
+
+# Accepted `weighting` values for ensembles
+ENSEMBLE_WEIGHTINGS = ('equal', 'inverse_rmse')
+
+
+def check_weighting(weighting: str) -> None:
+    """Raise ValueError unless `weighting` is one of ENSEMBLE_WEIGHTINGS."""
+    if weighting not in ENSEMBLE_WEIGHTINGS:
+        raise ValueError(f"Unknown ensemble weighting '{weighting}'; expected one of {', '.join(ENSEMBLE_WEIGHTINGS)}")
+
+
+def inverse_rmse_weights(eval_results: List[Dict[str, Any]]) -> List[float]:
+    """
+    Normalised 1/RMSE weights from a list of `ForecasterBase.evaluate` outputs.
+
+    Members whose RMSE is not finite (e.g. a failed fit) get weight 0; if no
+    member has a finite RMSE, all are weighted equally.
+    """
+    if not eval_results:
+        return []
+    rmse = np.array([float(r['metrics']['rmse']) for r in eval_results], dtype='float64')
+    finite = np.isfinite(rmse)
+    if not finite.any():
+        return [1.0 / len(rmse)] * len(rmse)
+    inv = np.where(finite, 1.0 / np.maximum(np.where(finite, rmse, 1.0), 1e-8), 0.0)
+    return (inv / inv.sum()).astype(float).tolist()
+
+
+def combine_forecasts(preds_list: List[List[float]], weights: Optional[List[float]] = None) -> List[float]:
+    """
+    Average member forecasts (optionally weighted), truncated to the shortest.
+
+    Members with weight 0 are left out entirely, so their values (possibly
+    NaN) neither count nor shorten the result.
+    """
+    if not preds_list:
+        return []
+    if weights is not None:
+        w = np.asarray(weights, dtype='float64')
+        if len(w) != len(preds_list) or not np.all(np.isfinite(w)) or w.sum() <= 0:
+            raise ValueError("Ensemble weights must match the members and sum to a positive value")
+        preds_list = [p for p, wi in zip(preds_list, w) if wi != 0]
+        w = w[w != 0]
+    # Align lengths
+    min_len = min(len(p) for p in preds_list)
+    stacked = np.array([p[:min_len] for p in preds_list], dtype='float64')
+    if weights is None:
+        combined = np.mean(stacked, axis=0)
+    else:
+        combined = np.average(stacked, axis=0, weights=w)
+    return combined.astype(float).tolist()
 
 
 class EnsembleAverageForecaster(ForecasterBase):
-    def __init__(self, forecasters: List[ForecasterBase]):
+    def __init__(self, forecasters: List[ForecasterBase], weights: Optional[List[float]] = None, prefitted: bool = False):
         self.forecasters = forecasters
+        self.weights = [float(w) for w in weights] if weights is not None else None
+        self.prefitted = bool(prefitted)
+
+    @classmethod
+    def from_fitted(cls, forecasters: List[ForecasterBase], eval_results: Optional[List[Dict[str, Any]]] = None,
+                    weighting: str = 'equal') -> 'EnsembleAverageForecaster':
+        """
+        Wrap already-fitted members without refitting them.
+
+        With weighting='inverse_rmse', members are weighted by 1/RMSE taken
+        from their `evaluate` results (same order as `forecasters`).
+        """
+        check_weighting(weighting)
+        weights = None
+        if weighting == 'inverse_rmse':
+            if not eval_results or len(eval_results) != len(forecasters):
+                raise ValueError("inverse_rmse weighting needs one evaluate() result per member")
+            weights = inverse_rmse_weights(eval_results)
+        return cls(forecasters, weights=weights, prefitted=True)
 
     def fit(self, train_series: pd.Series) -> None:
+        if self.prefitted:
+            return
         for f in self.forecasters:
             f.fit(train_series)
 
     def predict(self, horizon: int) -> List[float]:
-        preds_list = [f.predict(horizon) for f in self.forecasters]
-        if not preds_list:
-            return []
-        # Align lengths
-        min_len = min(len(p) for p in preds_list)
-        preds_list = [p[:min_len] for p in preds_list]
-        avg = np.mean(np.array(preds_list), axis=0)
-        return avg.astype(float).tolist()
+        return combine_forecasts([f.predict(horizon) for f in self.forecasters], self.weights)
 
 def moving_average_forecast(series: pd.Series, window: int = 5) -> Dict[str, Any]:
     train, test = train_test_split_series(series)
@@ -247,6 +380,7 @@ def moving_average_forecast(series: pd.Series, window: int = 5) -> Dict[str, Any
 
 
 def arima_forecast(series: pd.Series, order: Tuple[int, int, int] = (1, 1, 1)) -> Dict[str, Any]:
+    from statsmodels.tsa.arima.model import ARIMA
     train, test = train_test_split_series(series)
     model = ARIMA(train.values, order=order)
     model_fit = model.fit()
@@ -261,16 +395,27 @@ def arima_forecast(series: pd.Series, order: Tuple[int, int, int] = (1, 1, 1)) -
     }
 
 
-def _create_supervised(sequence: np.ndarray, lookback: int) -> Tuple[np.ndarray, np.ndarray]:
-    X, y = [], []
-    for i in range(len(sequence) - lookback):
-        X.append(sequence[i:i+lookback])
-        y.append(sequence[i+lookback])
-    return np.array(X), np.array(y)
+def _one_step_predictions(model, train_scaled: np.ndarray, test_scaled: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    Predict each test point from the actual values that precede it.
+
+    All windows are known up front, so they are built as strided views and
+    scored with one direct model call instead of one predict() per step.
+    """
+    pad = max(0, lookback - len(train_scaled))
+    full = np.pad(np.concatenate([train_scaled, test_scaled]).astype('float32'), (pad, 0), 'edge')
+    X_all, _ = sliding_windows(full, lookback)
+    X_test = np.ascontiguousarray(X_all[len(train_scaled) + pad - lookback:])
+    if len(X_test) == 0:
+        return np.empty((0,), dtype='float32')
+    return np.asarray(model(X_test, training=False)).reshape(-1)
 
 
 def lstm_forecast(series: pd.Series, lookback: int = 10, epochs: int = 50, batch_size: int = 16) -> Dict[str, Any]:
-    values = series.values.astype('float32')
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense
+    from tensorflow.keras.optimizers import Adam
+    from tensorflow.keras.callbacks import EarlyStopping
     train_vals, test_vals = train_test_split_series(series)
     train_values = train_vals.values.astype('float32')
     test_values = test_vals.values.astype('float32')
@@ -287,10 +432,9 @@ def lstm_forecast(series: pd.Series, lookback: int = 10, epochs: int = 50, batch
     train_scaled = scale(train_values)
     test_scaled = scale(test_values)
 
-    X_train, y_train = _create_supervised(train_scaled, lookback)
+    X_train, y_train = sliding_windows(train_scaled, lookback)
     # To predict the next len(test) points, we roll-forward from the tail
     # For evaluation alignment, we generate one-step ahead predictions
-    X_train = X_train.reshape((X_train.shape[0], X_train.shape[1], 1))
 
     model = Sequential([
         LSTM(32, input_shape=(lookback, 1)),
@@ -301,19 +445,9 @@ def lstm_forecast(series: pd.Series, lookback: int = 10, epochs: int = 50, batch
     if len(X_train) > 0:
         model.fit(X_train, y_train, epochs=epochs, batch_size=batch_size, verbose=0, callbacks=callbacks)
 
-    # Rolling one-step predictions over test horizon
-    history = list(scale(values))
-    preds_scaled: List[float] = []
-    for _ in range(len(test_values)):
-        window_seq = np.array(history[-lookback:]) if len(history) >= lookback else np.array(history)
-        if len(window_seq) < lookback:
-            window_seq = np.pad(window_seq, (lookback - len(window_seq), 0), 'edge')
-        x = window_seq.reshape((1, lookback, 1))
-        yhat = float(model.predict(x, verbose=0)[0][0])
-        preds_scaled.append(yhat)
-        history.append(test_scaled[len(preds_scaled)-1])
-
-    preds = inv_scale(np.array(preds_scaled))
+    # One-step predictions over the test horizon, scored in a single batch
+    preds_scaled = _one_step_predictions(model, train_scaled, test_scaled, lookback)
+    preds = inv_scale(preds_scaled)
     metrics = calculate_metrics(test_values, preds)
     return {
         'model': 'LSTM',
@@ -325,7 +459,10 @@ def lstm_forecast(series: pd.Series, lookback: int = 10, epochs: int = 50, batch
 
 
 def transformer_forecast(series: pd.Series, lookback: int = 24, d_model: int = 32, num_heads: int = 2, ff_dim: int = 64, epochs: int = 40, batch_size: int = 16, dropout: float = 0.1) -> Dict[str, Any]:
-    values = series.values.astype('float32')
+    from tensorflow.keras.models import Model
+    from tensorflow.keras.layers import Dense, Input, LayerNormalization, Dropout, MultiHeadAttention
+    from tensorflow.keras.optimizers import Adam
+    from tensorflow.keras.callbacks import EarlyStopping
     train_vals, test_vals = train_test_split_series(series)
     train_values = train_vals.values.astype('float32')
     test_values = test_vals.values.astype('float32')
@@ -342,8 +479,7 @@ def transformer_forecast(series: pd.Series, lookback: int = 24, d_model: int = 3
     train_scaled = scale(train_values)
     test_scaled = scale(test_values)
 
-    X_train, y_train = _create_supervised(train_scaled, lookback)
-    X_train = X_train.reshape((X_train.shape[0], X_train.shape[1], 1))
+    X_train, y_train = sliding_windows(train_scaled, lookback)
 
     # Build a minimal Transformer encoder block for regression
     inp = Input(shape=(lookback, 1))
@@ -351,8 +487,8 @@ def transformer_forecast(series: pd.Series, lookback: int = 24, d_model: int = 3
     x = Dense(d_model)(inp)
     attn_out = MultiHeadAttention(num_heads=num_heads, key_dim=d_model)(x, x)
     x = LayerNormalization(epsilon=1e-6)(x + attn_out)
-    ff = Sequential([Dense(ff_dim, activation='relu'), Dense(d_model)])
-    x = LayerNormalization(epsilon=1e-6)(x + ff(x))
+    ff = Dense(d_model)(Dense(ff_dim, activation='relu')(x))
+    x = LayerNormalization(epsilon=1e-6)(x + ff)
     x = Dropout(dropout)(x)
     # Global average over time then dense to 1
     x = Dense(1)(x[:, -1, :])
@@ -362,19 +498,9 @@ def transformer_forecast(series: pd.Series, lookback: int = 24, d_model: int = 3
     if len(X_train) > 0:
         model.fit(X_train, y_train, epochs=epochs, batch_size=batch_size, verbose=0, callbacks=callbacks)
 
-    # Rolling one-step predictions
-    history = list(scale(values))
-    preds_scaled: List[float] = []
-    for _ in range(len(test_values)):
-        window_seq = np.array(history[-lookback:]) if len(history) >= lookback else np.array(history)
-        if len(window_seq) < lookback:
-            window_seq = np.pad(window_seq, (lookback - len(window_seq), 0), 'edge')
-        x_in = window_seq.reshape((1, lookback, 1))
-        yhat = float(model.predict(x_in, verbose=0)[0])
-        preds_scaled.append(yhat)
-        history.append(test_scaled[len(preds_scaled)-1])
-
-    preds = inv_scale(np.array(preds_scaled))
+    # One-step predictions, scored in a single batch
+    preds_scaled = _one_step_predictions(model, train_scaled, test_scaled, lookback)
+    preds = inv_scale(preds_scaled)
     metrics = calculate_metrics(test_values, preds)
     return {
         'model': 'Transformer',
@@ -0,0 +1,186 @@
+import os
+from concurrent.futures import as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ml_models.forecasting import (
+    ForecasterBase,
+    MovingAverageForecaster,
+    ARIMAForecaster,
+    LSTMForecaster,
+    TransformerForecaster,
+    calculate_metrics,
+    check_weighting,
+    combine_forecasts,
+    inverse_rmse_weights
+)
+from ml_models.registry import get_default_registry
+
+
+# Models run in this order regardless of how they were requested
+MODEL_ORDER = ['ma', 'arima', 'lstm', 'transformer']
+
+
+def selected_models(models: List[str]) -> List[str]:
+    """Return the known model keys from `models`, in canonical order."""
+    return [key for key in MODEL_ORDER if key in models]
+
+
+def configure_worker(threads: int) -> None:
+    """
+    Process-pool initializer capping the threads one worker may use.
+
+    Several models train at once in parallel mode, so each worker gets a
+    slice of the cores instead of TensorFlow/BLAS sizing their pools to the
+    whole machine.
+    """
+    threads = max(1, int(threads))
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+        os.environ[var] = str(threads)
+    # A worker trains one model at a time, so independent ops run one after
+    # another and the thread slice goes to each op
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def build_forecaster(key: str, params: Dict[str, Any]) -> Tuple[str, ForecasterBase]:
+    """
+    Create an unfitted forecaster and its result label from request params.
+
+    `params` uses the /api/forecast/run payload keys (ma_window, arima_order,
+    lstm_lookback, lstm_epochs, transformer_*); missing keys take defaults.
+    """
+    if key == 'ma':
+        return 'moving_average', MovingAverageForecaster(window=int(params.get('ma_window', 5)))
+    if key == 'arima':
+        order = params.get('arima_order', [1, 1, 1])
+        if not isinstance(order, (list, tuple)) or len(order) != 3:
+            order = [1, 1, 1]
+        order = tuple(int(x) for x in order)
+        return f'ARIMA{order}', ARIMAForecaster(order=order)
+    if key == 'lstm':
+        return 'LSTM', LSTMForecaster(
+            lookback=int(params.get('lstm_lookback', 10)),
+            epochs=int(params.get('lstm_epochs', 40))
+        )
+    if key == 'transformer':
+        return 'Transformer', TransformerForecaster(
+            lookback=int(params.get('transformer_lookback', 24)),
+            d_model=int(params.get('transformer_d_model', 32)),
+            num_heads=int(params.get('transformer_heads', 2)),
+            ff_dim=int(params.get('transformer_ff_dim', 64)),
+            epochs=int(params.get('transformer_epochs', 30)),
+            dropout=float(params.get('transformer_dropout', 0.1))
+        )
+    raise ValueError(f"Unknown model: {key}")
+
+
+def run_model_task(symbol: str, key: str, params: Dict[str, Any], train_series: pd.Series,
+                   test_series: pd.Series, preview_days: int) -> Dict[str, Any]:
+    """
+    Fit (through the model registry), evaluate and preview a single model.
+
+    Defined at module level and returning plain data so it can run in a
+    worker process.
+    """
+    label, forecaster = build_forecaster(key, params)
+    forecaster = get_default_registry().get_or_fit(symbol, forecaster, train_series)
+    eval_res = forecaster.evaluate(test_series)
+    return {
+        'key': key,
+        'model': label,
+        **eval_res,
+        'preview_values': forecaster.predict(preview_days)
+    }
+
+
+def ensemble_result(member_results: List[Dict[str, Any]], weighting: str = 'equal') -> Dict[str, Any]:
+    """
+    Combine member outputs into an ensemble result without refitting.
+
+    Equivalent to `EnsembleAverageForecaster.from_fitted(...)` over the same
+    members, but works from their returned predictions so members may have
+    been fitted in other processes.
+    """
+    check_weighting(weighting)
+    weights = inverse_rmse_weights(member_results) if weighting == 'inverse_rmse' else None
+    preds = combine_forecasts([r['predicted_values'] for r in member_results], weights)
+    y_true = [float(v) for v in member_results[0]['y_true'][:len(preds)]]
+    return {
+        'key': 'ensemble',
+        'model': 'EnsembleAverage',
+        'weights': weights,
+        'forecast_horizon': len(preds),
+        'predicted_values': preds,
+        'metrics': calculate_metrics(y_true, preds),
+        'y_true': y_true,
+        'preview_values': combine_forecasts([r['preview_values'] for r in member_results], weights)
+    }
+
+
+def run_forecast_models(symbol: str, models: List[str], params: Dict[str, Any], train_series: pd.Series,
+                        test_series: pd.Series, preview_days: int, ensemble: bool = False,
+                        weighting: str = 'equal', executor=None, parallel: bool = False,
+                        on_progress: Optional[Callable[[str, str, Optional[Dict[str, Any]]], None]] = None,
+                        completed: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Run the selected models and optionally their ensemble.
+
+    With an `executor` (e.g. a ProcessPoolExecutor) each model runs there;
+    otherwise it runs inline. `parallel=True` submits every model to the
+    executor at once instead of one after another. `on_progress(key, state,
+    result)` is called with state 'running', 'done' or 'failed' as each model
+    advances. `completed` maps model keys to results of an earlier attempt;
+    those models are not run (or reported) again. Results are returned in
+    MODEL_ORDER either way. With `ensemble`, an unknown `weighting` raises
+    ValueError before any model runs.
+    """
+    def notify(key, state, res=None):
+        if on_progress:
+            on_progress(key, state, res)
+
+    if ensemble:
+        # Fail before any model runs rather than after all of them
+        check_weighting(weighting)
+    keys = selected_models(models)
+    by_key = {key: res for key, res in (completed or {}).items() if key in keys}
+    pending = [key for key in keys if key not in by_key]
+    if parallel and executor is not None and len(pending) > 1:
+        futures = {}
+        for key in pending:
+            futures[executor.submit(run_model_task, symbol, key, params, train_series, test_series, preview_days)] = key
+            notify(key, 'running')
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                by_key[key] = future.result()
+            except Exception:
+                notify(key, 'failed')
+                for other in futures:
+                    other.cancel()
+                raise
+            notify(key, 'done', by_key[key])
+    else:
+        for key in pending:
+            notify(key, 'running')
+            try:
+                if executor is not None:
+                    res = executor.submit(run_model_task, symbol, key, params, train_series, test_series, preview_days).result()
+                else:
+                    res = run_model_task(symbol, key, params, train_series, test_series, preview_days)
+            except Exception:
+                notify(key, 'failed')
+                raise
+            by_key[key] = res
+            notify(key, 'done', res)
+    results = [by_key[key] for key in keys]
+
+    if ensemble and results:
+        notify('ensemble', 'running')
+        res = ensemble_result(results, weighting)
+        results.append(res)
+        notify('ensemble', 'done', res)
+    return results
@@ -6,9 +6,20 @@ from sklearn.metrics import mean_squared_error, r2_score
 import joblib
 import os
 from datetime import datetime
+from market_data import MarketDataBatch, MARKET_DATA_FIELDS
+from features import feature_fields, resolve_features
+
+PRICE_FEATURES = ['open_price', 'high_price', 'low_price', 'close_price', 'volume']
+
+# Feature columns of models saved before the feature list was stored with them
+LEGACY_FEATURES = PRICE_FEATURES + ['daily_return', 'volatility', 'sma_5', 'sma_20', 'rsi', 'news_sentiment_score']
 
 class FinancialPredictor:
-    def __init__(self):
+    def __init__(self, features=None):
+        # Indicator columns follow the same feature specs as the curator (FEATURE_SPEC);
+        # a saved model keeps the columns it was trained on (see load_model)
+        self.configured_features = PRICE_FEATURES + feature_fields(resolve_features(features)) + ['news_sentiment_score']
+        self.feature_columns = list(self.configured_features)
         self.model = None
         self.is_trained = False
         self.model_path = 'backend/ml_models/trained_model.pkl'
@@ -18,8 +29,18 @@ class FinancialPredictor:
         """Load a saved model if present; otherwise create a fresh estimator."""
         try:
             if os.path.exists(self.model_path):
-                self.model = joblib.load(self.model_path)
+                saved = joblib.load(self.model_path)
+                if isinstance(saved, dict):
+                    self.model = saved['model']
+                    self.feature_columns = list(saved['feature_columns'])
+                else:
+                    # Bare estimator from before the feature list was stored with it
+                    self.model = saved
+                    self.feature_columns = list(LEGACY_FEATURES)
                 self.is_trained = True
+                if self.feature_columns != self.configured_features:
+                    print(f"⚠️ Saved model uses features {self.feature_columns}; "
+                          f"FEATURE_SPEC applies after the next training run")
                 print("✅ Loaded pre-trained model")
             else:
                 self.model = RandomForestRegressor(n_estimators=100, random_state=42)
@@ -29,29 +50,30 @@ class FinancialPredictor:
             self.model = RandomForestRegressor(n_estimators=100, random_state=42)
     
     def prepare_features(self, data):
-        """Transform raw records into a numeric feature matrix."""
+        """
+        Transform raw records into a numeric feature matrix.
+        
+        Missing MarketData fields are filled with 0 (older records); missing
+        extra indicators (e.g. 'ema_12') raise ValueError, since a dataset
+        curated under another FEATURE_SPEC cannot feed this model.
+        """
         try:
-            if isinstance(data, dict) and 'data' in data:
-                # Convert MarketData objects to DataFrame
-                records = data['data']
-                df_data = []
-                
-                for record in records:
-                    if hasattr(record, '__dict__'):
-                        df_data.append(record.__dict__)
-                    else:
-                        df_data.append(record)
-                
-                df = pd.DataFrame(df_data)
+            # Select features for prediction
+            feature_columns = self.feature_columns
+            
+            records = data['data'] if isinstance(data, dict) and 'data' in data else data
+            if isinstance(records, list) and records and not isinstance(records[0], dict):
+                # MarketData objects or batch rows
+                records = MarketDataBatch.from_records(records)
+            if isinstance(records, MarketDataBatch):
+                # Columnar batch: the feature columns are used in place
+                df = records.to_frame(columns=[c for c in feature_columns if c in records.columns])
             else:
-                df = pd.DataFrame(data)
+                df = pd.DataFrame(records)
             
-            # Select features for prediction
-            feature_columns = [
-                'open_price', 'high_price', 'low_price', 'close_price', 'volume',
-                'daily_return', 'volatility', 'sma_5', 'sma_20', 'rsi',
-                'news_sentiment_score'
-            ]
+            missing = [col for col in feature_columns if col not in df.columns and col not in MARKET_DATA_FIELDS]
+            if missing:
+                raise ValueError(f"Data lacks features {missing}; curate it with the model's FEATURE_SPEC")
             
             # Handle missing values
             for col in feature_columns:
@@ -63,6 +85,8 @@ class FinancialPredictor:
             
             return df[feature_columns]
             
+        except ValueError:
+            raise
         except Exception as e:
             print(f"Error preparing features: {e}")
             return None
@@ -72,6 +96,9 @@ class FinancialPredictor:
         try:
             print("🔄 Training model...")
             
+            # A new model is trained on the configured features
+            self.feature_columns = list(self.configured_features)
+            
             # Prepare features
             X = self.prepare_features(training_data)
             if X is None or len(X) < 10:
@@ -164,7 +191,8 @@ class FinancialPredictor:
         """Persist the trained model to the `model_path`."""
         try:
             os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-            joblib.dump(self.model, self.model_path)
+            # The feature list travels with the model so predictions use the same columns
+            joblib.dump({'model': self.model, 'feature_columns': list(self.feature_columns)}, self.model_path)
             print("✅ Model saved successfully")
         except Exception as e:
             print(f"❌ Error saving model: {e}")
@@ -188,10 +216,6 @@ class FinancialPredictor:
         return {
             'is_trained': self.is_trained,
             'model_type': 'RandomForestRegressor',
-            'features': [
-                'open_price', 'high_price', 'low_price', 'close_price', 'volume',
-                'daily_return', 'volatility', 'sma_5', 'sma_20', 'rsi',
-                'news_sentiment_score'
-            ],
+            'features': list(self.feature_columns),
             'last_trained': datetime.now().isoformat() if self.is_trained else None
         }
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import joblib
+import pandas as pd
+
+from ml_models.forecasting import ForecasterBase
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+# Seconds stats() reuses the last disk occupancy before listing the store again
+# (worker processes sharing the directory save models this registry never sees)
+DISK_STATS_TTL = 30.0
+
+
+def describe_forecaster(forecaster: ForecasterBase) -> Dict[str, Any]:
+    """Return a JSON-friendly description (class + hyperparameters) of a forecaster."""
+    params = {}
+    for name, value in forecaster.get_params().items():
+        if isinstance(value, ForecasterBase):
+            value = describe_forecaster(value)
+        elif isinstance(value, (list, tuple)):
+            value = [describe_forecaster(v) if isinstance(v, ForecasterBase) else v for v in value]
+        params[name] = value
+    return {'class': type(forecaster).__name__, 'params': params}
+
+
+def fingerprint_series(series: pd.Series) -> str:
+    """Hash the values and index of a training series."""
+    hashed = pd.util.hash_pandas_object(series, index=True).values
+    return hashlib.sha256(hashed.tobytes()).hexdigest()
+
+
+class ModelRegistry:
+    """
+    Cache of fitted forecasters keyed by symbol, model config and training data.
+
+    Entries live in an in-memory LRU layer backed by an on-disk joblib
+    artifact store. Both layers expire entries older than `max_age_seconds`;
+    the memory layer holds at most `max_memory_entries` models and the disk
+    store is pruned (oldest first) to stay under `max_disk_bytes`.
+    The disk occupancy in `stats()` is kept from the last save or scan,
+    so polling it does not list the store every time.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, max_memory_entries: int = 32,
+                 max_disk_bytes: int = 512 * 1024 * 1024, max_age_seconds: float = 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max(1, int(max_memory_entries))
+        self.max_disk_bytes = int(max_disk_bytes)
+        self.max_age_seconds = float(max_age_seconds)
+        self._memory: "OrderedDict[str, Tuple[float, ForecasterBase]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'memory_hits': 0, 'disk_hits': 0, 'evictions': 0, 'disk_errors': 0}
+        # (entries, bytes, measured_at) of the disk store, or None when unknown
+        self._disk_usage: Optional[Tuple[int, int, float]] = None
+
+    @classmethod
+    def from_env(cls) -> 'ModelRegistry':
+        """Build a registry configured by MODEL_CACHE_* environment variables."""
+        cache_dir = os.getenv('MODEL_CACHE_DIR', DEFAULT_CACHE_DIR)
+        return cls(
+            cache_dir=cache_dir if cache_dir.lower() not in ('', 'none', 'off') else None,
+            max_memory_entries=int(os.getenv('MODEL_CACHE_MAX_ENTRIES', 32)),
+            max_disk_bytes=int(float(os.getenv('MODEL_CACHE_MAX_MB', 512)) * 1024 * 1024),
+            max_age_seconds=float(os.getenv('MODEL_CACHE_MAX_AGE_HOURS', 24)) * 3600
+        )
+
+    def make_key(self, symbol: str, forecaster: ForecasterBase, train_series: pd.Series) -> str:
+        """Derive the cache key from (symbol, class, hyperparameters, series hash)."""
+        payload = json.dumps({
+            'symbol': symbol,
+            'model': describe_forecaster(forecaster),
+            'series': fingerprint_series(train_series)
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[ForecasterBase]:
+        """Return a cached fitted forecaster or None, updating hit/miss counters."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, forecaster = entry
+                if now - stored_at <= self.max_age_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats['hits'] += 1
+                    self._stats['memory_hits'] += 1
+                    return forecaster
+                del self._memory[key]
+                self._stats['evictions'] += 1
+
+        forecaster = self._load_from_disk(key, now)
+        with self._lock:
+            if forecaster is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            self._stats['disk_hits'] += 1
+            self._remember(key, forecaster, now)
+        return forecaster
+
+    def put(self, key: str, forecaster: ForecasterBase) -> None:
+        """Store a fitted forecaster in memory and, when configured, on disk."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, forecaster, now)
+        self._save_to_disk(key, forecaster)
+
+    def get_or_fit(self, symbol: str, forecaster: ForecasterBase, train_series: pd.Series) -> ForecasterBase:
+        """Return a cached fit of `forecaster` for this data, fitting and storing it on a miss."""
+        key = self.make_key(symbol, forecaster, train_series)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        forecaster.fit(train_series)
+        self.put(key, forecaster)
+        return forecaster
+
+    def clear(self) -> None:
+        """Drop all cached models from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+        for path, _, _ in self._disk_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._set_disk_usage(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current cache occupancy."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+            usage = self._disk_usage
+        if usage is None or time.time() - usage[2] > DISK_STATS_TTL:
+            usage = self._set_disk_usage(self._disk_entries())
+        stats['disk_entries'], stats['disk_bytes'] = usage[0], usage[1]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+    # ---------- internals ----------
+
+    def _remember(self, key: str, forecaster: ForecasterBase, stored_at: float) -> None:
+        # Caller holds self._lock
+        self._memory[key] = (stored_at, forecaster)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _set_disk_usage(self, entries) -> Optional[Tuple[int, int, float]]:
+        """Record the occupancy of `entries` (from _disk_entries), or forget it with None."""
+        usage = None if entries is None else (len(entries), sum(size for _, _, size in entries), time.time())
+        with self._lock:
+            self._disk_usage = usage
+        return usage
+
+    def _path_for(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.joblib")
+
+    def _disk_entries(self):
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.joblib'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, st.st_mtime, st.st_size))
+        return entries
+
+    def _load_from_disk(self, key: str, now: float) -> Optional[ForecasterBase]:
+        path = self._path_for(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            if now - os.path.getmtime(path) > self.max_age_seconds:
+                os.remove(path)
+                with self._lock:
+                    self._stats['evictions'] += 1
+                    self._disk_usage = None
+                return None
+            return joblib.load(path)
+        except Exception as e:
+            print(f"⚠️ Failed to load cached model {key[:12]}: {e}")
+            with self._lock:
+                self._stats['disk_errors'] += 1
+            return None
+
+    def _save_to_disk(self, key: str, forecaster: ForecasterBase) -> None:
+        path = self._path_for(key)
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            joblib.dump(forecaster, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Failed to persist model {key[:12]}: {e}")
+            with self._lock:
+                self._stats['disk_errors'] += 1
+            return
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        now = time.time()
+        entries = sorted(self._disk_entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        kept = []
+        for entry in entries:
+            path, mtime, size = entry
+            if now - mtime <= self.max_age_seconds and total <= self.max_disk_bytes:
+                kept.append(entry)
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                kept.append(entry)
+        # The save already listed the store, so stats() gets its occupancy for free
+        self._set_disk_usage(kept)
+        evicted = len(entries) - len(kept)
+        if evicted:
+            with self._lock:
+                self._stats['evictions'] += evicted
+
+
+_default_registry: Optional[ModelRegistry] = None
+
+
+def get_default_registry() -> ModelRegistry:
+    """Return the process-wide registry, creating it from the environment on first use."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry.from_env()
+    return _default_registry
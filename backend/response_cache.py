@@ -0,0 +1,195 @@
+"""
+In-process response cache for read-heavy API endpoints
+
+`ResponseCache` is a TTL + LRU map of rendered responses (or any computed
+value) tagged with the data kinds they were built from ('datasets',
+'prices', 'predictions', 'metadata') and, optionally, a symbol.
+`MongoDB` write paths call `invalidate(kind, symbol)` through a write
+listener, which drops every entry of that kind for the symbol plus every
+entry of that kind that spans all symbols. The TTL bounds staleness for
+writes made by other processes.
+
+`cached_view` wraps a Flask view: 200 responses are stored with a strong
+ETag, and a request whose If-None-Match matches gets an empty 304.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import make_response, request
+
+
+DEFAULT_RESPONSE_TTL = 30.0
+DEFAULT_RESPONSE_ENTRIES = 256
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL/LRU cache keyed by string, with kind/symbol invalidation.
+
+    A ttl of 0 disables the cache (every lookup misses, nothing is stored).
+    """
+
+    def __init__(self, ttl: float = DEFAULT_RESPONSE_TTL, max_entries: int = DEFAULT_RESPONSE_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = float(ttl)
+        self.max_entries = int(max_entries)
+        self._clock = clock
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidate(); values computed across a bump are not stored
+        self.generation = 0
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    @classmethod
+    def from_env(cls) -> 'ResponseCache':
+        """Build the cache from RESPONSE_CACHE_TTL (seconds, 0 disables) and RESPONSE_CACHE_SIZE."""
+        return cls(
+            ttl=float(os.getenv('RESPONSE_CACHE_TTL', DEFAULT_RESPONSE_TTL)),
+            max_entries=int(os.getenv('RESPONSE_CACHE_SIZE', DEFAULT_RESPONSE_ENTRIES))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the live entry for `key` ({'value', 'etag', ...}) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['expires_at'] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry
+
+    def put(self, key: str, value: Any, kinds: Iterable[str], symbol: Optional[str] = None,
+            etag: Optional[str] = None, ttl: Optional[float] = None,
+            generation: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Store `value`; `symbol=None` means the entry depends on every symbol.
+
+        Pass the `generation` read before computing `value` so a value built
+        while a write invalidated the cache is returned but not stored.
+        """
+        entry = {
+            'value': value,
+            'etag': etag,
+            'kinds': frozenset(kinds),
+            'symbol': symbol,
+            'expires_at': self._clock() + (self.ttl if ttl is None else ttl)
+        }
+        if not self.enabled:
+            return entry
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return entry
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], kinds: Iterable[str],
+                   symbol: Optional[str] = None, ttl: Optional[float] = None) -> Any:
+        """Return the cached value for `key`, computing and storing it on a miss."""
+        entry = self.get(key)
+        if entry is not None:
+            return entry['value']
+        generation = self.generation
+        value = compute()
+        self.put(key, value, kinds, symbol=symbol, ttl=ttl, generation=generation)
+        return value
+
+    def invalidate(self, kind: str, symbol: Optional[str] = None) -> int:
+        """
+        Drop entries built from `kind` data for `symbol`.
+
+        Entries spanning all symbols are always dropped; `symbol=None`
+        drops every entry of that kind. Returns the number removed.
+        """
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if kind in entry['kinds'] and (symbol is None or entry['symbol'] in (None, symbol))
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.generation += 1
+            self._stats['invalidations'] += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), ttl=self.ttl)
+
+
+def _request_key() -> str:
+    args = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    return f"{request.method} {request.path}?{args}"
+
+
+def _etag_for(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+def cached_view(cache: ResponseCache, kinds: Iterable[str], symbol_param: Optional[str] = 'symbol',
+                ttl: Optional[float] = None, skip: Callable[[], bool] = lambda: False):
+    """
+    Decorator caching a view's 200 responses in `cache`, keyed by path and query.
+
+    The entry is tagged with `kinds` and the request's `symbol_param` value
+    (absent -> all symbols). Every response carries an ETag; a matching
+    If-None-Match yields 304 without a body. `skip()` returning True
+    bypasses the cache for that request.
+    """
+    kinds = frozenset(kinds)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if skip():
+                return view(*args, **kwargs)
+            key = _request_key()
+            entry = cache.get(key)
+            if entry is None:
+                generation = cache.generation
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                symbol = request.args.get(symbol_param) if symbol_param else None
+                entry = cache.put(
+                    key, (body, response.mimetype), kinds, symbol=symbol,
+                    etag=_etag_for(body), ttl=ttl, generation=generation
+                )
+                cache_status = 'MISS'
+            else:
+                cache_status = 'HIT'
+
+            if request.if_none_match.contains(entry['etag']):
+                response = make_response('', 304)
+            else:
+                body, mimetype = entry['value']
+                response = make_response(body, 200)
+                response.mimetype = mimetype
+            response.set_etag(entry['etag'])
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Cache'] = cache_status
+            return response
+        return wrapper
+    return decorator
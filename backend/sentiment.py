@@ -0,0 +1,515 @@
+"""
+Headline sentiment scoring with pluggable backends
+
+A `SentimentBackend` scores a batch of headlines. For each headline it
+returns a (total, weight) pair, and a group of headlines (one news date)
+scores sum(total) / sum(weight), or 0 when the weights sum to 0:
+- `keyword` (default): the curator's lexicon. Each keyword occurrence adds
+  +1 or -1 to the total and 1 to the weight (substring matches,
+  case-insensitive), so a date scores (positives - negatives) / matches
+- `vader`: VADER compound score per headline, weight 1 (needs
+  `vaderSentiment` or NLTK's VADER lexicon)
+- `transformer[:model]`: a local Hugging Face sentiment pipeline,
+  P(positive) or -P(negative) per headline, weight 1 (needs `transformers`)
+
+`SentimentScorer` wraps a backend with a bounded in-memory memo, an
+optional on-disk `ScoreCache` keyed by backend and headline hash, and an
+optional process pool for large backfills. Headlines scored once, in any
+process or earlier run, are never sent to the backend again.
+
+Because keywords never contain whitespace, a headline's keyword counts
+are the sums of its whitespace-separated tokens' counts, so a batch is
+scored in one pass: all headlines are lowercased and split together, the
+tokens are factorized, one regex scan over the new distinct tokens finds
+those that contain a keyword, each keyword is counted in those tokens
+with `str.count`, and per-headline counts are summed with NumPy.
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import abc
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+POSITIVE_WORDS = (
+    'bullish', 'surge', 'rally', 'gains', 'rise', 'boost', 'strong',
+    'positive', 'growth', 'momentum', 'optimistic', 'buy', 'upgrade'
+)
+
+NEGATIVE_WORDS = (
+    'bearish', 'fall', 'drop', 'decline', 'crash', 'weak', 'sell',
+    'negative', 'pessimistic', 'downgrade', 'concerns', 'risks'
+)
+
+DEFAULT_BACKEND = 'keyword'
+DEFAULT_TRANSFORMER_MODEL = 'distilbert-base-uncased-finetuned-sst-2-english'
+DEFAULT_SCORE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'sentiment.sqlite')
+
+# Entries kept per in-memory memo (tokens, headlines, groups); the oldest are dropped first
+DEFAULT_CACHE_SIZE = 100_000
+
+# Uncached headlines below which a process pool is not worth starting
+POOL_MIN_HEADLINES = 5000
+
+# Token placed between headlines when a batch is split in one call
+_SEPARATOR = '\x00'
+
+
+class _Memo:
+    """Bounded insertion-ordered dict; the oldest entries are evicted first."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.data: Dict = {}
+        self._lock = threading.Lock()
+
+    def update(self, items: Dict) -> None:
+        with self._lock:
+            self.data.update(items)
+            overflow = len(self.data) - self.max_entries
+            if overflow > 0:
+                for key in list(islice(self.data, overflow)):
+                    del self.data[key]
+
+
+class SentimentBackend(abc.ABC):
+    """
+    Batched headline scorer. Subclasses set `name` and implement
+    `score_batch`; heavy models should load on first use, not in __init__.
+    """
+
+    name = 'base'
+
+    @property
+    def cache_namespace(self) -> str:
+        """Key prefix in the score cache; must change whenever scores would."""
+        return self.name
+
+    @abc.abstractmethod
+    def score_batch(self, headlines: List[str]) -> np.ndarray:
+        """(total, weight) per headline as an (n, 2) float array."""
+
+
+class KeywordBackend(SentimentBackend):
+    """Lexicon keyword counts with a compiled pattern and memoized token counts."""
+
+    name = 'keyword'
+
+    def __init__(self, positive_words: Sequence[str] = POSITIVE_WORDS,
+                 negative_words: Sequence[str] = NEGATIVE_WORDS, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.positive_words = tuple(w.lower() for w in positive_words)
+        self.negative_words = tuple(w.lower() for w in negative_words)
+        words = self.positive_words + self.negative_words
+        if not words or any(not w or w != ''.join(w.split()) for w in words):
+            raise ValueError("Sentiment keywords must be non-empty and contain no whitespace")
+        self.cache_size = cache_size
+        self._compile()
+
+    def _compile(self) -> None:
+        # Longest first so the alternation never stops at a shorter keyword
+        alternation = '|'.join(re.escape(w) for w in sorted(set(self.positive_words + self.negative_words),
+                                                           key=len, reverse=True))
+        # Finds which tokens contain any keyword; one scan over all new tokens of a batch.
+        # It only selects tokens: keywords are counted in them one by one, like the original loop
+        self._any_keyword = re.compile(alternation)
+        self._tokens = _Memo(self.cache_size)
+
+    def __getstate__(self):
+        # Compiled patterns and the token memo are rebuilt in worker processes
+        return {'positive_words': self.positive_words, 'negative_words': self.negative_words,
+                'cache_size': self.cache_size}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    @property
+    def cache_namespace(self) -> str:
+        if (self.positive_words, self.negative_words) == (POSITIVE_WORDS, NEGATIVE_WORDS):
+            return self.name
+        lexicon = '\n'.join(self.positive_words) + '\n\n' + '\n'.join(self.negative_words)
+        return f"{self.name}:{hashlib.sha1(lexicon.encode('utf-8')).hexdigest()[:12]}"
+
+    def _token_counts(self, token: str) -> Tuple[int, int]:
+        # Per-keyword str.count, so prefix and self-overlapping keywords count as in the original
+        positives = sum(token.count(w) for w in self.positive_words)
+        negatives = sum(token.count(w) for w in self.negative_words)
+        return positives - negatives, positives + negatives
+
+    def score_batch(self, headlines: List[str]) -> np.ndarray:
+        if not headlines:
+            return np.zeros((0, 2))
+        text = f' {_SEPARATOR} '.join(headlines)
+        if text.count(_SEPARATOR) != len(headlines) - 1:
+            # A NUL inside a headline would read as a separator; it can never be part of a match
+            text = f' {_SEPARATOR} '.join(h.replace(_SEPARATOR, ' ') for h in headlines)
+        codes, tokens = pd.factorize(pd.Series(text.lower().split(), dtype=object))
+        separator = tokens.get_indexer([_SEPARATOR])[0]
+        tokens = tokens.tolist()
+        lookup = self._tokens.data.get
+        token_counts = [lookup(token) for token in tokens]
+        unknown = [j for j, c in enumerate(token_counts) if c is None]
+        if unknown:
+            new_tokens = dict.fromkeys((tokens[j] for j in unknown), (0, 0))
+            # Keywords cannot span the newlines, so each hit falls inside one token
+            joined = '\n'.join(new_tokens)
+            ends = np.cumsum([len(token) + 1 for token in new_tokens])
+            hits = np.searchsorted(ends, [m.start() for m in self._any_keyword.finditer(joined)], side='right')
+            names = list(new_tokens)
+            for k in np.unique(hits):
+                new_tokens[names[k]] = self._token_counts(names[k])
+            self._tokens.update(new_tokens)
+            for j in unknown:
+                token_counts[j] = new_tokens[tokens[j]]
+
+        token_counts = np.array(token_counts, dtype='float64').reshape(-1, 2)
+        rows = np.cumsum(codes == separator) if separator >= 0 else np.zeros(len(codes), dtype='int64')
+        per_token = token_counts[codes]
+        return np.stack([np.bincount(rows, weights=per_token[:, k], minlength=len(headlines)) for k in range(2)],
+                        axis=1)
+
+
+class VaderBackend(SentimentBackend):
+    """VADER compound score per headline (vaderSentiment, or NLTK's VADER as a fallback)."""
+
+    name = 'vader'
+
+    def __init__(self):
+        self._analyzer = None
+
+    def __getstate__(self):
+        return {'_analyzer': None}
+
+    def _load(self):
+        if self._analyzer is None:
+            try:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+            except ImportError:
+                try:
+                    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+                except ImportError:
+                    raise ImportError("The 'vader' sentiment backend needs vaderSentiment (pip install vaderSentiment)")
+            self._analyzer = SentimentIntensityAnalyzer()
+        return self._analyzer
+
+    def score_batch(self, headlines: List[str]) -> np.ndarray:
+        analyzer = self._load()
+        return np.array([[analyzer.polarity_scores(h)['compound'], 1.0] if h.strip() else [0.0, 0.0]
+                         for h in headlines], dtype='float64').reshape(-1, 2)
+
+
+class TransformerBackend(SentimentBackend):
+    """Local Hugging Face text-classification pipeline, run in batches."""
+
+    def __init__(self, model: str = DEFAULT_TRANSFORMER_MODEL, batch_size: int = 64, device: int = -1):
+        self.model = model
+        self.batch_size = batch_size
+        self.device = device
+        self._pipeline = None
+
+    @property
+    def name(self) -> str:
+        return f"transformer:{self.model}"
+
+    def __getstate__(self):
+        return {'model': self.model, 'batch_size': self.batch_size, 'device': self.device, '_pipeline': None}
+
+    def _load(self):
+        if self._pipeline is None:
+            try:
+                from transformers import pipeline
+            except ImportError:
+                raise ImportError("The 'transformer' sentiment backend needs transformers (pip install transformers torch)")
+            self._pipeline = pipeline('sentiment-analysis', model=self.model, device=self.device)
+        return self._pipeline
+
+    def score_batch(self, headlines: List[str]) -> np.ndarray:
+        scores = np.zeros((len(headlines), 2))
+        texts = [i for i, h in enumerate(headlines) if h.strip()]
+        if texts:
+            results = self._load()([headlines[i] for i in texts], batch_size=self.batch_size, truncation=True)
+            for i, result in zip(texts, results):
+                label = result['label'].upper()
+                sign = 1.0 if label.startswith('POS') else -1.0 if label.startswith('NEG') else 0.0
+                scores[i] = (sign * result['score'], 1.0)
+        return scores
+
+
+BACKENDS = {'keyword': KeywordBackend, 'vader': VaderBackend, 'transformer': TransformerBackend}
+
+
+def get_backend(spec: Optional[str] = None) -> SentimentBackend:
+    """
+    Build a backend from 'keyword', 'vader', 'transformer' or
+    'transformer:<model>' (default: SENTIMENT_BACKEND env, else 'keyword').
+    """
+    spec = (spec or os.getenv('SENTIMENT_BACKEND') or DEFAULT_BACKEND).strip()
+    name, _, option = spec.partition(':')
+    if name.lower() not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{spec}' (available: {', '.join(BACKENDS)})")
+    if name.lower() == 'transformer':
+        return TransformerBackend(model=option or os.getenv('SENTIMENT_MODEL', DEFAULT_TRANSFORMER_MODEL))
+    return BACKENDS[name.lower()]()
+
+
+def headline_key(headline: str) -> bytes:
+    """Cache key of a headline: a 16-byte BLAKE2 digest of its text."""
+    return hashlib.blake2b(headline.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class ScoreCache:
+    """
+    SQLite store of (total, weight) per (backend namespace, headline hash),
+    shared by every scorer and process using the same file.
+    """
+
+    # Keys per SELECT (stays under SQLite's bound-parameter limit)
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: str = DEFAULT_SCORE_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @classmethod
+    def from_env(cls) -> Optional['ScoreCache']:
+        """Build the cache from SENTIMENT_CACHE_PATH ("off" disables it)."""
+        path = os.getenv('SENTIMENT_CACHE_PATH', DEFAULT_SCORE_CACHE_PATH)
+        if path.lower() in ('', 'none', 'off'):
+            return None
+        return cls(path)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS scores (namespace TEXT NOT NULL, key BLOB NOT NULL, '
+                    'total REAL NOT NULL, weight REAL NOT NULL, PRIMARY KEY (namespace, key)) WITHOUT ROWID'
+                )
+            except sqlite3.Error:
+                conn.close()
+                raise
+            # Only a fully set-up connection is kept, so a failed open is retried next time
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, namespace: str, keys: Sequence[bytes]) -> Dict[bytes, Tuple[float, float]]:
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(keys), self.QUERY_CHUNK):
+                chunk = keys[start:start + self.QUERY_CHUNK]
+                rows = conn.execute(
+                    f"SELECT key, total, weight FROM scores WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})",
+                    (namespace, *chunk)
+                )
+                found.update((key, (total, weight)) for key, total, weight in rows)
+        return found
+
+    def put_many(self, namespace: str, items: Dict[bytes, Tuple[float, float]]) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)',
+                                 ((namespace, key, float(total), float(weight)) for key, (total, weight) in items.items()))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_worker_backend: Optional[SentimentBackend] = None
+
+
+def _init_worker(backend: SentimentBackend) -> None:
+    global _worker_backend
+    _worker_backend = backend
+
+
+def _score_in_worker(headlines: List[str]) -> np.ndarray:
+    return _worker_backend.score_batch(headlines)
+
+
+class SentimentScorer:
+    """
+    Scores headline groups through a backend. Each headline's (total, weight)
+    is looked up in the in-memory memo, then in the score cache, and only
+    the remaining headlines go to the backend, in one batch or, for large
+    backfills with `workers` > 1, split across a process pool.
+    """
+
+    def __init__(self, backend: Optional[SentimentBackend] = None, cache: Optional[ScoreCache] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, workers: int = 0,
+                 pool_min_headlines: int = POOL_MIN_HEADLINES):
+        self.backend = backend or KeywordBackend()
+        self.cache = cache
+        self.workers = workers
+        self.pool_min_headlines = pool_min_headlines
+        self._headlines = _Memo(cache_size)
+        self._groups = _Memo(cache_size)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        """Backend name recorded with the scores (MarketData.sentiment_backend)."""
+        return self.backend.name
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: the parent may hold threads or TensorFlow state that must not be forked
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker, initargs=(self.backend,)
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker pool and the cache connection."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+        if self.cache is not None:
+            self.cache.close()
+
+    def _run_backend(self, headlines: List[str]) -> np.ndarray:
+        if self.workers > 1 and len(headlines) >= self.pool_min_headlines:
+            size = -(-len(headlines) // self.workers)
+            chunks = [headlines[i:i + size] for i in range(0, len(headlines), size)]
+            return np.concatenate(list(self._get_pool().map(_score_in_worker, chunks)))
+        return self.backend.score_batch(headlines)
+
+    def headline_scores(self, headlines: Sequence[str]) -> np.ndarray:
+        """(total, weight) per headline as an (n, 2) float array."""
+        codes, distinct = pd.factorize(pd.Series(list(headlines), dtype=object))
+        distinct = distinct.tolist()
+        lookup = self._headlines.data.get
+        scores = [lookup(h) for h in distinct]
+        missing = [i for i, s in enumerate(scores) if s is None]
+
+        if missing and self.cache is not None:
+            namespace = self.backend.cache_namespace
+            keys = {i: headline_key(distinct[i]) for i in missing}
+            try:
+                stored = self.cache.get_many(namespace, list(keys.values()))
+            except (OSError, sqlite3.Error) as e:
+                # The score cache is an optimization; an unusable file just means a miss
+                logger.warning(f"Sentiment score cache read failed ({self.cache.path}): {e}")
+                stored = {}
+            for i in missing:
+                scores[i] = stored.get(keys[i])
+            self._headlines.update({distinct[i]: scores[i] for i in missing if scores[i] is not None})
+            missing = [i for i in missing if scores[i] is None]
+
+        if missing:
+            fresh = self._run_backend([distinct[i] for i in missing]).tolist()
+            for i, value in zip(missing, fresh):
+                scores[i] = value
+            self._headlines.update({distinct[i]: scores[i] for i in missing})
+            if self.cache is not None:
+                try:
+                    self.cache.put_many(namespace, {keys[i]: scores[i] for i in missing})
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Sentiment score cache write failed ({self.cache.path}): {e}")
+
+        return np.array(scores, dtype='float64').reshape(-1, 2)[codes]
+
+    @staticmethod
+    def _score(total: float, weight: float) -> float:
+        if weight == 0:
+            return 0.0
+        # Normalize to [-1, 1]
+        return max(-1.0, min(1.0, total / weight))
+
+    def score(self, headlines: Iterable[str]) -> float:
+        """Score one group of headlines (e.g. one news date)."""
+        return float(self.score_groups([list(headlines)])[0])
+
+    def score_groups(self, groups: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Score many headline groups (e.g. one per news date) in one pass;
+        groups already scored are looked up by their headlines.
+        """
+        scores = np.zeros(len(groups), dtype='float64')
+        lookup = self._groups.data.get
+        pending = {}
+        for i, key in enumerate(tuple(group) for group in groups):
+            cached = lookup(key)
+            if cached is None:
+                pending.setdefault(key, []).append(i)
+            else:
+                scores[i] = cached
+        if not pending:
+            return scores
+
+        headlines = [h for key in pending for h in key]
+        lengths = [len(key) for key in pending]
+        values = self.headline_scores(headlines)
+        group_ids = np.repeat(np.arange(len(pending)), lengths)
+        totals = np.bincount(group_ids, weights=values[:, 0], minlength=len(pending))
+        weights = np.bincount(group_ids, weights=values[:, 1], minlength=len(pending))
+        new_scores = {}
+        for (key, positions), total, weight in zip(pending.items(), totals, weights):
+            new_scores[key] = scores[positions] = self._score(total, weight)
+        self._groups.update(new_scores)
+        return scores
+
+
+_default_scorer = None
+_default_lock = threading.Lock()
+
+
+def default_scorer() -> SentimentScorer:
+    """
+    Process-wide scorer from the environment (SENTIMENT_BACKEND,
+    SENTIMENT_CACHE_PATH, SENTIMENT_WORKERS), so memoized scores outlive
+    individual curators.
+    """
+    global _default_scorer
+    with _default_lock:
+        if _default_scorer is None:
+            _default_scorer = SentimentScorer(get_backend(), cache=ScoreCache.from_env(),
+                                              workers=int(os.getenv('SENTIMENT_WORKERS', 0)))
+        return _default_scorer
+
+
+def legacy_sentiment_score(headlines: List[str], positive_words: Sequence[str] = POSITIVE_WORDS,
+                           negative_words: Sequence[str] = NEGATIVE_WORDS) -> float:
+    """The original per-keyword `str.count` scorer; kept as the reference for tests and benchmarks."""
+    if not headlines:
+        return 0.0
+    total_score = 0
+    word_count = 0
+    for headline in headlines:
+        headline_lower = headline.lower()
+        for word in positive_words:
+            total_score += headline_lower.count(word)
+            word_count += headline_lower.count(word)
+        for word in negative_words:
+            total_score -= headline_lower.count(word)
+            word_count += headline_lower.count(word)
+    if word_count == 0:
+        return 0.0
+    return max(-1.0, min(1.0, total_score / word_count))
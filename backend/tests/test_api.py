@@ -18,6 +18,9 @@ import json
 import sys
 import os
 from unittest.mock import patch, MagicMock
+# Imported before patching sys.modules below so the app's process pools keep
+# the same module (patch.dict drops modules first imported inside the block)
+import concurrent.futures.process
 import pandas as pd
 import numpy as np
 
@@ -49,7 +52,7 @@ mock_modules = {
 }
 
 with patch.dict('sys.modules', mock_modules):
-    from app import app
+    from app import app, response_cache
 
 
 class TestAPIEndpoints(unittest.TestCase):
@@ -60,6 +63,8 @@ class TestAPIEndpoints(unittest.TestCase):
         self.app = app
         self.app.config['TESTING'] = True
         self.client = self.app.test_client()
+        # Responses cached by an earlier test were built from another mock db
+        response_cache.clear()
         
         # Mock database responses
         self.mock_dataset = {
@@ -117,6 +122,9 @@ class TestAPIEndpoints(unittest.TestCase):
         self.mock_db.count_datasets.return_value = 5
         self.mock_db.count_records.return_value = 150
         self.mock_db.get_last_generated_date.return_value = '2023-10-01 12:00:00'
+        self.mock_db.get_dataset_stats.return_value = {
+            'totalDatasets': 5, 'totalRecords': 150, 'lastGenerated': '2023-10-01 12:00:00'
+        }
         self.mock_db.get_all_datasets.return_value = [self.mock_dataset]
         self.mock_db.get_prices.return_value = self.mock_prices
         self.mock_db.get_predictions.return_value = [self.mock_prediction]
@@ -412,6 +420,7 @@ class TestAPIEndpoints(unittest.TestCase):
         
         self.assertEqual(data['symbol'], 'AAPL')
         self.assertEqual(data['exchange'], 'NASDAQ')
+        self.assertEqual(data['rows_url'], '/api/datasets/test_id/rows')
         
         print("Get dataset by ID working correctly")
     
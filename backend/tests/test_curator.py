@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the FinTech data curator.
+
+This module tests:
+- Per-host request rate limiting
+- Concurrent price/news fetching inside curate_dataset
+- Batch curation with curate_many
+- News sources fetched under one deadline with partial results
+- Vectorized news alignment in build_curated_frame
+- HTTP response caching, conditional requests, unthrottled cache hits,
+  periodic pruning and bulk chart fetches (against a local stub server)
+- Incremental price rows after the last stored date
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+import time
+import json
+import shutil
+import tempfile
+import threading
+from unittest.mock import Mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+
+# Add parent directory to path to import the curator
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fintech_data_curator import FinTechDataCurator, HostRateLimiter, MarketData, iter_market_data
+from http_cache import HTTPResponseCache
+
+
+def _price_frame(days=5):
+    """Small OHLCV frame shaped like get_structured_data output."""
+    index = pd.date_range('2024-01-01', periods=days, freq='D')
+    return pd.DataFrame({
+        'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 100,
+        'Daily_Return': 0.0, 'Volatility': 0.0, 'SMA_5': 1.5, 'SMA_20': 1.5, 'RSI': 50.0
+    }, index=index)
+
+
+class TestCurator(unittest.TestCase):
+    """Test suite for concurrent curation in FinTechDataCurator."""
+
+    def setUp(self):
+        """Create a curator whose network fetches are replaced with slow fakes."""
+        self.curator = FinTechDataCurator(days_history=5, requests_per_second=0, use_http_cache=False)
+        self.delay = 0.2
+
+        def fake_structured(symbol, exchange, since=None):
+            time.sleep(self.delay)
+            if symbol == 'BAD':
+                raise ValueError('no data')
+            return _price_frame()
+
+        def fake_unstructured(symbol, days=5):
+            time.sleep(self.delay)
+            return {'2024-01-03': [{'title': f'{symbol} shares rally'}]}
+
+        self.curator.get_structured_data = fake_structured
+        self.curator.get_unstructured_data = fake_unstructured
+
+    def test_rate_limiter_spaces_requests_per_host(self):
+        """Requests to one host are spaced; other hosts are not delayed."""
+        print("\n=== Testing Host Rate Limiter ===")
+
+        limiter = HostRateLimiter(requests_per_second=20)
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.wait('a.example')
+        elapsed_same = time.monotonic() - start
+
+        start = time.monotonic()
+        limiter.wait('b.example')
+        elapsed_other = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed_same, 0.14)
+        self.assertLess(elapsed_other, 0.05)
+
+        print("Host rate limiter working correctly")
+
+    def test_curate_dataset_overlaps_price_and_news(self):
+        """Price and news fetches run at the same time."""
+        print("\n=== Testing Concurrent Dataset Curation ===")
+
+        start = time.monotonic()
+        data = self.curator.curate_dataset('AAPL', 'NASDAQ')
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[2].news_headlines, ['AAPL shares rally'])
+        self.assertLess(elapsed, 2 * self.delay)
+
+        print("Concurrent dataset curation working correctly")
+
+    def test_curate_many(self):
+        """Symbols are curated concurrently and failures are reported per symbol."""
+        print("\n=== Testing Batch Curation ===")
+
+        symbols = ['AAPL', 'MSFT', 'BAD', 'GOOG', 'AAPL']
+        start = time.monotonic()
+        results = self.curator.curate_many(symbols, 'NASDAQ', max_workers=4)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(list(results), ['AAPL', 'MSFT', 'BAD', 'GOOG'])
+        self.assertIsInstance(results['BAD'], ValueError)
+        self.assertEqual(len(results['MSFT']), 5)
+        self.assertEqual(results['GOOG'][0].symbol, 'GOOG')
+        self.assertLess(elapsed, 4 * self.delay)
+
+        print("Batch curation working correctly")
+
+    def test_news_sources_partial_after_deadline(self):
+        """Slow or failing news sources are dropped at the deadline and reported as missing."""
+        print("\n=== Testing News Deadline ===")
+
+        curator = FinTechDataCurator(requests_per_second=0, use_http_cache=False, news_deadline=0.3)
+        release = threading.Event()
+
+        def slow_source(symbol):
+            release.wait(5)
+            return [{'title': 'Late headline', 'date': '2024-01-03'}]
+
+        def failing_source(symbol):
+            raise ConnectionError('feed down')
+
+        curator._get_yahoo_finance_news = slow_source
+        curator._get_google_news = lambda symbol: [{'title': f'{symbol} shares rally', 'date': '2024-01-03'}]
+        curator._get_crypto_news = failing_source
+        try:
+            start = time.monotonic()
+            news = curator.get_unstructured_data('BTC-USD')
+            elapsed = time.monotonic() - start
+        finally:
+            release.set()
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual([a['title'] for a in news['2024-01-03']], ['BTC-USD shares rally'])
+        report = curator.get_news_report('BTC-USD')
+        self.assertEqual(report['sources'], {'yahoo_finance': 'timeout', 'google_news': 'ok', 'coindesk': 'error'})
+        self.assertEqual(report['missing'], ['yahoo_finance', 'coindesk'])
+        self.assertEqual(report['deadline_seconds'], 0.3)
+        self.assertIsNone(curator.get_news_report('AAPL'))
+        self.assertEqual(curator.news_timeout, 0.3)
+
+        # The real sources raise when their feed is down, so it is reported as missing
+        down = FinTechDataCurator(requests_per_second=0, use_http_cache=False, news_deadline=2)
+        yahoo = Mock()
+        yahoo.json.return_value = {'news': [{'title': 'BTC rallies', 'providerPublishTime': 1704240000}]}
+
+        def http_get(url, **kwargs):
+            if 'google' in url or 'coindesk' in url:
+                raise ConnectionError('feed down')
+            self.assertEqual(kwargs['timeout'], 2)
+            return yahoo
+
+        down._http_get = http_get
+        news = down.get_unstructured_data('BTC-USD')
+        report = down.get_news_report('BTC-USD')
+        self.assertEqual(report['sources'], {'yahoo_finance': 'ok', 'google_news': 'error', 'coindesk': 'error'})
+        self.assertEqual(report['missing'], ['google_news', 'coindesk'])
+        sources = {article['source'] for articles in news.values() for article in articles}
+        self.assertEqual(sources, {'Yahoo Finance', 'CryptoNews'})
+
+        print("News deadline working correctly")
+
+    def test_curated_frame_aligns_nearest_news(self):
+        """Each day takes the nearest news date; ties go earlier; bad keys are ignored."""
+        print("\n=== Testing Vectorized News Alignment ===")
+
+        prices = _price_frame(days=6).iloc[::-1]
+        prices.index = prices.index.tz_localize('America/New_York')
+        news = {
+            '2024-01-05': [{'title': 'shares surge'}],
+            'not-a-date': [{'title': 'ignored'}],
+            '2024-01-01': [{'title': 'stock drop'}, {'title': 'weak outlook'}],
+            '2024-01-03': [{'title': 'flat session'}],
+        }
+
+        frame = self.curator.build_curated_frame(prices, news, 'AAPL', 'NASDAQ')
+        self.assertEqual(frame['date'].tolist(), ['2024-01-06', '2024-01-05', '2024-01-04',
+                                                  '2024-01-03', '2024-01-02', '2024-01-01'])
+        self.assertEqual([h[0] for h in frame['news_headlines']], [
+            'shares surge', 'shares surge', 'flat session', 'flat session', 'stock drop', 'stock drop'
+        ])
+        self.assertEqual(frame['news_sentiment_score'].tolist()[-1], -1.0)
+
+        records = list(iter_market_data(frame))
+        self.assertIsInstance(records[0], MarketData)
+        records[0].news_headlines.append('extra')
+        self.assertEqual(records[1].news_headlines, ['shares surge'])
+
+        empty = self.curator.build_curated_frame(prices, {}, 'AAPL', 'NASDAQ')
+        self.assertEqual(empty['news_headlines'].tolist(), [[]] * 6)
+        self.assertEqual(empty['news_sentiment_score'].tolist(), [0.0] * 6)
+
+        print("Vectorized news alignment working correctly")
+
+
+class _ChartStubHandler(BaseHTTPRequestHandler):
+    """Serves /chart/<symbol> like the Yahoo chart API, with ETag support."""
+
+    requests_seen = []
+
+    def do_GET(self):
+        symbol = self.path.split('?')[0].rsplit('/', 1)[-1]
+        type(self).requests_seen.append((symbol, self.headers.get('If-None-Match')))
+        if symbol == 'MISSING':
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{symbol}-v1"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        base = 1704067200  # 2024-01-01
+        body = json.dumps({'chart': {'result': [{
+            'timestamp': [base + i * 86400 for i in range(3)],
+            'indicators': {'quote': [{
+                'open': [1.0, 2.0, 3.0], 'high': [2.0, 3.0, 4.0], 'low': [0.5, 1.5, 2.5],
+                'close': [1.5, 2.5, 3.5], 'volume': [100, 200, 300]
+            }]}
+        }]}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestCuratorHTTPCache(unittest.TestCase):
+    """Test suite for the curator's HTTP cache against a local stub server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the stub chart server on a free port."""
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _ChartStubHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/chart"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Use a fresh cache directory for every test."""
+        _ChartStubHandler.requests_seen = []
+        self.cache_dir = tempfile.mkdtemp(prefix='http_cache_')
+        self.curator = FinTechDataCurator(
+            requests_per_second=0,
+            http_cache=HTTPResponseCache(self.cache_dir),
+            chart_base_url=self.base_url
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_repeat_fetch_served_from_cache(self):
+        """A second identical fetch does not reach the server."""
+        print("\n=== Testing HTTP Cache Hit ===")
+
+        first = self.curator._fetch_yahoo_chart('AAPL', days=10)
+        second = self.curator._fetch_yahoo_chart('AAPL', days=10)
+
+        self.assertEqual(len(_ChartStubHandler.requests_seen), 1)
+        self.assertEqual(list(first['Close']), [1.5, 2.5, 3.5])
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(self.curator.http_cache.stats()['hits'], 1)
+
+        print("HTTP cache hit working correctly")
+
+    def test_stale_entry_revalidated_with_etag(self):
+        """An expired entry is revalidated with If-None-Match and reused on 304."""
+        print("\n=== Testing HTTP Cache Revalidation ===")
+
+        self.curator._fetch_yahoo_chart('MSFT', days=10)
+        # Age the stored entry past the 1d-interval TTL
+        url = self.curator._chart_url('MSFT', 10)
+        entry = self.curator.http_cache.get(url)
+        meta_path, _ = self.curator.http_cache._paths(url)
+        with open(meta_path, 'w') as f:
+            json.dump(dict(entry['meta'], stored_at=time.time() - 2 * 3600), f)
+        frame = self.curator._fetch_yahoo_chart('MSFT', days=10)
+
+        self.assertEqual(_ChartStubHandler.requests_seen, [('MSFT', None), ('MSFT', '"MSFT-v1"')])
+        self.assertEqual(list(frame['Volume']), [100, 200, 300])
+        self.assertEqual(self.curator.http_cache.stats()['revalidated'], 1)
+
+        print("HTTP cache revalidation working correctly")
+
+    def test_cache_hits_skip_rate_limiter(self):
+        """Only requests that reach the server wait for the rate limiter."""
+        print("\n=== Testing HTTP Cache Rate Limiting ===")
+
+        limiter = Mock()
+        curator = FinTechDataCurator(rate_limiter=limiter, http_cache=HTTPResponseCache(self.cache_dir),
+                                     chart_base_url=self.base_url)
+        curator._fetch_yahoo_chart('AAPL', days=10)
+        curator._fetch_yahoo_chart('AAPL', days=10)
+
+        self.assertEqual(len(_ChartStubHandler.requests_seen), 1)
+        limiter.wait.assert_called_once_with(f"127.0.0.1:{self.server.server_port}")
+
+        print("HTTP cache rate limiting working correctly")
+
+    def test_prune_runs_once_per_interval(self):
+        """Opening a cache prunes its directory only when the last prune is old enough."""
+        print("\n=== Testing HTTP Cache Pruning ===")
+
+        old_entry = os.path.join(self.cache_dir, 'expired.body')
+        with open(old_entry, 'wb') as f:
+            f.write(b'old')
+        week_ago = time.time() - 8 * 24 * 3600
+        os.utime(old_entry, (week_ago, week_ago))
+
+        # setUp's cache pruned moments ago, so opening another one skips the scan
+        cache = HTTPResponseCache(self.cache_dir)
+        self.assertTrue(os.path.exists(old_entry))
+        self.assertTrue(cache.maybe_prune(interval=0))
+        self.assertFalse(os.path.exists(old_entry))
+        self.assertFalse(cache.maybe_prune())
+
+        print("HTTP cache pruning working correctly")
+
+    def test_fetch_charts_bulk(self):
+        """Bulk fetch returns a frame per symbol and None for failures, without retrying 404s."""
+        print("\n=== Testing Bulk Chart Fetch ===")
+
+        frames = self.curator.fetch_charts(['AAPL', 'MISSING', 'GOOG'], days=10)
+
+        self.assertEqual(list(frames), ['AAPL', 'MISSING', 'GOOG'])
+        self.assertIsNone(frames['MISSING'])
+        self.assertEqual(len(frames['GOOG']), 3)
+        self.assertEqual(sum(1 for sym, _ in _ChartStubHandler.requests_seen if sym == 'MISSING'), 1)
+
+        print("Bulk chart fetch working correctly")
+
+    def test_price_rows_since_last_stored_date(self):
+        """Only bars after `since` are returned, shaped for save_historical_prices."""
+        print("\n=== Testing Incremental Price Rows ===")
+
+        rows = self.curator.get_price_rows('AAPL', 'NASDAQ', since='2024-01-01')
+
+        self.assertEqual([r['date'] for r in rows], ['2024-01-02', '2024-01-03'])
+        self.assertEqual(rows[0], {'date': '2024-01-02', 'open': 2.0, 'high': 3.0, 'low': 1.5, 'close': 2.5, 'volume': 200})
+        self.assertEqual(self.curator.get_price_rows('AAPL', 'NASDAQ', since='2024-01-03'), [])
+
+        print("Incremental price rows working correctly")
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
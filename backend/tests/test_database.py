@@ -8,6 +8,7 @@ This module tests all critical database operations including:
 - Prediction operations
 - Historical price operations
 - Metadata operations
+- Index bootstrap and explain-plan reporting
 - Error handling
 
 Author: FinTech DataGen Team
@@ -19,6 +20,9 @@ import sys
 import os
 from unittest.mock import patch, MagicMock, Mock
 from datetime import datetime
+from pymongo import MongoClient as RealMongoClient
+from pymongo.collection import Collection
+from pymongo.database import Database
 
 # Fix TensorFlow initialization issue if it appears
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
@@ -28,6 +32,8 @@ import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.mongodb import MongoDB
+from database.indexes import INDEX_SPECS, ensure_indexes, explain_report
+from pymongo.errors import OperationFailure
 
 class TestMongoDBConnection(unittest.TestCase):
     """Test MongoDB connection functionality."""
@@ -72,6 +78,49 @@ class TestMongoDBConnection(unittest.TestCase):
             
             print("MongoDB connection failure handled correctly")
     
+    @patch('database.mongodb.ensure_indexes')
+    @patch('database.mongodb.MongoClient')
+    def test_reconnect_after_fork(self, mock_client, mock_ensure_indexes):
+        """Test that reconnect builds a new client whose collections serve reads, without re-creating indexes."""
+        print("\n=== Testing MongoDB Reconnect ===")
+        
+        # Real (never connected) clients, so the primed handles are pymongo Collections,
+        # which refuse truth-value tests
+        clients = []
+        def make_client(uri):
+            clients.append(RealMongoClient(uri, connect=False))
+            return clients[-1]
+        mock_client.side_effect = make_client
+        mock_ensure_indexes.return_value = {}
+        
+        with patch.dict(os.environ, {'MONGOURI': self.test_uri}), \
+                patch.object(Database, 'command', return_value={'ok': 1.0}), \
+                patch.object(RealMongoClient, 'close') as close:
+            db = MongoDB()
+            inherited = db.client
+            listener = MagicMock()
+            db.add_write_listener(listener)
+            
+            self.assertTrue(db.reconnect())
+            
+            self.assertIsNot(db.client, inherited)
+            close.assert_not_called()
+            self.assertEqual(mock_ensure_indexes.call_count, 1)
+            self.assertEqual(db._write_listeners, [listener])
+            self.assertIsInstance(db._col_historical, Collection)
+            
+            # A read after reconnect reaches the new client's collection
+            cursor = MagicMock()
+            cursor.sort.return_value.limit.return_value = iter([{'symbol': 'AAPL', 'date': '2024-01-02', 'close': 1.5}])
+            with patch.object(Collection, 'find', return_value=cursor) as find:
+                rows = db.get_prices('AAPL')
+            find.assert_called_once_with({'symbol': 'AAPL'})
+            self.assertEqual([(r['date'], r['close']) for r in rows], [('2024-01-02', 1.5)])
+        for client in clients:
+            client.close()
+        
+        print("MongoDB reconnect working correctly")
+    
     def test_missing_mongouri(self):
         """Test behavior when MONGOURI is not set."""
         print("\n=== Testing Missing MONGOURI ===")
@@ -102,10 +151,10 @@ class TestMongoDBOperations(unittest.TestCase):
         self.mock_historical_col = MagicMock()
         self.mock_metadata_col = MagicMock()
         
-        self.mock_db._datasets_col = self.mock_datasets_col
-        self.mock_db._predictions_col = self.mock_predictions_col
-        self.mock_db._historical_col = self.mock_historical_col
-        self.mock_db._metadata_col = self.mock_metadata_col
+        self.mock_db._col_datasets = self.mock_datasets_col
+        self.mock_db._col_predictions = self.mock_predictions_col
+        self.mock_db._col_historical = self.mock_historical_col
+        self.mock_db._col_metadata = self.mock_metadata_col
     
     def test_save_dataset(self):
         """Test saving dataset to database."""
@@ -125,7 +174,9 @@ class TestMongoDBOperations(unittest.TestCase):
         
         result = self.mock_db.save_dataset(dataset_data)
         
-        self.mock_datasets_col.insert_one.assert_called_once_with(dataset_data)
+        header = {k: v for k, v in dataset_data.items() if k != 'data'}
+        header['row_storage'] = 'dataset_rows'
+        self.mock_datasets_col.insert_one.assert_called_once_with(header)
         self.assertEqual(result.inserted_id, 'test_id')
         
         print("Save dataset working correctly")
@@ -185,6 +236,190 @@ class TestMongoDBOperations(unittest.TestCase):
         
         print("Get all datasets working correctly")
     
+    def test_save_dataset_stores_rows_separately(self):
+        """Test that dataset rows go to dataset_rows, not the header."""
+        print("\n=== Testing Save Dataset Rows ===")
+        
+        from database import mongodb
+        
+        header_col = MagicMock()
+        rows_col = MagicMock()
+        header_col.insert_one.return_value = MagicMock(inserted_id='ds1')
+        self.mock_db._col_datasets = header_col
+        self.mock_db._col_dataset_rows = rows_col
+        
+        rows = [{'date': f'2023-01-{i + 1:02d}', 'close_price': float(i)} for i in range(5)]
+        with patch.object(mongodb, 'DATASET_ROW_BATCH', 2):
+            self.mock_db.save_dataset({'symbol': 'AAPL', 'generated_at': datetime.now(), 'data': rows})
+        
+        header = header_col.insert_one.call_args[0][0]
+        self.assertNotIn('data', header)
+        self.assertEqual(header['records'], 5)
+        self.assertEqual(rows_col.insert_many.call_count, 3)
+        written = [doc for call in rows_col.insert_many.call_args_list for doc in call[0][0]]
+        self.assertEqual([doc['seq'] for doc in written], [0, 1, 2, 3, 4])
+        self.assertTrue(all(doc['dataset_id'] == 'ds1' for doc in written))
+        
+        print("Save dataset rows working correctly")
+    
+    def test_dataset_stats_updated_on_save(self):
+        """Test that saving a dataset bumps the totals document atomically."""
+        print("\n=== Testing Dataset Stats Update ===")
+        
+        generated_at = datetime(2023, 10, 1, 12, 0, 0)
+        self.mock_db._col_datasets = MagicMock()
+        self.mock_db._col_stats = MagicMock()
+        
+        self.mock_db.save_dataset({'symbol': 'AAPL', 'records': 30, 'generated_at': generated_at, 'data': []})
+        
+        # Only a built document is incremented; before the backfill it counts the dataset itself
+        self.mock_db._col_stats.update_one.assert_called_once_with(
+            {'_id': 'datasets', 'built': True},
+            {'$inc': {'total_datasets': 1, 'total_records': 30}, '$max': {'last_generated_at': generated_at}}
+        )
+        
+        print("Dataset stats update working correctly")
+    
+    def test_get_dataset_stats(self):
+        """Test reading the totals document, backfilling it when missing."""
+        print("\n=== Testing Get Dataset Stats ===")
+        
+        self.mock_db._col_datasets = MagicMock()
+        self.mock_db._col_stats = MagicMock()
+        self.mock_db._col_stats.find_one.return_value = {
+            'total_datasets': 5, 'total_records': 150, 'last_generated_at': datetime(2023, 10, 1, 12, 0, 0),
+            'built': True
+        }
+        
+        self.assertEqual(self.mock_db.get_dataset_stats(), {
+            'totalDatasets': 5, 'totalRecords': 150, 'lastGenerated': '2023-10-01 12:00:00'
+        })
+        self.mock_db._col_datasets.aggregate.assert_not_called()
+        
+        # A missing (or pre-flag) document is backfilled, but never over a built one
+        self.mock_db._col_stats.find_one.return_value = {'total_datasets': 1, 'total_records': 10}
+        self.mock_db._col_datasets.aggregate.return_value = [
+            {'_id': None, 'total_datasets': 2, 'total_records': 40, 'last_generated_at': None}
+        ]
+        self.assertEqual(self.mock_db.get_dataset_stats(), {
+            'totalDatasets': 2, 'totalRecords': 40, 'lastGenerated': None
+        })
+        self.mock_db._col_stats.update_one.assert_called_once_with(
+            {'_id': 'datasets', 'built': {'$ne': True}},
+            {'$set': {'total_datasets': 2, 'total_records': 40, 'last_generated_at': None, 'built': True}},
+            upsert=True
+        )
+        self.mock_db._col_stats.replace_one.assert_not_called()
+        
+        # Losing the race to another backfill reads the winner's document
+        from pymongo.errors import DuplicateKeyError
+        self.mock_db._col_stats.find_one.side_effect = [
+            None, {'total_datasets': 3, 'total_records': 45, 'last_generated_at': None, 'built': True}
+        ]
+        self.mock_db._col_stats.update_one.side_effect = DuplicateKeyError('duplicate key')
+        self.assertEqual(self.mock_db.get_dataset_stats()['totalDatasets'], 3)
+        
+        print("Get dataset stats working correctly")
+    
+    def test_get_dataset_rows_pagination(self):
+        """Test cursor pagination over dataset_rows."""
+        print("\n=== Testing Dataset Row Pagination ===")
+        
+        from bson import ObjectId
+        
+        dataset_id = str(ObjectId())
+        header_col = MagicMock()
+        rows_col = MagicMock()
+        header_col.find_one.return_value = {'_id': ObjectId(dataset_id), 'row_storage': 'dataset_rows'}
+        cursor = rows_col.find.return_value.sort.return_value.limit.return_value.batch_size.return_value
+        cursor.__iter__ = Mock(return_value=iter([{'seq': 3, 'close_price': 1.0}, {'seq': 4, 'close_price': float('nan')}, {'seq': 5}]))
+        self.mock_db._col_datasets = header_col
+        self.mock_db._col_dataset_rows = rows_col
+        
+        page = self.mock_db.get_dataset_rows(dataset_id, after=2, limit=2)
+        
+        query = rows_col.find.call_args[0][0]
+        self.assertEqual(query, {'dataset_id': ObjectId(dataset_id), 'seq': {'$gt': 2}})
+        rows_col.find.return_value.sort.return_value.limit.assert_called_once_with(3)
+        self.assertEqual([row['seq'] for row in page['rows']], [3, 4])
+        self.assertIsNone(page['rows'][1]['close_price'])
+        self.assertEqual(page['next_cursor'], 4)
+        
+        print("Dataset row pagination working correctly")
+    
+    def test_get_latest_data_loads_split_rows(self):
+        """Test that get_latest_data loads rows saved with row_storage."""
+        print("\n=== Testing Latest Data From Dataset Rows ===")
+        
+        from bson import ObjectId
+        
+        header = {'_id': ObjectId(), 'symbol': 'AAPL', 'row_storage': 'dataset_rows'}
+        header_col = MagicMock()
+        header_col.find_one.return_value = header
+        rows_col = MagicMock()
+        cursor = rows_col.find.return_value.sort.return_value.limit.return_value.batch_size.return_value
+        cursor.__iter__ = Mock(return_value=iter([{'seq': 0, 'close_price': 150.0}, {'seq': 1, 'close_price': 151.0}]))
+        self.mock_db._col_datasets = header_col
+        self.mock_db._col_dataset_rows = rows_col
+        
+        latest = self.mock_db.get_latest_data('AAPL')
+        
+        self.assertIsNotNone(latest)
+        self.assertEqual(header_col.find_one.call_args_list[0][0][0], {'symbol': 'AAPL'})
+        self.assertEqual(rows_col.find.call_args[0][0], {'dataset_id': header['_id']})
+        self.assertEqual([row['close_price'] for row in latest['data']], [150.0, 151.0])
+        
+        print("Latest data from dataset rows working correctly")
+    
+    def test_iter_dataset_rows_raises_when_later_page_fails(self):
+        """Test that a failure on a later page propagates instead of ending the rows."""
+        print("\n=== Testing Dataset Row Page Failure ===")
+        
+        from bson import ObjectId
+        
+        dataset_id = str(ObjectId())
+        header_col = MagicMock()
+        header_col.find_one.return_value = {'_id': ObjectId(dataset_id), 'row_storage': 'dataset_rows'}
+        first_page = MagicMock()
+        first_page.sort.return_value.limit.return_value.batch_size.return_value = [{'seq': 0}, {'seq': 1}, {'seq': 2}]
+        rows_col = MagicMock()
+        rows_col.find.side_effect = [first_page, Exception("cursor killed")]
+        self.mock_db._col_datasets = header_col
+        self.mock_db._col_dataset_rows = rows_col
+        
+        rows = self.mock_db.iter_dataset_rows(dataset_id, batch_size=2)
+        self.assertEqual([next(rows)['seq'], next(rows)['seq']], [0, 1])
+        with self.assertRaises(Exception):
+            next(rows)
+        
+        # Only a missing header or a malformed id means "not found"
+        self.assertIsNone(self.mock_db.get_dataset_rows('not-an-id'))
+        
+        print("Dataset row page failure handled correctly")
+    
+    def test_get_dataset_rows_legacy_embedded(self):
+        """Test paging a legacy dataset whose rows are embedded in the document."""
+        print("\n=== Testing Legacy Dataset Rows ===")
+        
+        from bson import ObjectId
+        
+        header_col = MagicMock()
+        header_col.find_one.return_value = {'_id': ObjectId(), 'data': [{'date': '2023-01-03'}]}
+        self.mock_db._col_datasets = header_col
+        self.mock_db._col_dataset_rows = MagicMock()
+        
+        page = self.mock_db.get_dataset_rows(str(ObjectId()), after=1, limit=10)
+        
+        projection = header_col.find_one.call_args[0][1]
+        self.assertEqual(projection['data'], {'$slice': [2, 11]})
+        self.assertEqual(page, {'rows': [{'date': '2023-01-03', 'seq': 2}], 'next_cursor': None})
+        self.mock_db._col_dataset_rows.find.assert_not_called()
+        
+        header_col.find_one.return_value = None
+        self.assertIsNone(self.mock_db.get_dataset_rows(str(ObjectId())))
+        
+        print("Legacy dataset rows working correctly")
+    
     def test_save_historical_prices(self):
         """Test saving historical prices."""
         print("\n=== Testing Save Historical Prices ===")
@@ -200,17 +435,47 @@ class TestMongoDBOperations(unittest.TestCase):
             }
         ]
         
+        # Same date twice: only the last row for a date is written
+        prices.append(dict(prices[0], close_price=103.0))
+        prices.append(dict(prices[0], date='2023-01-02'))
+        
         mock_result = MagicMock()
-        mock_result.inserted_ids = ['id1', 'id2']
-        self.mock_historical_col.insert_many.return_value = mock_result
+        mock_result.upserted_count = 2
+        mock_result.modified_count = 0
+        self.mock_historical_col.bulk_write.return_value = mock_result
+        self.mock_db._col_historical = self.mock_historical_col
         
         result = self.mock_db.save_historical_prices('AAPL', 'NASDAQ', prices)
         
-        self.mock_historical_col.insert_many.assert_called_once()
-        self.assertEqual(result.inserted_ids, ['id1', 'id2'])
+        # Idempotent upserts keyed on (symbol, exchange, date); no delete-and-reinsert
+        self.mock_historical_col.delete_many.assert_not_called()
+        self.mock_historical_col.bulk_write.assert_called_once()
+        ops = self.mock_historical_col.bulk_write.call_args[0][0]
+        self.assertEqual(len(ops), 2)
+        self.assertEqual(ops[0]._filter, {'symbol': 'AAPL', 'exchange': 'NASDAQ', 'date': '2023-01-01'})
+        self.assertEqual(ops[0]._doc['$set']['close'], 103.0)
+        self.assertTrue(ops[0]._upsert)
+        self.assertEqual(result.upserted_count, 2)
         
         print("Save historical prices working correctly")
     
+    def test_get_last_price_date(self):
+        """Test looking up the latest stored price date."""
+        print("\n=== Testing Get Last Price Date ===")
+        
+        self.mock_db._col_historical = self.mock_historical_col
+        self.mock_historical_col.find_one.return_value = {'date': '2023-01-05'}
+        
+        self.assertEqual(self.mock_db.get_last_price_date('AAPL', 'NASDAQ'), '2023-01-05')
+        args, kwargs = self.mock_historical_col.find_one.call_args
+        self.assertEqual(args[0], {'symbol': 'AAPL', 'exchange': 'NASDAQ'})
+        self.assertEqual(kwargs['sort'], [('date', -1)])
+        
+        self.mock_historical_col.find_one.return_value = None
+        self.assertIsNone(self.mock_db.get_last_price_date('NEW'))
+        
+        print("Get last price date working correctly")
+    
     def test_get_prices(self):
         """Test getting historical prices."""
         print("\n=== Testing Get Prices ===")
@@ -238,6 +503,39 @@ class TestMongoDBOperations(unittest.TestCase):
         
         print("Get prices working correctly")
     
+    def test_get_price_arrays(self):
+        """Test the columnar price read path over one $group/$push document."""
+        print("\n=== Testing Get Price Arrays ===")
+        
+        import numpy as np
+        packed = {'_id': None, 'date': ['2023-01-01', '2023-01-02'], 'close': [102.0, 103], 'volume': [10, None]}
+        self.mock_db._col_historical = self.mock_historical_col
+        self.mock_historical_col.aggregate.return_value = iter([packed])
+        
+        arrays = self.mock_db.get_price_arrays('AAPL', fields=['date', 'close', 'volume'], limit=100)
+        
+        pipeline = self.mock_historical_col.aggregate.call_args[0][0]
+        self.assertEqual(pipeline[:3], [{'$match': {'symbol': 'AAPL'}}, {'$sort': {'date': 1}}, {'$limit': 100}])
+        self.assertEqual(pipeline[3]['$group']['close'], {'$push': {'$ifNull': ['$close', None]}})
+        self.assertEqual(list(arrays['date']), ['2023-01-01', '2023-01-02'])
+        self.assertEqual(arrays['close'].dtype, np.float64)
+        np.testing.assert_array_equal(arrays['close'], [102.0, 103.0])
+        np.testing.assert_array_equal(arrays['volume'], [10, 0])
+        
+        self.mock_historical_col.aggregate.return_value = iter([packed])
+        frame = self.mock_db.get_price_frame('AAPL', fields=['close'])
+        self.assertEqual(list(frame.columns), ['close'])
+        self.assertEqual(frame.index[1], pd.Timestamp('2023-01-02'))
+        
+        # No matching rows: empty columns
+        self.mock_historical_col.aggregate.return_value = iter([])
+        self.assertEqual(len(self.mock_db.get_price_arrays('AAPL')['close']), 0)
+        
+        with self.assertRaises(ValueError):
+            self.mock_db.get_price_arrays('AAPL', fields=['sentiment'])
+        
+        print("Get price arrays working correctly")
+    
     def test_save_forecast(self):
         """Test saving forecast prediction."""
         print("\n=== Testing Save Forecast ===")
@@ -403,16 +701,16 @@ class TestMongoDBErrorHandling(unittest.TestCase):
         """Set up mock MongoDB instance."""
         self.mock_db = MongoDB()
         self.mock_db.db = MagicMock()
-        self.mock_db._datasets_col = MagicMock()
-        self.mock_db._predictions_col = MagicMock()
-        self.mock_db._historical_col = MagicMock()
+        self.mock_db._col_datasets = MagicMock()
+        self.mock_db._col_predictions = MagicMock()
+        self.mock_db._col_historical = MagicMock()
     
     def test_database_operation_exception(self):
         """Test handling of database operation exceptions."""
         print("\n=== Testing Database Operation Exception ===")
         
         # Mock database operation to raise exception
-        self.mock_db._datasets_col.insert_one.side_effect = Exception("Database error")
+        self.mock_db._col_datasets.insert_one.side_effect = Exception("Database error")
         
         with self.assertRaises(Exception):
             self.mock_db.save_dataset({})
@@ -424,7 +722,7 @@ class TestMongoDBErrorHandling(unittest.TestCase):
         print("\n=== Testing Get Predictions Exception ===")
         
         # Mock database operation to raise exception
-        self.mock_db._predictions_col.find.side_effect = Exception("Query error")
+        self.mock_db._col_predictions.find.side_effect = Exception("Query error")
         
         result = self.mock_db.get_predictions()
         
@@ -437,7 +735,7 @@ class TestMongoDBErrorHandling(unittest.TestCase):
         print("\n=== Testing Get Prices Exception ===")
         
         # Mock database operation to raise exception
-        self.mock_db._historical_col.find.side_effect = Exception("Query error")
+        self.mock_db._col_historical.find.side_effect = Exception("Query error")
         
         result = self.mock_db.get_prices(symbol='AAPL')
         
@@ -445,6 +743,72 @@ class TestMongoDBErrorHandling(unittest.TestCase):
         
         print("Get prices exception handled correctly")
 
+class TestMongoDBIndexes(unittest.TestCase):
+    """Test index bootstrap and explain-plan reporting."""
+    
+    def setUp(self):
+        """Set up a mock database with one mock collection per name."""
+        self.collections = {}
+        self.mock_database = MagicMock()
+        self.mock_database.__getitem__.side_effect = lambda name: self.collections.setdefault(name, MagicMock())
+    
+    def test_ensure_indexes(self):
+        """Every spec is created, including the unique historical_prices key."""
+        print("\n=== Testing Ensure Indexes ===")
+        
+        created = ensure_indexes(self.mock_database)
+        
+        self.assertEqual(set(created), set(INDEX_SPECS))
+        calls = self.collections['historical_prices'].create_index.call_args_list
+        keys, options = calls[0][0][0], calls[0][1]
+        self.assertEqual([k for k, _ in keys], ['symbol', 'exchange', 'date'])
+        self.assertTrue(options['unique'])
+        self.assertEqual(
+            sum(len(specs) for specs in INDEX_SPECS.values()),
+            sum(c.create_index.call_count for c in self.collections.values())
+        )
+        
+        print("Ensure indexes working correctly")
+    
+    def test_ensure_indexes_skips_failures(self):
+        """An index that cannot be built is skipped without aborting the rest."""
+        print("\n=== Testing Ensure Indexes Failure ===")
+        
+        self.mock_database['metadata'].create_index.side_effect = OperationFailure("duplicate key")
+        
+        created = ensure_indexes(self.mock_database)
+        
+        self.assertEqual(created['metadata'], [])
+        self.assertEqual(len(created['predictions']), len(INDEX_SPECS['predictions']))
+        
+        print("Ensure indexes failure handled correctly")
+    
+    def test_explain_report(self):
+        """The report names the index used and flags collection scans."""
+        print("\n=== Testing Explain Report ===")
+        
+        index_plan = {
+            'queryPlanner': {'winningPlan': {'stage': 'LIMIT', 'inputStage': {
+                'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN', 'indexName': 'symbol_date'}}}},
+            'executionStats': {'totalDocsExamined': 5, 'totalKeysExamined': 5}
+        }
+        scan_plan = {'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}}
+        for name in INDEX_SPECS:
+            cursor = self.mock_database[name].find.return_value.limit.return_value
+            cursor.sort.return_value = cursor
+            cursor.explain.return_value = scan_plan if name == 'metadata' else index_plan
+        
+        report = explain_report(self.mock_database)
+        
+        by_query = {row['query']: row for row in report}
+        self.assertEqual(by_query['get_prices']['index'], 'symbol_date')
+        self.assertEqual(by_query['get_prices']['stages'], ['LIMIT', 'FETCH', 'IXSCAN'])
+        self.assertFalse(by_query['get_prices']['collection_scan'])
+        self.assertTrue(by_query['get_metadata']['collection_scan'])
+        self.assertIsNone(by_query['get_metadata']['index'])
+        
+        print("Explain report working correctly")
+
 if __name__ == '__main__':
     # Run tests with verbose output
     unittest.main(verbosity=2)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Unit tests for streaming dataset exports.
+
+This module tests:
+- CSV chunking and row formatting
+- JSON array and NDJSON streams
+- Incremental gzip compression
+- Rows are consumed lazily, one chunk at a time
+- Parquet / Arrow IPC round trips through the curator and streamed exports
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+import csv
+import io
+import gzip
+import json
+import math
+import shutil
+import tempfile
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dataset_export
+from dataset_export import (
+    CSV_FIELDS, PRICE_HISTORY_COLUMNS, gzip_chunks, iter_columnar, iter_csv, iter_json_array, iter_ndjson
+)
+from fintech_data_curator import FinTechDataCurator, MarketData
+
+
+def _rows(count):
+    for i in range(count):
+        yield {
+            'symbol': 'AAPL', 'exchange': 'NASDAQ', 'date': f'2023-01-{i + 1:02d}',
+            'open_price': 100.123456, 'high_price': 101.0, 'low_price': 99.0, 'close_price': 100.5,
+            'volume': 1000 + i, 'daily_return': None, 'volatility': 0.0123456789,
+            'sma_5': None, 'sma_20': None, 'rsi': float('nan'),
+            'news_headlines': ['Line one\nbreak', 'Two'], 'news_sentiment_score': 0.25
+        }
+
+
+class TestDatasetExport(unittest.TestCase):
+    """Test suite for the dataset export generators."""
+
+    def test_csv_chunks(self):
+        """The CSV stream yields a header chunk, then one chunk per batch of rows."""
+        print("\n=== Testing CSV Export Stream ===")
+
+        chunks = list(iter_csv(_rows(5), chunk_rows=2))
+        self.assertEqual(len(chunks), 4)
+
+        records = list(csv.DictReader(io.StringIO(''.join(chunks))))
+        self.assertEqual(list(records[0]), CSV_FIELDS)
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[0]['open_price'], '100.1235')
+        self.assertEqual(records[0]['daily_return'], '0')
+        self.assertEqual(records[0]['rsi'], '')
+        self.assertEqual(records[4]['volume'], '1004')
+        self.assertEqual(records[0]['news_headlines'], 'Line one break | Two')
+
+        print("CSV export stream working correctly")
+
+    def test_json_streams(self):
+        """JSON array and NDJSON streams carry the same records."""
+        print("\n=== Testing JSON Export Streams ===")
+
+        array = json.loads(''.join(iter_json_array(_rows(3), chunk_rows=2)))
+        lines = ''.join(iter_ndjson(_rows(3), chunk_rows=2)).splitlines()
+
+        self.assertEqual(len(array), 3)
+        self.assertEqual([json.loads(line) for line in lines], array)
+        self.assertEqual(array[0]['structured_data']['rsi'], 50)
+        self.assertIsNone(array[0]['structured_data']['sma_5'])
+        self.assertEqual(array[2]['structured_data']['volume'], 1002)
+        self.assertEqual(json.loads(''.join(iter_json_array(iter([])))), [])
+
+        print("JSON export streams working correctly")
+
+    def test_gzip_and_laziness(self):
+        """Gzip output round-trips, and rows are pulled only as chunks are consumed."""
+        print("\n=== Testing Gzip Export Stream ===")
+
+        pulled = []
+
+        def tracked():
+            for row in _rows(10):
+                pulled.append(row['date'])
+                yield row
+
+        stream = iter_csv(tracked(), chunk_rows=4)
+        next(stream)  # header
+        next(stream)
+        self.assertEqual(len(pulled), 4)
+
+        plain = ''.join(iter_csv(_rows(10), chunk_rows=4))
+        compressed = b''.join(gzip_chunks(iter_csv(_rows(10), chunk_rows=4)))
+        self.assertEqual(gzip.decompress(compressed).decode('utf-8'), plain)
+
+        print("Gzip export stream working correctly")
+
+
+@unittest.skipIf(dataset_export.pa is None, "pyarrow not installed")
+class TestColumnarExport(unittest.TestCase):
+    """Test suite for the Parquet and Arrow IPC formats."""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='columnar_')
+        self.curator = FinTechDataCurator(use_http_cache=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_curator_round_trip(self):
+        """MarketData saved as Parquet or Arrow loads back unchanged, with typed columns."""
+        print("\n=== Testing Columnar Round Trip ===")
+
+        data = [MarketData(**row) for row in _rows(4)]
+        for fmt in ('parquet', 'arrow'):
+            path = os.path.join(self.workdir, f'data.{fmt}')
+            getattr(self.curator, f'save_to_{fmt}')(data, path)
+            loaded = getattr(self.curator, f'load_from_{fmt}')(path)
+
+            self.assertEqual(len(loaded), 4)
+            self.assertEqual(loaded[1].date, '2023-01-02')
+            self.assertEqual(loaded[0].news_headlines, ['Line one\nbreak', 'Two'])
+            self.assertEqual(loaded[3].volume, 1003)
+            self.assertTrue(math.isnan(loaded[0].rsi))
+            self.assertTrue(math.isnan(loaded[0].daily_return))
+            self.assertEqual(loaded[0].open_price, data[0].open_price)
+
+        schema = dataset_export.read_table(os.path.join(self.workdir, 'data.parquet')).schema
+        self.assertEqual(str(schema.field('date').type), 'date32[day]')
+        self.assertEqual(str(schema.field('volume').type), 'int64')
+
+        print("Columnar round trip working correctly")
+
+    def test_streamed_files(self):
+        """Streamed Parquet/Arrow bytes form valid files with one chunk per row group or batch."""
+        print("\n=== Testing Streamed Columnar Export ===")
+
+        prices = [
+            {'symbol': 'AAPL', 'exchange': 'NASDAQ', 'date': f'2023-01-{i + 1:02d}',
+             'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': float(i), 'volume': 10}
+            for i in range(5)
+        ]
+        for fmt in ('parquet', 'arrow'):
+            path = os.path.join(self.workdir, f'prices.{fmt}')
+            with open(path, 'wb') as f:
+                for chunk in iter_columnar(iter(prices), fmt, PRICE_HISTORY_COLUMNS, chunk_rows=2):
+                    f.write(chunk)
+            table = dataset_export.read_table(path)
+            self.assertEqual(table.column('close').to_pylist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+            self.assertEqual(len(table.to_batches()), 3)
+
+        with self.assertRaises(ValueError):
+            next(iter_columnar(iter(prices), 'xls'))
+
+        print("Streamed columnar export working correctly")
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
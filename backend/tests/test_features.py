@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the declarative feature specs.
+
+This module tests:
+- Spec parsing, column labels and warm-up
+- Indicator values against their pandas definitions
+- Grouped multi-symbol panels
+- One declaration driving curator columns and predictor features
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features import compute_features, feature_columns, parse_features, resolve_features, warmup_bars, warmup_days
+from fintech_data_curator import FinTechDataCurator
+from market_data import MarketDataBatch
+from ml_models.predictor import FinancialPredictor
+
+ALL_FEATURES = 'daily_return, volatility, sma(5), sma(20), rsi, ema(12), macd, bollinger(20,2), atr(14), obv'
+
+
+def _ohlcv(days=80, seed=3):
+    """Random-walk OHLCV bars."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, days))
+    index = pd.date_range('2024-01-01', periods=days, freq='D')
+    return pd.DataFrame({'Open': close, 'High': close + rng.uniform(0, 2, days),
+                         'Low': close - rng.uniform(0, 2, days), 'Close': close,
+                         'Volume': rng.integers(100, 1000, days)}, index=index)
+
+
+class TestFeatureSpecs(unittest.TestCase):
+    """Test suite for feature spec parsing and computation."""
+
+    def test_parse_specs(self):
+        """Specs resolve defaults, label columns and reject bad input."""
+        print("\n=== Testing Feature Spec Parsing ===")
+
+        specs = parse_features('sma(5), rsi, rsi(7), macd(5,35,5), bollinger(10, 1.5)')
+        self.assertEqual(feature_columns(specs), [
+            'SMA_5', 'RSI', 'RSI_7', 'MACD_5_35_5', 'MACD_Signal_5_35_5', 'MACD_Hist_5_35_5',
+            'BB_Upper_10_1.5', 'BB_Middle_10_1.5', 'BB_Lower_10_1.5'
+        ])
+        self.assertEqual([f for spec in specs[:2] for f in spec.fields], ['sma_5', 'rsi'])
+        self.assertEqual(parse_features(['rsi', 'rsi(14)']), parse_features('rsi'))
+        self.assertEqual(feature_columns(resolve_features()),
+                         ['Daily_Return', 'Volatility', 'SMA_5', 'SMA_20', 'RSI'])
+        self.assertEqual(warmup_days(resolve_features()), 32)
+        self.assertEqual(warmup_days(parse_features('macd')), 53)
+        # The calendar warm-up spans the lookback in trading bars, ending on any weekday
+        for specs in (resolve_features(), parse_features('macd')):
+            for end in pd.bdate_range('2024-03-04', periods=5):
+                bars = pd.bdate_range(end=end, periods=200)
+                window = bars[bars > end - pd.Timedelta(days=warmup_days(specs))]
+                self.assertGreaterEqual(len(window) - 1, warmup_bars(specs))
+
+        for bad in ('sma', 'foo(3)', 'ema(0)', 'rsi(1,2)', 'ema(x)'):
+            with self.assertRaises(ValueError):
+                parse_features(bad)
+
+        print("Feature spec parsing working correctly")
+
+    def test_matches_pandas_definitions(self):
+        """Every indicator agrees with its pandas formulation."""
+        print("\n=== Testing Feature Values ===")
+
+        frame = _ohlcv()
+        out = compute_features(frame, parse_features(ALL_FEATURES))
+        close, volume = frame['Close'], frame['Volume']
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        true_range = pd.concat([frame['High'] - frame['Low'], (frame['High'] - close.shift()).abs(),
+                                (frame['Low'] - close.shift()).abs()], axis=1).max(axis=1)
+        atr = true_range.copy()
+        atr.iloc[:13] = np.nan
+        atr.iloc[13] = true_range.iloc[:14].mean()
+        expected = {
+            'Daily_Return': close.pct_change(),
+            'Volatility': close.pct_change().rolling(20).std(),
+            'SMA_5': close.rolling(5).mean(),
+            'SMA_20': close.rolling(20).mean(),
+            'RSI': 100 - 100 / (1 + gain / loss),
+            'EMA_12': close.ewm(span=12, adjust=False).mean(),
+            'MACD': macd,
+            'MACD_Signal': macd.ewm(span=9, adjust=False).mean(),
+            'BB_Upper': close.rolling(20).mean() + 2 * close.rolling(20).std(ddof=0),
+            'BB_Lower': close.rolling(20).mean() - 2 * close.rolling(20).std(ddof=0),
+            'ATR': atr.ewm(alpha=1 / 14, adjust=False).mean(),
+            'OBV': (np.sign(delta).fillna(0) * volume).cumsum(),
+        }
+        for column, values in expected.items():
+            np.testing.assert_allclose(out[column], values, rtol=1e-10, err_msg=column)
+        self.assertTrue(out.index.equals(frame.index))
+
+        print("Feature values working correctly")
+
+    def test_grouped_panel_matches_per_symbol(self):
+        """A panel with interleaved symbols matches computing each symbol alone."""
+        print("\n=== Testing Grouped Feature Panel ===")
+
+        specs = parse_features(ALL_FEATURES)
+        frames = {'AAPL': _ohlcv(80, seed=1), 'MSFT': _ohlcv(50, seed=2), 'TINY': _ohlcv(3, seed=4)}
+        panel = pd.concat([df.assign(Symbol=symbol) for symbol, df in frames.items()]).sort_index(kind='stable')
+        out = compute_features(panel, specs, by='Symbol')
+        self.assertTrue(out.index.equals(panel.index))
+        for symbol, df in frames.items():
+            alone = compute_features(df, specs)
+            for column in feature_columns(specs):
+                np.testing.assert_allclose(out.loc[out['Symbol'] == symbol, column], alone[column],
+                                           rtol=1e-12, err_msg=f"{symbol} {column}")
+
+        print("Grouped feature panel working correctly")
+
+    def test_declaration_drives_curator_and_predictor(self):
+        """The same specs add curated columns and predictor features."""
+        print("\n=== Testing Feature Declaration Wiring ===")
+
+        declared = 'daily_return, volatility, sma(5), sma(20), rsi, ema(12), obv'
+        curator = FinTechDataCurator(use_http_cache=False, features=declared)
+        prices = curator._calculate_technical_indicators(_ohlcv(40))
+        frame = curator.build_curated_frame(prices, {}, 'AAPL', 'NASDAQ')
+        self.assertEqual(list(frame.columns[-2:]), ['ema_12', 'obv'])
+
+        batch = MarketDataBatch.from_frame(frame)
+        self.assertEqual(batch.extra_fields, ['ema_12', 'obv'])
+        self.assertEqual(batch[5:10].columns['ema_12'].tolist(), frame['ema_12'].iloc[5:10].tolist())
+        # Stored rows keep the extra indicators, so /api/predict sees them
+        stored = batch.to_records()
+        self.assertEqual([row['obv'] for row in stored], frame['obv'].tolist())
+
+        predictor = FinancialPredictor(features=declared)
+        self.assertEqual(predictor.get_model_info()['features'][-3:], ['ema_12', 'obv', 'news_sentiment_score'])
+        features = predictor.prepare_features({'data': batch})
+        self.assertEqual(features['obv'].tolist(), frame['obv'].tolist())
+        self.assertTrue(predictor.prepare_features({'data': stored}).equals(features))
+        self.assertEqual(FinancialPredictor().prepare_features({'data': batch}).shape, (40, 11))
+        # Rows curated without the model's extra features are rejected, not zero-filled
+        with self.assertRaises(ValueError):
+            predictor.prepare_features({'data': [{k: v for k, v in row.items() if k != 'obv'} for row in stored]})
+
+        # The saved model carries its feature list; another FEATURE_SPEC does not change it
+        with tempfile.TemporaryDirectory() as tmp:
+            predictor.model_path = os.path.join(tmp, 'model.pkl')
+            self.assertIsNotNone(predictor.train({'data': stored}))
+            with patch.object(FinancialPredictor, 'load_model'):
+                reloaded = FinancialPredictor()
+            reloaded.model_path = predictor.model_path
+            reloaded.load_model()
+            self.assertEqual(reloaded.feature_columns, predictor.feature_columns)
+            self.assertNotIn('error', reloaded.predict({'data': stored}))
+
+        print("Feature declaration wiring working correctly")
+
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
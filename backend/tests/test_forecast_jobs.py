@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Unit tests for background forecast jobs in FinTech DataGen.
+
+This module tests:
+- The shared forecast pipeline (model selection, ensemble from outputs)
+- Parallel fan-out of models to an executor
+- Job submission, per-model progress and result callbacks
+- Failed jobs and job store retention
+- Retrying only unfinished models after the worker pool breaks
+- Per-worker thread limits
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_models.forecasting import train_test_split_series
+from ml_models.pipeline import configure_worker, run_forecast_models, selected_models
+from forecast_jobs import ForecastJobManager, JobStore, JobStoreFull
+
+
+def _wait_for(manager, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in ('completed', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish in {timeout}s")
+
+
+class TestForecastJobs(unittest.TestCase):
+    """Test suite for the forecast pipeline and ForecastJobManager."""
+
+    def setUp(self):
+        """Create a small price series and an in-process job manager."""
+        dates = pd.date_range('2023-01-01', periods=60, freq='D')
+        series = pd.Series(100 + np.sin(np.arange(60) / 5.0) * 3 + np.arange(60) * 0.1, index=dates)
+        self.train, self.test = train_test_split_series(series)
+        self.manager = ForecastJobManager(executor_kind='thread')
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    def test_pipeline_results(self):
+        """Models run in canonical order and the ensemble combines their outputs."""
+        print("\n=== Testing Forecast Pipeline ===")
+
+        events = []
+        results = run_forecast_models(
+            'JOBS', ['arima', 'ma', 'unknown'], {'ma_window': 3}, self.train, self.test, 5,
+            ensemble=True, on_progress=lambda key, state, res: events.append((key, state))
+        )
+
+        self.assertEqual(selected_models(['arima', 'ma', 'unknown']), ['ma', 'arima'])
+        self.assertEqual([r['model'] for r in results], ['moving_average', 'ARIMA(1, 1, 1)', 'EnsembleAverage'])
+        self.assertEqual(len(results[0]['preview_values']), 5)
+        expected = [(a + b) / 2 for a, b in zip(results[0]['predicted_values'], results[1]['predicted_values'])]
+        np.testing.assert_allclose(results[2]['predicted_values'], expected)
+        self.assertEqual(events[:2], [('ma', 'running'), ('ma', 'done')])
+        self.assertEqual(events[-1], ('ensemble', 'done'))
+
+        # An unknown weighting is rejected before any model runs
+        events.clear()
+        with self.assertRaises(ValueError):
+            run_forecast_models('JOBS', ['ma'], {}, self.train, self.test, 5, ensemble=True, weighting='median',
+                                on_progress=lambda key, state, res: events.append((key, state)))
+        self.assertEqual(events, [])
+
+        print("Forecast pipeline working correctly")
+
+    def test_parallel_matches_sequential(self):
+        """Fanning models out to an executor gives the same results in model order."""
+        print("\n=== Testing Parallel Forecast Run ===")
+
+        sequential = run_forecast_models('JOBS', ['ma', 'arima'], {}, self.train, self.test, 3, ensemble=True)
+        done = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            parallel = run_forecast_models(
+                'JOBS', ['arima', 'ma'], {}, self.train, self.test, 3, ensemble=True,
+                executor=executor, parallel=True,
+                on_progress=lambda key, state, res: done.append(key) if state == 'done' else None
+            )
+
+        self.assertEqual([r['model'] for r in parallel], [r['model'] for r in sequential])
+        for seq, par in zip(sequential, parallel):
+            np.testing.assert_allclose(par['predicted_values'], seq['predicted_values'])
+        self.assertEqual(sorted(done), ['arima', 'ensemble', 'ma'])
+
+        print("Parallel forecast run working correctly")
+
+    def test_job_completes_with_progress(self):
+        """A submitted job returns at once, then reports every model as done."""
+        print("\n=== Testing Forecast Job Completion ===")
+
+        saved = []
+        job = self.manager.submit(
+            'JOBS', ['ma', 'arima'], {}, self.train, self.test, 3, ensemble=True,
+            on_result=lambda symbol, res: saved.append((symbol, res['model'])),
+            meta={'preview_days': 3}
+        )
+
+        self.assertIn(job['status'], ('queued', 'running'))
+        self.assertEqual(job['progress'], {'ma': 'pending', 'arima': 'pending', 'ensemble': 'pending'})
+
+        done = _wait_for(self.manager, job['job_id'])
+        self.assertEqual(done['status'], 'completed')
+        self.assertEqual(set(done['progress'].values()), {'done'})
+        self.assertEqual(len(done['results']), 3)
+        self.assertEqual(done['meta'], {'preview_days': 3})
+        self.assertEqual(saved, [('JOBS', 'moving_average'), ('JOBS', 'ARIMA(1, 1, 1)'), ('JOBS', 'EnsembleAverage')])
+
+        print("Forecast job completion working correctly")
+
+    def test_broken_pool_retries_unfinished_models(self):
+        """After the pool breaks, only unfinished models rerun and each result is reported once."""
+        print("\n=== Testing Broken Pool Retry ===")
+
+        class BreakingPool:
+            """Runs 'ma' inline, then dies on 'arima' like a crashed worker."""
+            def submit(self, fn, symbol, key, *args):
+                future = Future()
+                if key == 'arima':
+                    future.set_exception(BrokenProcessPool('worker died'))
+                else:
+                    future.set_result(fn(symbol, key, *args))
+                return future
+
+            def shutdown(self, **kwargs):
+                pass
+
+        manager = ForecastJobManager(executor_kind='process')
+        manager._pool = BreakingPool()
+        done = []
+        try:
+            results = manager.run_models(
+                'JOBS', ['ma', 'arima'], {}, self.train, self.test, 3, ensemble=True,
+                on_progress=lambda key, state, res: done.append(key) if state == 'done' else None
+            )
+        finally:
+            manager.shutdown()
+
+        self.assertEqual(done, ['ma', 'arima', 'ensemble'])
+        self.assertEqual([r['model'] for r in results], ['moving_average', 'ARIMA(1, 1, 1)', 'EnsembleAverage'])
+        self.assertEqual(manager.executor_kind, 'thread')
+
+        print("Broken pool retry working correctly")
+
+    def test_worker_thread_limits(self):
+        """Worker environment variables and TensorFlow agree on the thread limits."""
+        print("\n=== Testing Worker Thread Limits ===")
+
+        tf = MagicMock()
+        with patch.dict(sys.modules, {'tensorflow': tf}), patch.dict(os.environ):
+            configure_worker(3)
+            self.assertEqual(os.environ['OMP_NUM_THREADS'], '3')
+            self.assertEqual(os.environ['TF_NUM_INTRAOP_THREADS'], '3')
+            self.assertEqual(os.environ['TF_NUM_INTEROP_THREADS'], '1')
+        tf.config.threading.set_intra_op_parallelism_threads.assert_called_once_with(3)
+        tf.config.threading.set_inter_op_parallelism_threads.assert_called_once_with(1)
+
+        print("Worker thread limits working correctly")
+
+    def test_failed_job(self):
+        """Errors mark the job and the failing model as failed."""
+        print("\n=== Testing Forecast Job Failure ===")
+
+        job = self.manager.submit('JOBS', ['ma'], {'ma_window': 'not-a-number'}, self.train, self.test, 3)
+        done = _wait_for(self.manager, job['job_id'])
+
+        self.assertEqual(done['status'], 'failed')
+        self.assertEqual(done['progress']['ma'], 'failed')
+        self.assertTrue(done['error'])
+        self.assertIsNone(self.manager.get('missing'))
+
+        print("Forecast job failure working correctly")
+
+    def test_job_store_retention(self):
+        """A full store evicts the oldest finished job and never an active one."""
+        print("\n=== Testing Job Store Retention ===")
+
+        store = JobStore(max_jobs=3)
+        running = store.create(progress={}, _created_ts=1)
+        store.update(running['job_id'], status='running')
+        done_late = store.create(progress={}, _created_ts=2)
+        store.update(done_late['job_id'], status='completed', _finished_ts=time.time())
+        done_early = store.create(progress={}, _created_ts=3)
+        store.update(done_early['job_id'], status='failed', _finished_ts=time.time() - 10)
+
+        queued = store.create(progress={}, _created_ts=4)
+
+        self.assertIsNone(store.get(done_early['job_id']))
+        self.assertIsNotNone(store.get(done_late['job_id']))
+        self.assertEqual(store.counts(), {'running': 1, 'completed': 1, 'queued': 1})
+
+        store.create(progress={}, _created_ts=5)
+        self.assertIsNone(store.get(done_late['job_id']))
+
+        # Every retained job is active: refuse the new one instead of dropping a live job
+        with self.assertRaises(JobStoreFull):
+            store.create(progress={}, _created_ts=6)
+        self.assertIsNotNone(store.get(running['job_id']))
+        self.assertIsNotNone(store.get(queued['job_id']))
+        self.assertEqual(store.counts(), {'running': 1, 'queued': 2})
+
+        print("Job store retention working correctly")
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
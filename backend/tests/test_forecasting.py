@@ -30,6 +30,10 @@ from ml_models.forecasting import (
     TransformerForecaster,
     EnsembleAverageForecaster,
     calculate_metrics,
+    check_weighting,
+    combine_forecasts,
+    inverse_rmse_weights,
+    sliding_windows,
     train_test_split_series
 )
 
@@ -189,6 +193,44 @@ class TestForecastingModels(unittest.TestCase):
         
         print(f"Transformer: RMSE={metrics['rmse']:.4f}, MAE={metrics['mae']:.4f}")
     
+    def test_neural_rollout_matches_stepwise(self):
+        """Compiled rollout matches a step-by-step direct model loop."""
+        print("\n=== Testing Compiled Neural Rollout ===")
+        
+        lstm_model = LSTMForecaster(lookback=5, epochs=2, batch_size=8)
+        lstm_model.fit(self.train_series)
+        
+        horizon = 6
+        history = list(lstm_model.train_all_scaled)
+        expected = []
+        for _ in range(horizon):
+            x = np.array(history[-5:], dtype='float32').reshape((1, 5, 1))
+            yhat = float(np.asarray(lstm_model.model(x, training=False)).reshape(-1)[0])
+            expected.append(yhat)
+            history.append(yhat)
+        expected = lstm_model._inv_scale(np.array(expected))
+        
+        np.testing.assert_allclose(lstm_model.predict(horizon), expected, rtol=1e-4)
+        
+        print("Rollout matches stepwise inference")
+    
+    def test_neural_predict_batch(self):
+        """Batch mode rolls out several histories in one call."""
+        print("\n=== Testing Batched Neural Rollout ===")
+        
+        lstm_model = LSTMForecaster(lookback=5, epochs=2, batch_size=8)
+        lstm_model.fit(self.train_series)
+        
+        histories = [self.train_series.values, self.train_series.values[:-10], [101.0, 102.0]]
+        batch_preds = lstm_model.predict_batch(histories, 4)
+        
+        self.assertEqual(len(batch_preds), 3)
+        self.assertTrue(all(len(p) == 4 for p in batch_preds))
+        # First history is the training series, so it matches predict()
+        np.testing.assert_allclose(batch_preds[0], lstm_model.predict(4), rtol=1e-4)
+        
+        print("Batched rollout working correctly")
+    
     def test_ensemble_forecaster(self):
         """Test Ensemble Average Forecaster functionality."""
         print("\n=== Testing Ensemble Average Forecaster ===")
@@ -220,6 +262,56 @@ class TestForecastingModels(unittest.TestCase):
         
         print(f"Ensemble: RMSE={metrics['rmse']:.4f}, MAE={metrics['mae']:.4f}")
     
+    def test_ensemble_from_fitted_members(self):
+        """Pre-fitted members are reused without refitting, with optional weights."""
+        print("\n=== Testing Ensemble From Fitted Members ===")
+        
+        ma_model = MovingAverageForecaster(window=5)
+        arima_model = ARIMAForecaster(order=(1, 1, 1))
+        members = [ma_model, arima_model]
+        eval_results = []
+        for model in members:
+            model.fit(self.train_series)
+            eval_results.append(model.evaluate(self.test_series_split))
+        
+        fit_calls = []
+        for model in members:
+            model.fit = lambda series, m=model: fit_calls.append(m)
+        
+        ensemble_model = EnsembleAverageForecaster.from_fitted(members, eval_results, weighting='inverse_rmse')
+        ensemble_model.fit(self.train_series)
+        self.assertEqual(fit_calls, [])
+        
+        # Weights favour the member with the lower RMSE
+        rmses = [r['metrics']['rmse'] for r in eval_results]
+        self.assertAlmostEqual(sum(ensemble_model.weights), 1.0)
+        self.assertEqual(int(np.argmax(ensemble_model.weights)), int(np.argmin(rmses)))
+        
+        expected = combine_forecasts([m.predict(5) for m in members], ensemble_model.weights)
+        np.testing.assert_allclose(ensemble_model.predict(5), expected)
+        
+        print(f"Weighted ensemble: weights={[round(w, 3) for w in ensemble_model.weights]}")
+    
+    def test_combine_forecasts(self):
+        """Forecast combination aligns lengths and applies weights."""
+        print("\n=== Testing Forecast Combination ===")
+        
+        self.assertEqual(combine_forecasts([[1.0, 2.0, 3.0], [3.0, 4.0]]), [2.0, 3.0])
+        self.assertEqual(combine_forecasts([[1.0, 1.0], [4.0, 4.0]], [2.0, 1.0]), [2.0, 2.0])
+        self.assertEqual(inverse_rmse_weights([{'metrics': {'rmse': 1.0}}, {'metrics': {'rmse': 3.0}}]), [0.75, 0.25])
+        with self.assertRaises(ValueError):
+            combine_forecasts([[1.0], [2.0]], [1.0])
+
+        # A member with a non-finite RMSE (e.g. a failed fit) is left out of the weighted mean
+        nan_member = [{'metrics': {'rmse': 1.0}}, {'metrics': {'rmse': float('nan')}}]
+        self.assertEqual(inverse_rmse_weights(nan_member), [1.0, 0.0])
+        self.assertEqual(combine_forecasts([[1.0, 2.0], [float('nan')]], [1.0, 0.0]), [1.0, 2.0])
+        self.assertEqual(inverse_rmse_weights([{'metrics': {'rmse': float('inf')}}] * 2), [0.5, 0.5])
+        with self.assertRaises(ValueError):
+            check_weighting('median')
+        
+        print("Forecast combination working correctly")
+    
     def test_calculate_metrics(self):
         """Test metrics calculation function."""
         print("\n=== Testing Metrics Calculation ===")
@@ -291,6 +383,51 @@ class TestForecastingModels(unittest.TestCase):
         
         print(f"\nSuccessful models: {successful_models}")
 
+class TestSlidingWindows(unittest.TestCase):
+    """Test the strided supervised window builder."""
+    
+    def test_matches_loop_construction(self):
+        """Windows and targets match the straightforward slicing loop."""
+        print("\n=== Testing Sliding Windows (1-D) ===")
+        
+        sequence = np.arange(30, dtype='float32')
+        lookback = 5
+        X, y = sliding_windows(sequence, lookback)
+        
+        self.assertEqual(X.shape, (25, lookback, 1))
+        self.assertEqual(y.shape, (25,))
+        for i in range(len(sequence) - lookback):
+            np.testing.assert_array_equal(X[i, :, 0], sequence[i:i+lookback])
+            self.assertEqual(y[i], sequence[i+lookback])
+        # Zero-copy: windows are views over the input buffer
+        self.assertTrue(np.shares_memory(X, sequence))
+        
+        print("1-D windows match loop construction")
+    
+    def test_multi_feature_and_stride(self):
+        """Multi-feature input keeps all columns; stride skips windows."""
+        print("\n=== Testing Sliding Windows (multi-feature, stride) ===")
+        
+        sequence = np.column_stack([np.arange(20), np.arange(20) * 10]).astype('float64')
+        X, y = sliding_windows(sequence, lookback=4, stride=3, target_col=1)
+        
+        self.assertEqual(X.shape, (6, 4, 2))
+        np.testing.assert_array_equal(X[1], sequence[3:7])
+        np.testing.assert_array_equal(y, sequence[4::3, 1])
+        
+        print("Multi-feature strided windows working correctly")
+    
+    def test_short_sequence(self):
+        """Sequences no longer than the lookback yield no windows."""
+        print("\n=== Testing Sliding Windows (short sequence) ===")
+        
+        X, y = sliding_windows(np.arange(5, dtype='float32'), lookback=5)
+        
+        self.assertEqual(X.shape, (0, 5, 1))
+        self.assertEqual(len(y), 0)
+        
+        print("Short sequence handled successfully")
+
 class TestModelEdgeCases(unittest.TestCase):
     """Test edge cases and error handling."""
     
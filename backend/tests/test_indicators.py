@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming indicator engine.
+
+This module tests:
+- Parity of IndicatorState with the curator's bulk pandas indicators
+- Resuming from a serialized state
+- Incremental price updates without the warm-up window
+- Resuming only for the feature specs the state streams
+- Indicator state persistence in MongoDB
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import IndicatorState, INDICATOR_FIELDS
+from fintech_data_curator import FinTechDataCurator
+from database.mongodb import MongoDB
+
+BULK_COLUMNS = {'daily_return': 'Daily_Return', 'volatility': 'Volatility',
+                'sma_5': 'SMA_5', 'sma_20': 'SMA_20', 'rsi': 'RSI'}
+
+
+def _ohlcv(days=300, end=None):
+    """Random-walk OHLCV bars with a flat stretch (zero gains and losses)."""
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, days))
+    close[30:50] = close[29]
+    index = pd.date_range(end=end or '2024-12-31', periods=days, freq='D')
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': 1000}, index=index)
+
+
+class TestIndicatorState(unittest.TestCase):
+    """Test suite for IndicatorState."""
+
+    def assertMatchesBulk(self, streamed, bulk):
+        for field, column in BULK_COLUMNS.items():
+            expected = bulk[column].to_numpy(dtype='float64')
+            actual = np.array([row[field] for row in streamed], dtype='float64')
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12, err_msg=field)
+
+    def test_matches_bulk_indicators(self):
+        """Per-bar updates reproduce the rolling pandas indicators, including NaN warm-up."""
+        print("\n=== Testing Streaming Indicator Parity ===")
+
+        frame = _ohlcv()
+        dates = frame.index.strftime('%Y-%m-%d')
+        for method in ('sma', 'wilder'):
+            curator = FinTechDataCurator(use_http_cache=False, rsi_method=method)
+            bulk = curator._calculate_technical_indicators(frame.copy())
+            streamed = IndicatorState(method).update_many(zip(dates, frame['Close']))
+            self.assertMatchesBulk(streamed, bulk)
+
+        print("Streaming indicator parity working correctly")
+
+    def test_resume_from_dict(self):
+        """A state restored from to_dict() continues exactly like the original."""
+        print("\n=== Testing Indicator State Resume ===")
+
+        frame = _ohlcv(days=120)
+        bars = list(zip(frame.index.strftime('%Y-%m-%d'), frame['Close']))
+        for method in ('sma', 'wilder'):
+            uninterrupted = IndicatorState(method).update_many(bars)
+            first = IndicatorState(method)
+            first.update_many(bars[:70])
+            resumed = IndicatorState.from_dict(first.to_dict())
+            self.assertEqual(resumed.update_many(bars[70:]), uninterrupted[70:])
+
+        with self.assertRaises(ValueError):
+            resumed.update(bars[0][0], 1.0)
+
+        print("Indicator state resume working correctly")
+
+
+class TestIncrementalPriceUpdate(unittest.TestCase):
+    """Test suite for FinTechDataCurator.get_price_update."""
+
+    def setUp(self):
+        today = pd.Timestamp(datetime.now().date())
+        self.frame = _ohlcv(days=80, end=today - pd.Timedelta(days=1))
+        self.available = 60
+        self.fetches = []
+        self.curator = FinTechDataCurator(days_history=30, use_http_cache=False)
+
+        def fake_fetch(symbol, fetch_days):
+            self.fetches.append(fetch_days)
+            return self.frame.iloc[:self.available], 'stub'
+
+        self.curator._fetch_ohlcv = fake_fetch
+
+    def test_resume_fetches_only_new_bars(self):
+        """Stored state skips the warm-up fetch and yields the same indicators as a full recompute."""
+        print("\n=== Testing Incremental Price Update ===")
+
+        rows, state = self.curator.get_price_update('AAPL', 'NASDAQ')
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(self.fetches, [74])  # 30 + 20 bars in calendar days
+        self.assertEqual(state.last_date, rows[-1]['date'])
+
+        since = rows[-1]['date']
+        self.available = 65
+        stored = state.to_dict()
+        rows, state = self.curator.get_price_update('AAPL', 'NASDAQ', since=since,
+                                                    state=IndicatorState.from_dict(stored))
+        self.assertEqual(self.fetches[-1], (datetime.now() - datetime.strptime(since, '%Y-%m-%d')).days)
+        self.assertEqual([r['date'] for r in rows], list(self.frame.index[60:65].strftime('%Y-%m-%d')))
+
+        bulk = self.curator._calculate_technical_indicators(self.frame.iloc[:65].copy()).iloc[60:65]
+        for field in INDICATOR_FIELDS:
+            np.testing.assert_allclose([r[field] for r in rows], bulk[BULK_COLUMNS[field]], rtol=1e-9)
+
+        # State from another date is not trusted: the warm-up window is fetched again
+        self.curator.get_price_update('AAPL', 'NASDAQ', since=rows[-1]['date'], state=IndicatorState())
+        self.assertEqual(self.fetches[-1], self.curator._warmup_fetch_days(rows[-1]['date']))
+
+        print("Incremental price update working correctly")
+
+    def test_rebuilt_state_is_warmed_up(self):
+        """A rebuild from the calendar-day warm-up fetch leaves full windows and exact values."""
+        print("\n=== Testing Rebuilt Indicator State ===")
+
+        today = pd.Timestamp(datetime.now().date())
+        frame = _ohlcv(days=120).set_axis(pd.bdate_range(end=today - pd.Timedelta(days=1), periods=120))
+
+        def calendar_fetch(symbol, fetch_days):
+            # Like the chart API: only bars within the last `fetch_days` calendar days
+            return frame[frame.index >= today - pd.Timedelta(days=fetch_days)], 'stub'
+
+        self.curator._fetch_ohlcv = calendar_fetch
+        since = frame.index[-6].strftime('%Y-%m-%d')
+        rows, state = self.curator.get_price_update('AAPL', 'NASDAQ', since=since)
+        self.assertEqual((len(state.closes), len(state.returns), len(state.gains)), (21, 20, 14))
+
+        bulk = self.curator._calculate_technical_indicators(frame.copy()).iloc[-5:]
+        for field in INDICATOR_FIELDS:
+            np.testing.assert_allclose([r[field] for r in rows], bulk[BULK_COLUMNS[field]], rtol=1e-9)
+
+        print("Rebuilt indicator state working correctly")
+
+    def test_state_follows_feature_specs(self):
+        """State is resumed only for the specs and RSI method it streams; other specs recompute in bulk."""
+        print("\n=== Testing Indicator State Feature Specs ===")
+
+        rows, state = self.curator.get_price_update('AAPL', 'NASDAQ')
+        since = rows[-1]['date']
+        stored = state.to_dict()
+        self.assertEqual(stored['features'], ['daily_return', 'volatility(20)', 'sma(5)', 'sma(20)', 'rsi(14)'])
+        self.assertTrue(self.curator.can_resume(IndicatorState.from_dict(stored), since))
+
+        # States stored before specs were recorded streamed the defaults
+        legacy = {k: v for k, v in stored.items() if k != 'features'}
+        self.assertTrue(self.curator.can_resume(IndicatorState.from_dict(legacy), since))
+
+        wilder = FinTechDataCurator(days_history=30, use_http_cache=False, rsi_method='wilder')
+        self.assertFalse(wilder.can_resume(IndicatorState.from_dict(stored), since))
+        self.assertFalse(self.curator.can_resume(IndicatorState.from_dict({**stored, 'features': ['sma(5)']}), since))
+
+        custom = FinTechDataCurator(days_history=30, use_http_cache=False, features='sma(5), ema(12)')
+        self.assertFalse(custom.can_resume(IndicatorState.from_dict(stored), since))
+        custom._fetch_ohlcv = self.curator._fetch_ohlcv
+        self.available = 65
+        rows, state = custom.get_price_update('AAPL', 'NASDAQ', since=since, state=IndicatorState.from_dict(stored))
+        self.assertIsNone(state)
+        self.assertEqual([r['date'] for r in rows], list(self.frame.index[60:65].strftime('%Y-%m-%d')))
+        bulk = custom._calculate_technical_indicators(self.frame.iloc[:65].copy()).iloc[60:65]
+        np.testing.assert_allclose([r['ema_12'] for r in rows], bulk['EMA_12'], rtol=1e-9)
+        self.assertNotIn('rsi', rows[0])
+
+        print("Indicator state feature specs working correctly")
+
+    def test_mongodb_indicator_state(self):
+        """State is stored per (symbol, exchange) and indicator values land on price rows."""
+        print("\n=== Testing Indicator State Storage ===")
+
+        mongo = MongoDB()
+        mongo.db = MagicMock()
+        state_col = mongo.db.indicator_state
+        state_col.find_one.return_value = {'state': {'last_date': '2024-01-02'}}
+
+        mongo.save_indicator_state('AAPL', 'NASDAQ', {'last_date': '2024-01-02'})
+        query, doc = state_col.replace_one.call_args[0]
+        self.assertEqual(query, {'symbol': 'AAPL', 'exchange': 'NASDAQ'})
+        self.assertEqual(doc['last_date'], '2024-01-02')
+        self.assertEqual(mongo.get_indicator_state('AAPL', 'NASDAQ'), {'last_date': '2024-01-02'})
+
+        mongo.save_historical_prices('AAPL', 'NASDAQ', [
+            {'date': '2024-01-02', 'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5, 'volume': 10,
+             'sma_5': 1.25, 'rsi': float('nan')}
+        ])
+        update = mongo.db.historical_prices.bulk_write.call_args[0][0][0]._doc['$set']
+        self.assertEqual(update['sma_5'], 1.25)
+        self.assertIsNone(update['rsi'])
+        self.assertNotIn('volatility', update)
+
+        # Fields of other feature specs are stored when listed
+        mongo.save_historical_prices('AAPL', 'NASDAQ', [{'date': '2024-01-03', 'close': 2, 'ema_12': 1.5}],
+                                     indicator_fields=('ema_12',))
+        update = mongo.db.historical_prices.bulk_write.call_args[0][0][0]._doc['$set']
+        self.assertEqual(update['ema_12'], 1.5)
+
+        print("Indicator state storage working correctly")
+
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
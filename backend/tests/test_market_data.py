@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the columnar MarketData batch.
+
+This module tests:
+- Row views, slices and the offsets-encoded headline store
+- Zero-copy DataFrame and Arrow conversions
+- Predictor features and storage records built from a batch
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+import math
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dataset_export
+from market_data import MarketData, MarketDataBatch, MarketDataRow
+from ml_models.predictor import FinancialPredictor
+
+
+def _records(n=6):
+    """MarketData records with NaN gaps and a varying number of headlines."""
+    return [
+        MarketData(
+            symbol='AAPL', exchange='NASDAQ', date=f'2023-01-{i + 1:02d}',
+            open_price=100.0 + i, high_price=101.0 + i, low_price=99.0 + i, close_price=100.5 + i,
+            volume=1000 + i, daily_return=float('nan') if i == 0 else 0.01 * i, volatility=0.02,
+            sma_5=100.0, sma_20=float('nan') if i == 0 else 100.0, rsi=50.0 + i,
+            news_headlines=[f'headline {i}.{k}' for k in range(i % 3)], news_sentiment_score=0.1 * i
+        )
+        for i in range(n)
+    ]
+
+
+class TestMarketDataBatch(unittest.TestCase):
+    """Test suite for MarketDataBatch."""
+
+    def setUp(self):
+        self.records = _records()
+        self.batch = MarketDataBatch.from_records(self.records)
+
+    def test_rows_and_slices(self):
+        """Rows read like MarketData; slices share arrays and headline values."""
+        print("\n=== Testing MarketDataBatch Rows ===")
+
+        row = self.batch[2]
+        self.assertIsInstance(row, MarketDataRow)
+        self.assertFalse(hasattr(row, '__dict__'))
+        self.assertEqual(row.to_market_data(), self.records[2])
+        self.assertIsInstance(row.volume, int)
+        self.assertEqual(self.batch[-1].date, '2023-01-06')
+        with self.assertRaises(IndexError):
+            self.batch[6]
+
+        window = self.batch[1:5]
+        self.assertEqual(len(window), 4)
+        self.assertTrue(np.shares_memory(window.columns['close_price'], self.batch.columns['close_price']))
+        self.assertEqual([r.news_headlines for r in window], [r.news_headlines for r in self.records[1:5]])
+        self.assertEqual([r.date for r in self.batch[::2]], ['2023-01-01', '2023-01-03', '2023-01-05'])
+        self.assertEqual(self.batch[::2][1].news_headlines, self.records[2].news_headlines)
+
+        combined = MarketDataBatch.concat([window, self.batch[::2]])
+        self.assertEqual([r.news_headlines for r in combined],
+                         [r.news_headlines for r in self.records[1:5] + self.records[::2]])
+
+        print("MarketDataBatch rows working correctly")
+
+    def test_frame_round_trip_shares_memory(self):
+        """to_frame/from_frame keep numeric columns in place."""
+        print("\n=== Testing MarketDataBatch DataFrame Conversion ===")
+
+        frame = self.batch.to_frame()
+        self.assertEqual(frame['date'].tolist()[0], '2023-01-01')
+        self.assertEqual(frame['news_headlines'].tolist()[2], self.records[2].news_headlines)
+        self.assertTrue(np.shares_memory(frame['open_price'].to_numpy(), self.batch.columns['open_price']))
+
+        back = MarketDataBatch.from_frame(frame)
+        self.assertTrue(np.shares_memory(back.columns['open_price'], self.batch.columns['open_price']))
+        self.assertEqual([r.to_market_data() for r in back][1:], self.records[1:])
+
+        print("MarketDataBatch DataFrame conversion working correctly")
+
+    @unittest.skipIf(dataset_export.pa is None, "pyarrow not installed")
+    def test_arrow_round_trip(self):
+        """to_arrow shares numeric buffers and maps NaN to null; from_arrow restores NaN."""
+        print("\n=== Testing MarketDataBatch Arrow Conversion ===")
+
+        table = self.batch.to_arrow()
+        self.assertEqual(table.schema, dataset_export.arrow_schema(dataset_export.MARKET_DATA_COLUMNS))
+        self.assertEqual(table.column('sma_20').null_count, 1)
+        close = table.column('close_price').chunk(0)
+        self.assertEqual(close.buffers()[1].address, self.batch.columns['close_price'].ctypes.data)
+
+        back = MarketDataBatch.from_arrow(table)
+        self.assertEqual(back.columns['close_price'].ctypes.data, close.buffers()[1].address)
+        self.assertTrue(math.isnan(back[0].daily_return))
+        self.assertEqual(back[5].news_headlines, self.records[5].news_headlines)
+        self.assertEqual(MarketDataBatch.from_arrow(self.batch[3:5].to_arrow())[0].date, '2023-01-04')
+
+        print("MarketDataBatch Arrow conversion working correctly")
+
+    def test_predictor_and_storage_records(self):
+        """The predictor reads a batch directly; to_records replaces NaN with None."""
+        print("\n=== Testing MarketDataBatch Consumers ===")
+
+        predictor = FinancialPredictor()
+        features = predictor.prepare_features({'data': self.batch})
+        self.assertEqual(features.shape, (6, 11))
+        self.assertTrue(features.equals(predictor.prepare_features({'data': self.records})))
+        self.assertTrue(math.isnan(self.batch.columns['daily_return'][0]))
+
+        records = self.batch.to_records()
+        self.assertIsNone(records[0]['daily_return'])
+        self.assertEqual(records[4]['news_headlines'], self.records[4].news_headlines)
+        self.assertEqual(list(records[0]), list(MarketData.__dataclass_fields__))
+
+        print("MarketDataBatch consumers working correctly")
+
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the fitted-model registry in FinTech DataGen.
+
+This module tests:
+- Cache keys (symbol, model config, training data fingerprint)
+- In-memory LRU hits and eviction
+- On-disk persistence and age/size eviction
+- Disk occupancy in stats() without listing the store on every call
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import ML models
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_models.forecasting import MovingAverageForecaster, ARIMAForecaster
+from ml_models import registry as registry_module
+from ml_models.registry import ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Test suite for ModelRegistry."""
+
+    def setUp(self):
+        """Create a temporary artifact store and a small training series."""
+        self.cache_dir = tempfile.mkdtemp(prefix='model_cache_')
+        dates = pd.date_range('2023-01-01', periods=40, freq='D')
+        self.series = pd.Series(np.linspace(100, 120, 40), index=dates)
+
+    def tearDown(self):
+        """Remove the temporary artifact store."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_get_or_fit_hits_on_repeat(self):
+        """A repeat request for the same data and config skips training."""
+        print("\n=== Testing Registry Hit on Repeat ===")
+
+        registry = ModelRegistry(cache_dir=self.cache_dir)
+        first = registry.get_or_fit('AAPL', MovingAverageForecaster(window=5), self.series)
+        second = registry.get_or_fit('AAPL', MovingAverageForecaster(window=5), self.series)
+
+        self.assertIs(first, second)
+        stats = registry.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['memory_hits'], 1)
+        self.assertEqual(stats['disk_entries'], 1)
+
+        print("Registry hit working correctly")
+
+    def test_key_changes_with_inputs(self):
+        """Symbol, hyperparameters and data all change the cache key."""
+        print("\n=== Testing Registry Keys ===")
+
+        registry = ModelRegistry(cache_dir=None)
+        base = registry.make_key('AAPL', MovingAverageForecaster(window=5), self.series)
+
+        self.assertEqual(base, registry.make_key('AAPL', MovingAverageForecaster(window=5), self.series))
+        self.assertNotEqual(base, registry.make_key('MSFT', MovingAverageForecaster(window=5), self.series))
+        self.assertNotEqual(base, registry.make_key('AAPL', MovingAverageForecaster(window=3), self.series))
+        self.assertNotEqual(base, registry.make_key('AAPL', ARIMAForecaster(order=(1, 1, 1)), self.series))
+        changed = self.series.copy()
+        changed.iloc[-1] += 1.0
+        self.assertNotEqual(base, registry.make_key('AAPL', MovingAverageForecaster(window=5), changed))
+
+        print("Registry keys working correctly")
+
+    def test_disk_store_survives_new_instance(self):
+        """A fresh registry (e.g. another worker) loads models from disk."""
+        print("\n=== Testing Registry Disk Store ===")
+
+        ModelRegistry(cache_dir=self.cache_dir).get_or_fit('AAPL', ARIMAForecaster(order=(1, 1, 1)), self.series)
+
+        registry = ModelRegistry(cache_dir=self.cache_dir)
+        key = registry.make_key('AAPL', ARIMAForecaster(order=(1, 1, 1)), self.series)
+        cached = registry.get(key)
+
+        self.assertIsNotNone(cached)
+        self.assertEqual(len(cached.predict(3)), 3)
+        self.assertEqual(registry.stats()['disk_hits'], 1)
+
+        print("Registry disk store working correctly")
+
+    def test_memory_lru_eviction(self):
+        """The memory layer keeps only the most recently used entries."""
+        print("\n=== Testing Registry LRU Eviction ===")
+
+        registry = ModelRegistry(cache_dir=None, max_memory_entries=2)
+        for window in (2, 3, 4):
+            registry.get_or_fit('AAPL', MovingAverageForecaster(window=window), self.series)
+
+        oldest = registry.make_key('AAPL', MovingAverageForecaster(window=2), self.series)
+        newest = registry.make_key('AAPL', MovingAverageForecaster(window=4), self.series)
+        self.assertIsNone(registry.get(oldest))
+        self.assertIsNotNone(registry.get(newest))
+        self.assertEqual(registry.stats()['memory_entries'], 2)
+
+        print("Registry LRU eviction working correctly")
+
+    def test_age_and_size_eviction(self):
+        """Expired entries miss, and the disk store is pruned to its byte budget."""
+        print("\n=== Testing Registry Age/Size Eviction ===")
+
+        registry = ModelRegistry(cache_dir=self.cache_dir, max_age_seconds=60)
+        key = registry.make_key('AAPL', MovingAverageForecaster(window=5), self.series)
+        registry.get_or_fit('AAPL', MovingAverageForecaster(window=5), self.series)
+        # Age both layers past the limit
+        registry._memory[key] = (time.time() - 120, registry._memory[key][1])
+        path = os.path.join(self.cache_dir, f"{key}.joblib")
+        os.utime(path, (time.time() - 120, time.time() - 120))
+
+        self.assertIsNone(registry.get(key))
+        self.assertFalse(os.path.exists(path))
+
+        small = ModelRegistry(cache_dir=self.cache_dir, max_disk_bytes=1)
+        small.get_or_fit('AAPL', MovingAverageForecaster(window=5), self.series)
+        self.assertEqual(small.stats()['disk_entries'], 0)
+
+        print("Registry age/size eviction working correctly")
+
+    def test_stats_reuse_disk_usage(self):
+        """Repeated stats() calls reuse the occupancy from the last save instead of listing the store."""
+        print("\n=== Testing Registry Stats Disk Usage ===")
+
+        registry = ModelRegistry(cache_dir=self.cache_dir)
+        registry.get_or_fit('AAPL', MovingAverageForecaster(window=5), self.series)
+        size = os.path.getsize(os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0]))
+
+        with patch.object(registry_module.os, 'listdir', wraps=os.listdir) as listdir:
+            for _ in range(3):
+                stats = registry.stats()
+            listdir.assert_not_called()
+        self.assertEqual((stats['disk_entries'], stats['disk_bytes']), (1, size))
+
+        # Models saved by other processes show up once the reading is older than the TTL
+        shutil.copy(os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0]),
+                    os.path.join(self.cache_dir, 'other.joblib'))
+        self.assertEqual(registry.stats()['disk_entries'], 1)
+        with patch.object(registry_module, 'DISK_STATS_TTL', -1):
+            self.assertEqual(registry.stats()['disk_entries'], 2)
+
+        registry.clear()
+        self.assertEqual(registry.stats()['disk_entries'], 0)
+
+        print("Registry stats disk usage working correctly")
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
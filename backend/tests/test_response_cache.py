@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the API response cache.
+
+This module tests:
+- TTL expiry and LRU eviction
+- Per-symbol invalidation by data kind
+- ETag / If-None-Match revalidation through cached_view
+- Invalidation hooks fired by MongoDB write paths
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+from unittest.mock import MagicMock
+from flask import Flask, jsonify, request
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_cache import ResponseCache, cached_view
+from database.mongodb import MongoDB
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test suite for ResponseCache and cached_view."""
+
+    def setUp(self):
+        """Create a cache on a fake clock and a small Flask app using it."""
+        self.clock = _Clock()
+        self.cache = ResponseCache(ttl=30, max_entries=3, clock=self.clock)
+        self.calls = []
+
+        app = Flask(__name__)
+
+        @app.route('/prices')
+        @cached_view(self.cache, ('prices',))
+        def prices():
+            symbol = request.args.get('symbol')
+            self.calls.append(symbol)
+            if symbol == 'BAD':
+                return jsonify({'error': 'bad'}), 400
+            return jsonify({'symbol': symbol, 'version': len(self.calls)}), 200
+
+        self.client = app.test_client()
+
+    def test_ttl_and_lru(self):
+        """Entries expire after the TTL and the least recently used is evicted."""
+        print("\n=== Testing Response Cache TTL/LRU ===")
+
+        for key in ('a', 'b', 'c'):
+            self.cache.put(key, key.upper(), kinds=('prices',))
+        self.assertEqual(self.cache.get('a')['value'], 'A')
+        self.cache.put('d', 'D', kinds=('prices',))
+
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a')['value'], 'A')
+
+        self.clock.now = 31
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.assertEqual(self.cache.get_or_set('e', lambda: 42, kinds=()), 42)
+        self.assertEqual(self.cache.get_or_set('e', lambda: 0, kinds=()), 42)
+
+        print("Response cache TTL/LRU working correctly")
+
+    def test_invalidation_by_symbol(self):
+        """A write drops that symbol's entries and all-symbol entries of the same kind only."""
+        print("\n=== Testing Response Cache Invalidation ===")
+
+        cache = ResponseCache(ttl=30, max_entries=10, clock=self.clock)
+        cache.put('aapl', 1, kinds=('prices',), symbol='AAPL')
+        cache.put('msft', 2, kinds=('prices',), symbol='MSFT')
+        cache.put('all', 3, kinds=('prices', 'datasets'))
+        cache.put('meta', 4, kinds=('metadata',), symbol='AAPL')
+
+        self.assertEqual(cache.invalidate('prices', 'AAPL'), 2)
+        self.assertIsNone(cache.get('aapl'))
+        self.assertIsNone(cache.get('all'))
+        self.assertEqual(cache.get('msft')['value'], 2)
+        self.assertEqual(cache.get('meta')['value'], 4)
+
+        # A value computed across an invalidation is returned but not stored
+        generation = cache.generation
+        cache.invalidate('prices', 'MSFT')
+        cache.put('late', 5, kinds=('prices',), generation=generation)
+        self.assertIsNone(cache.get('late'))
+
+        print("Response cache invalidation working correctly")
+
+    def test_cached_view_etag(self):
+        """Repeat requests hit the cache; a matching If-None-Match gets 304; errors are not cached."""
+        print("\n=== Testing Cached View ETags ===")
+
+        first = self.client.get('/prices?symbol=AAPL')
+        second = self.client.get('/prices?symbol=AAPL')
+        self.assertEqual(first.headers['X-Cache'], 'MISS')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(first.get_json(), second.get_json())
+        self.assertEqual(self.calls, ['AAPL'])
+
+        etag = first.headers['ETag']
+        revalidated = self.client.get('/prices?symbol=AAPL', headers={'If-None-Match': etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.data, b'')
+
+        self.cache.invalidate('prices', 'AAPL')
+        changed = self.client.get('/prices?symbol=AAPL', headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.get_json()['version'], 2)
+        self.assertNotEqual(changed.headers['ETag'], etag)
+
+        self.client.get('/prices?symbol=BAD')
+        self.client.get('/prices?symbol=BAD')
+        self.assertEqual(self.calls.count('BAD'), 2)
+
+        print("Cached view ETags working correctly")
+
+    def test_mongodb_write_hooks(self):
+        """MongoDB write paths notify listeners with their kind and symbol."""
+        print("\n=== Testing MongoDB Write Hooks ===")
+
+        mongo = MongoDB()
+        mongo.db = MagicMock()
+        events = []
+        mongo.add_write_listener(lambda kind, symbol: events.append((kind, symbol)))
+        mongo.add_write_listener(MagicMock(side_effect=RuntimeError('listener down')))
+
+        mongo.save_dataset({'symbol': 'AAPL', 'data': []})
+        mongo.save_historical_prices('MSFT', 'NASDAQ', [{'date': '2023-01-01', 'close': 1.0}])
+        mongo.save_forecast({'symbol': 'GOOG', 'model': 'ARIMA'})
+        mongo.upsert_metadata('TSLA', {})
+
+        self.assertEqual(events, [
+            ('datasets', 'AAPL'), ('prices', 'MSFT'), ('predictions', 'GOOG'), ('metadata', 'TSLA')
+        ])
+
+        print("MongoDB write hooks working correctly")
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
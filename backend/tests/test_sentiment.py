@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Unit tests for headline sentiment scoring.
+
+This module tests:
+- Parity of the keyword backend with the original str.count scorer
+- Memoized headline and news-date scores
+- The on-disk score cache, backend selection and pooled scoring
+- The curator's use of the shared scorer and the recorded backend
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment import (KeywordBackend, ScoreCache, SentimentBackend, SentimentScorer, TransformerBackend,
+                       default_scorer, get_backend, legacy_sentiment_score)
+from fintech_data_curator import FinTechDataCurator
+from market_data import MarketDataBatch
+
+GROUPS = [
+    ['Apple stock SURGE after strong earnings', 'Analysts see risks ahead'],
+    ['Enterprise demand regains momentum', 'Bestseller fallout: shares drop'],
+    ['Strongains and dropositive overlaps count twice', 'sell\x00off', 'a \x00 sell'],
+    ['No keywords here', ''],
+    [],
+    ['Apple stock SURGE after strong earnings', 'Analysts see risks ahead'],
+    ['Ürün fiyatları düşüş', 'BUY rating, upgrade; bullish\tmomentum\ngrowth'],
+]
+
+
+class TestSentimentScorer(unittest.TestCase):
+    """Test suite for SentimentScorer and its backends."""
+
+    def test_matches_legacy_scorer(self):
+        """Batch scores equal the original per-keyword substring counts."""
+        print("\n=== Testing Sentiment Parity ===")
+
+        scorer = SentimentScorer(KeywordBackend())
+        expected = [legacy_sentiment_score(group) for group in GROUPS]
+        np.testing.assert_array_equal(scorer.score_groups(GROUPS), expected)
+        self.assertEqual([scorer.score(group) for group in GROUPS], expected)
+
+        counts = scorer.headline_scores(['stock surge', 'risks', 'stock surge', 'Strongains'])
+        self.assertEqual(counts.tolist(), [[1, 1], [-1, 1], [1, 1], [2, 2]])
+        self.assertEqual(scorer.headline_scores([]).shape, (0, 2))
+
+        with self.assertRaises(ValueError):
+            KeywordBackend(positive_words=['short squeeze'])
+
+        # Prefix and self-overlapping keywords count like separate str.count calls
+        lexicon = (('rise', 'rises', 'rise'), ('fall', 'aa'))
+        custom = SentimentScorer(KeywordBackend(*lexicon))
+        custom_groups = [['aaa rise fall'], ['AAAA rises', 'sunrise rises'], ['aa\x00aa falls']]
+        self.assertEqual([custom.score(group) for group in custom_groups],
+                         [legacy_sentiment_score(group, *lexicon) for group in custom_groups])
+
+        print("Sentiment parity working correctly")
+
+    def test_memoized_scores(self):
+        """Repeat news dates and headlines are served from the memos."""
+        print("\n=== Testing Sentiment Memoization ===")
+
+        scorer = SentimentScorer(KeywordBackend(), cache_size=4)
+        first = scorer.score_groups(GROUPS[:2])
+        with patch.object(scorer, '_run_backend', wraps=scorer._run_backend) as counted:
+            np.testing.assert_array_equal(scorer.score_groups(GROUPS[:2]), first)
+            counted.assert_not_called()
+
+            # A new date whose headlines were all seen before needs no counting either
+            scorer.score_groups([GROUPS[0][::-1]])
+            counted.assert_not_called()
+
+            scorer.score_groups([['fresh crash headline']])
+            self.assertEqual(counted.call_args[0][0], ['fresh crash headline'])
+
+        self.assertLessEqual(len(scorer._headlines.data), 4)
+        self.assertLessEqual(len(scorer._groups.data), 4)
+        self.assertIs(default_scorer(), default_scorer())
+
+        print("Sentiment memoization working correctly")
+
+    def test_curator_uses_scorer(self):
+        """News dates are scored in one batch through the curator's scorer."""
+        print("\n=== Testing Curator Sentiment Scoring ===")
+
+        scorer = SentimentScorer(KeywordBackend())
+        curator = FinTechDataCurator(use_http_cache=False, sentiment_scorer=scorer)
+        self.assertIs(FinTechDataCurator(use_http_cache=False).sentiment, default_scorer())
+
+        news = {'2024-01-02': [{'title': t} for t in GROUPS[0]], '2024-01-01': [{'title': t} for t in GROUPS[1]]}
+        with patch.object(scorer, 'score_groups', wraps=scorer.score_groups) as batched:
+            frame = curator._news_frame(news)
+        batched.assert_called_once()
+        self.assertEqual(frame['news_sentiment_score'].tolist(),
+                         [legacy_sentiment_score(GROUPS[1]), legacy_sentiment_score(GROUPS[0])])
+        self.assertEqual(curator._calculate_sentiment_score([]), 0.0)
+
+        # Every curated row records the backend behind its score, through the batch and storage rows
+        prices = pd.DataFrame({'Open': 1.0, 'High': 1.0, 'Low': 1.0, 'Close': 1.0, 'Volume': 10},
+                              index=pd.date_range('2024-01-01', periods=3, freq='D'))
+        batch = MarketDataBatch.from_frame(curator.build_curated_frame(prices, news, 'AAPL', 'NASDAQ'))
+        self.assertEqual(batch[0].sentiment_backend, 'keyword')
+        self.assertEqual([r['sentiment_backend'] for r in batch.to_records()], ['keyword'] * 3)
+        legacy = [dict(r, sentiment_backend=None) for r in batch.to_records()]
+        self.assertEqual(MarketDataBatch.from_records(legacy)[2].sentiment_backend, 'keyword')
+
+        print("Curator sentiment scoring working correctly")
+
+    def test_score_cache_and_backends(self):
+        """Scores persist per backend on disk; backends resolve by name and pickle for workers."""
+        print("\n=== Testing Sentiment Score Cache ===")
+
+        headlines = [h for group in GROUPS for h in group]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'scores.sqlite')
+            first = SentimentScorer(KeywordBackend(), cache=ScoreCache(path))
+            expected = first.score_groups(GROUPS)
+            first.close()
+
+            # A fresh scorer (e.g. the next run) reads every headline back from disk
+            second = SentimentScorer(KeywordBackend(), cache=ScoreCache(path))
+            with patch.object(second.backend, 'score_batch') as backend:
+                np.testing.assert_array_equal(second.score_groups(GROUPS), expected)
+                backend.assert_not_called()
+            second.close()
+
+            # Another lexicon is another cache namespace
+            custom = SentimentScorer(KeywordBackend(positive_words=['rally']), cache=ScoreCache(path))
+            self.assertNotEqual(custom.backend.cache_namespace, 'keyword')
+            self.assertEqual(custom.score(['Apple stock SURGE after strong earnings']), 0.0)
+            custom.close()
+
+            # An unusable cache file (here its directory is a regular file) is a miss, not an error
+            blocker = os.path.join(tmp, 'blocker')
+            open(blocker, 'w').close()
+            broken = SentimentScorer(KeywordBackend(), cache=ScoreCache(os.path.join(blocker, 'scores.sqlite')))
+            with self.assertLogs('sentiment', level='WARNING') as logs:
+                np.testing.assert_array_equal(broken.score_groups(GROUPS), expected)
+            self.assertTrue(any('read failed' in line for line in logs.output))
+            self.assertTrue(any('write failed' in line for line in logs.output))
+            broken.close()
+
+        # Large batches split across spawned workers score like one in-process batch
+        pooled = SentimentScorer(KeywordBackend(), workers=2, pool_min_headlines=4)
+        try:
+            np.testing.assert_array_equal(pooled.headline_scores(headlines),
+                                          KeywordBackend().score_batch(headlines))
+        finally:
+            pooled.close()
+
+        self.assertEqual(get_backend().name, 'keyword')
+        self.assertEqual(get_backend('transformer:my-model').name, 'transformer:my-model')
+        with patch.dict(os.environ, {'SENTIMENT_BACKEND': 'vader'}):
+            self.assertEqual(get_backend().name, 'vader')
+        with self.assertRaises(ValueError):
+            get_backend('coinflip')
+        with self.assertRaises(TypeError):
+            SentimentBackend()
+
+        # Models load lazily: building a backend needs no optional dependency
+        self.assertIsNone(TransformerBackend()._pipeline)
+
+        print("Sentiment score cache working correctly")
+
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
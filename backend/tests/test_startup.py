@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Cold-start import time tests.
+
+This module tests:
+- Importing the API does not load TensorFlow or statsmodels
+- The API import stays within a fixed time budget (`python -X importtime`)
+
+The budget defaults to IMPORT_TIME_BUDGET_MS=2500 and can be raised on slow
+machines through that environment variable.
+
+Author: FinTech DataGen Team
+Date: October 2025
+"""
+
+import unittest
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only load on first use of the matching forecaster
+HEAVY_MODULES = ('tensorflow', 'keras', 'statsmodels')
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', 2500))
+
+
+def import_times(module):
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns {module name: cumulative microseconds} parsed from stderr.
+    """
+    env = dict(os.environ, MODEL_CACHE_DIR='off', WSGI_PRELOAD_LIBRARIES='0')
+    env.pop('MONGOURI', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=300
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartupImportTime(unittest.TestCase):
+    """Test suite for API cold-start imports."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Capture one importtime profile of the API module."""
+        cls.times = import_times('app')
+
+    def test_heavy_libraries_not_imported(self):
+        """Importing the API leaves TensorFlow and statsmodels unloaded."""
+        print("\n=== Testing Lazy ML Imports ===")
+
+        loaded = sorted({name.split('.')[0] for name in self.times} & set(HEAVY_MODULES))
+        self.assertEqual(loaded, [])
+        self.assertIn('ml_models.forecasting', self.times)
+
+        print("Lazy ML imports working correctly")
+
+    def test_import_time_budget(self):
+        """The API imports within IMPORT_TIME_BUDGET_MS."""
+        print("\n=== Testing Import Time Budget ===")
+
+        total_ms = self.times['app'] / 1000.0
+        slowest = sorted(self.times.items(), key=lambda kv: kv[1], reverse=True)[1:6]
+        print(f"import app: {total_ms:.0f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+        for name, us in slowest:
+            print(f"  {name}: {us / 1000.0:.0f} ms")
+        self.assertLess(total_ms, IMPORT_TIME_BUDGET_MS)
+
+        print("Import time budget working correctly")
+
+
+if __name__ == '__main__':
+    # Run tests with verbose output
+    unittest.main(verbosity=2)
@@ -0,0 +1,60 @@
+"""
+WSGI entry point for production serving
+
+Run with the bundled gunicorn configuration:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The configuration preloads this module in the master process, so the
+Flask app, pandas/scikit-learn and the TensorFlow/statsmodels libraries
+are imported once and a (re)forked worker starts ready to serve. The
+configuration runs a single worker (see gunicorn.conf.py). No
+TensorFlow op is executed before the fork: a TensorFlow runtime started
+in the master deadlocks in its children, so Keras models are built and
+loaded inside each worker. Each worker opens its own MongoDB client
+after the fork (see `post_fork` in gunicorn.conf.py).
+"""
+
+import importlib
+import os
+
+from app import app, db, job_manager
+
+
+# Libraries imported (not initialized) in the master before workers fork
+PRELOAD_MODULES = ('tensorflow', 'statsmodels.tsa.arima.model')
+
+
+def preload_libraries():
+    """Import the heavy ML libraries so workers inherit them; missing ones are skipped."""
+    loaded = []
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except ImportError:
+            pass
+    return loaded
+
+
+if os.getenv('WSGI_PRELOAD_LIBRARIES', '1').lower() not in ('0', 'false', 'no'):
+    print(f"📦 Preloaded: {', '.join(preload_libraries()) or 'nothing'}")
+
+
+def init_worker():
+    """Per-worker setup after fork: a fresh MongoDB client (indexes were ensured by the master)."""
+    if db is not None and db.client is not None:
+        if db.reconnect():
+            print(f"✅ Worker {os.getpid()} reconnected to MongoDB")
+        else:
+            print(f"⚠️ Worker {os.getpid()} could not reconnect to MongoDB")
+
+
+def shutdown_worker():
+    """Stop background forecast jobs and close the worker's MongoDB client."""
+    job_manager.shutdown(wait=False)
+    if db is not None:
+        db.close()
+
+
+application = app